@@ -0,0 +1,233 @@
+"""
+사고 데이터 전처리 파이프라인 (data/preprocessing.ipynb의 preprocess_data를 모듈화)
+
+단계:
+  1. load_source: 원본 파일(accident_df.xlsx 또는 .csv) -> DataFrame
+     (xlsx의 느린 read_excel 결과는 원본 파일 해시 기준으로 Parquet 캐시)
+  2. preprocess_frame: 날짜 분리, 결측치 처리, '총 사상자수' 생성, 불필요한 컬럼 제거
+  3. to_typed_frame: 분석 차원은 category, 인원수는 int32, 발생일시는 날짜 타입으로 지정
+     (자유 텍스트인 사고내용과 값이 대부분 고유한 컬럼은 문자열로 유지)
+  4. 결과를 accident_df_preprocessed.parquet 로 저장
+     (원본 해시를 Parquet 메타데이터에 기록하여 원본이 바뀌지 않으면 다시 만들지 않음)
+
+sql/csv_to_db.py는 이 Parquet 파일을 그대로 읽어 적재합니다.
+
+사용 예:
+    python preprocessing.py accident_df.xlsx
+    python preprocessing.py accident_df.xlsx --csv   # 기존 CSV 결과도 함께 저장
+"""
+import argparse
+import hashlib
+import os
+import sys
+
+import pandas as pd
+
+# 파이프라인 로직이 바뀌면 올려서 기존 캐시를 무효화합니다.
+PIPELINE_VERSION = '2'
+
+SOURCE_FILE = 'accident_df.xlsx'
+OUTPUT_PARQUET = 'accident_df_preprocessed.parquet'
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+# Parquet 메타데이터에 기록하는 캐시 키
+CACHE_KEY_FIELD = b'accident_pipeline_key'
+
+# 측정 지표 (숫자형, 집계 대상)
+METRICS = ['총 사상자수', '사망자수', '중상자수', '경상자수', '부상신고자수']
+VICTIM_COLS = ['피해운전자 차종', '피해운전자 성별', '피해운전자 연령대', '피해운전자 상해정도']
+# 자유 텍스트 (그룹화 대상이 아니므로 category로 바꾸지 않음)
+FREE_TEXT_COLS = ['사고내용']
+# 고유 값 수 / 행 수가 이 비율을 넘는 컬럼은 category로 바꿔도 메모리가 줄지 않으므로 문자열로 유지
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def file_hash(path: str) -> str:
+    """
+    원본 파일의 SHA-256 해시(앞 16자리)를 반환합니다.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def load_source(input_file_path: str, use_cache: bool = True) -> pd.DataFrame:
+    """
+    [1단계] 원본 파일을 DataFrame으로 읽습니다.
+    xlsx는 원본 해시별 Parquet 캐시(data/.cache/raw_<hash>.parquet)가 있으면 그것을 읽습니다.
+    """
+    if not input_file_path.lower().endswith(('.xlsx', '.xls')):
+        return pd.read_csv(input_file_path)
+
+    cache_path = os.path.join(CACHE_DIR, f"raw_{file_hash(input_file_path)}.parquet")
+    if use_cache and os.path.exists(cache_path):
+        print(f"캐시 사용: '{cache_path}' (read_excel 생략)")
+        return pd.read_parquet(cache_path)
+
+    df = pd.read_excel(input_file_path)
+    if use_cache:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            df.to_parquet(cache_path, index=False)
+            print(f"read_excel 결과를 캐시에 저장했습니다: '{cache_path}'")
+        except Exception as e:
+            # 혼합 타입 컬럼 등으로 저장에 실패해도 전처리는 계속 진행
+            print(f"캐시 저장 실패 (무시하고 진행): {e}")
+    return df
+
+
+def preprocess_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    [2단계] 노트북의 preprocess_data와 동일한 전처리를 수행합니다.
+
+    1. 날짜(발생년월) 컬럼을 '발생일시', 'Year', 'Month'로 분리
+    2. 피해자 정보 결측치를 '해당없음'으로 대체
+    3. '총 사상자수' 파생 변수 생성
+    4. 불필요한 '구분번호', '발생년월' 컬럼 제거
+    """
+    # 1. 날짜 데이터 처리 ('발생년월' -> '발생일시'(datetime), 'Year', 'Month')
+    try:
+        # 'YYYY년 MM월' 형식을 datetime 객체로 변환
+        df['발생일시'] = pd.to_datetime(df['발생년월'], format='%Y년 %m월')
+        df['Year'] = df['발생일시'].dt.year
+        df['Month'] = df['발생일시'].dt.month
+        print("날짜 데이터 '발생일시'(datetime), 'Year', 'Month' 컬럼 생성 완료.")
+    except Exception as e:
+        print(f"날짜 처리 중 오류: {e}. '발생년월' 컬럼 형식을('%Y년 %m월') 확인하세요.")
+
+    # 2. 결측치 처리 (차량단독 사고의 경우 피해운전자 정보가 NaN)
+    df[VICTIM_COLS] = df[VICTIM_COLS].fillna('해당없음')
+    print("결측치(NaN) '해당없음'으로 처리 완료.")
+
+    # 3. 새 측정 지표 생성 ('총 사상자수')
+    count_cols = METRICS[1:]
+    # 숫자형이 아닌 값이 있을 경우를 대비해 numeric으로 변환 (오류 시 0으로)
+    for col in count_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+    df['총 사상자수'] = df[count_cols].sum(axis=1)
+    print("'총 사상자수' 컬럼 생성 완료.")
+
+    # 4. 불필요한 컬럼 제거 ('발생일시'가 생성된 경우에만 원본 '발생년월' 제거)
+    if '발생일시' in df.columns:
+        df = df.drop(columns=['구분번호', '발생년월'], errors='ignore')
+    else:
+        df = df.drop(columns=['구분번호'], errors='ignore')
+    print("불필요한 원본 컬럼 제거 완료.")
+    return df
+
+
+def to_typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    [3단계] 컬럼 타입을 지정합니다. (분석 차원: category, 인원수: int32, Year/Month: int16/int8)
+    자유 텍스트(FREE_TEXT_COLS)와 고유 값 비율이 CATEGORY_MAX_UNIQUE_RATIO를 넘는 컬럼은 문자열로 둡니다.
+    """
+    for col in METRICS:
+        df[col] = df[col].astype('int32')
+    if '발생일시' in df.columns:
+        df['발생일시'] = pd.to_datetime(df['발생일시']).astype('datetime64[ns]')
+        df['Year'] = df['Year'].astype('int16')
+        df['Month'] = df['Month'].astype('int8')
+    for col in get_dimensions(df):
+        if not (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])):
+            continue
+        if df[col].nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(df):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def get_dimensions(df: pd.DataFrame) -> list:
+    """
+    분석 차원 (범주형, 그룹화 대상): 원본 컬럼에서 측정 지표와 자유 텍스트를 제외한 나머지
+    """
+    return [col for col in df.columns if col not in METRICS and col not in FREE_TEXT_COLS]
+
+
+def _read_cache_key(path: str):
+    import pyarrow.parquet as pq
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except Exception:
+        return None
+    value = metadata.get(CACHE_KEY_FIELD)
+    return value.decode() if value else None
+
+
+def write_parquet(df: pd.DataFrame, path: str, cache_key: str):
+    """
+    [4단계] 타입이 지정된 DF를 Parquet으로 저장하고 캐시 키를 메타데이터에 기록합니다.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[CACHE_KEY_FIELD] = cache_key.encode()
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+def preprocess_data(input_file_path: str = SOURCE_FILE, output_file_path: str = OUTPUT_PARQUET,
+                    write_csv: bool = False, use_cache: bool = True) -> (str, list, list):
+    """
+    원본 사고 데이터를 전처리하여 타입이 지정된 Parquet 파일로 저장합니다.
+    원본 파일 해시가 이전 실행과 같으면 기존 결과를 그대로 사용합니다.
+
+    Args:
+        input_file_path (str): 원본 xlsx/CSV 파일 경로
+        output_file_path (str): 결과 Parquet 파일 경로
+        write_csv (bool): 기존 형식의 CSV(utf-8-sig)도 함께 저장할지 여부
+        use_cache (bool): 원본 해시 기반 캐시 사용 여부
+
+    Returns:
+        tuple: (저장된 파일 경로, 분석 차원 리스트, 측정 지표 리스트)
+               오류 발생 시 (None, [], []) 반환
+    """
+    try:
+        cache_key = f"{file_hash(input_file_path)}-v{PIPELINE_VERSION}"
+    except FileNotFoundError:
+        print(f"오류: '{input_file_path}' 파일을 찾을 수 없습니다.")
+        return None, [], []
+
+    try:
+        if use_cache and os.path.exists(output_file_path) and _read_cache_key(output_file_path) == cache_key:
+            print(f"원본이 변경되지 않았습니다. 기존 결과 '{output_file_path}'를 사용합니다.")
+            df = pd.read_parquet(output_file_path)
+        else:
+            df = load_source(input_file_path, use_cache)
+            print(f"'{input_file_path}' 파일 로드 성공. (총 {len(df)} 행)")
+            df = to_typed_frame(preprocess_frame(df))
+            write_parquet(df, output_file_path, cache_key)
+            print(f"\n전처리 완료! 결과가 '{output_file_path}' 파일로 저장되었습니다.")
+    except ImportError:
+        print("오류: Parquet 저장에 'pyarrow' 라이브러리가 필요합니다. (터미널에서: pip install pyarrow)")
+        return None, [], []
+    except Exception as e:
+        print(f"전처리 중 오류 발생: {e}")
+        return None, [], []
+
+    if write_csv:
+        # 한글 깨짐 방지를 위해 'utf-8-sig' 인코딩 사용
+        csv_path = os.path.splitext(output_file_path)[0] + '.csv'
+        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+        print(f"CSV 결과도 '{csv_path}' 파일로 저장했습니다.")
+
+    return output_file_path, get_dimensions(df), METRICS
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="사고 원본 데이터를 전처리하여 Parquet으로 저장합니다.")
+    parser.add_argument('input', nargs='?', default=SOURCE_FILE, help="원본 xlsx/CSV 파일 경로")
+    parser.add_argument('-o', '--output', default=OUTPUT_PARQUET, help="결과 Parquet 파일 경로")
+    parser.add_argument('--csv', action='store_true', help="기존 형식의 CSV 결과도 함께 저장")
+    parser.add_argument('--no-cache', action='store_true', help="캐시를 무시하고 다시 전처리")
+    args = parser.parse_args()
+
+    saved_file, dims, mets = preprocess_data(args.input, args.output, args.csv, not args.no_cache)
+    if not saved_file:
+        sys.exit(1)
+
+    print("\n--- Streamlit 앱에서 사용할 수 있는 변수 목록 ---")
+    print("\n[분석 차원 (Dimension)] - (예: X축, 그룹, 범례로 사용)")
+    print(dims)
+    print("\n[측정 지표 (Metric)] - (예: Y축, 값으로 사용)")
+    print(mets)
@@ -0,0 +1,239 @@
+"""
+합성(synthetic) 사고 데이터 생성기
+
+원본 엑셀(accident_df.xlsx)은 직접 내려받아야 하므로(data/README.txt), 적재/시각화 성능을
+운영 규모로 측정할 때는 이 스크립트로 accident_df_preprocessed.csv 와 같은 형태의 데이터를 만듭니다.
+
+- 같은 seed면 항상 같은 데이터가 생성됩니다. (청크 크기도 같아야 함)
+- 범주 분포는 2022~2024년 서울시 교통사고 원본(약 10만 건)의 비율을 근사했습니다.
+- 1,000만 건도 메모리에 한 번에 올리지 않도록 청크 단위로 생성/저장합니다.
+
+사용 예:
+    python synthetic_data.py 1m                      # 100만 건 -> accident_df_preprocessed.csv
+    python synthetic_data.py 100000 -o small.csv --seed 7
+    python synthetic_data.py 10m -o big.parquet      # Parquet 저장 (pyarrow 필요)
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_ROWS = 1_000_000
+OUTPUT_FILE = 'accident_df_preprocessed.csv'
+
+# 크기 별칭 (벤치마크 기본 규모)
+SIZE_PRESETS = {'100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# 발생 기간 (원본과 동일하게 2022-01 ~ 2024-12)
+START_MONTH = '2022-01-01'
+N_MONTHS = 36
+
+SEOUL_DISTRICTS = [
+    '강남구', '강동구', '강북구', '강서구', '관악구', '광진구', '구로구', '금천구', '노원구',
+    '도봉구', '동대문구', '동작구', '마포구', '서대문구', '서초구', '성동구', '성북구', '송파구',
+    '양천구', '영등포구', '용산구', '은평구', '종로구', '중구', '중랑구',
+]
+# 구별 사고 비중 (강남/송파/영등포 등이 많음)
+DISTRICT_WEIGHTS = [
+    8.0, 4.0, 3.0, 5.0, 4.0, 3.0, 4.5, 2.5, 3.5,
+    2.0, 4.0, 3.0, 4.5, 3.0, 6.0, 3.0, 3.5, 6.5,
+    3.0, 6.0, 3.0, 3.5, 3.5, 3.0, 3.5,
+]
+
+# (값, 비중) 목록: 원본 분포 근사
+DAY_NIGHT = [('주간', 62), ('야간', 38)]
+DESCRIPTION = [('경상사고', 70.0), ('중상사고', 20.4), ('부상신고사고', 9.0), ('사망사고', 0.6)]
+ACCIDENT_TYPE = [
+    ('차대차 - 측면충돌', 22), ('차대차 - 추돌', 20), ('차대차 - 기타', 18), ('차대차 - 정면충돌', 4),
+    ('차대사람 - 횡단중', 9), ('차대사람 - 기타', 7), ('차대사람 - 차도통행중', 3),
+    ('차대사람 - 길가장자리구역통행중', 2), ('차대사람 - 보도통행중', 1.9),
+    ('차량단독 - 기타', 1.8), ('차량단독 - 공작물충돌', 0.9), ('차량단독 - 전도전복', 0.4),
+]
+LAW_VIOLATION = [
+    ('안전운전불이행', 55), ('신호위반', 12), ('안전거리미확보', 10), ('보행자보호의무위반', 6),
+    ('교차로운행방법위반', 5), ('중앙선침범', 3), ('기타', 9),
+]
+ROAD_SURFACE = [('건조', 92.0), ('젖음/습기', 7.0), ('서리/결빙', 0.5), ('적설', 0.3), ('기타', 0.2)]
+WEATHER = [('맑음', 88.0), ('비', 6.0), ('흐림', 5.0), ('눈', 0.5), ('기타', 0.4), ('안개', 0.1)]
+ROAD_FORM = [
+    ('단일로 - 기타', 50), ('교차로 - 교차로안', 20), ('교차로 - 교차로부근', 15),
+    ('교차로 - 교차로횡단보도내', 5), ('기타 - 기타', 4), ('주차장 - 주차장', 3),
+    ('단일로 - 교량', 1.5), ('단일로 - 터널', 1.0), ('단일로 - 고가도로위', 0.5),
+]
+VEHICLE_TYPE = [
+    ('승용', 70), ('화물', 8), ('이륜', 8), ('승합', 5), ('개인형이동수단(PM)', 3),
+    ('자전거', 3), ('기타불명', 1.5), ('특수', 0.5),
+]
+GENDER = [('남', 75), ('여', 24), ('기타불명', 1)]
+AGE_GROUP = [
+    ('20세 이하', 3), ('21-30세', 17), ('31-40세', 17), ('41-50세', 18), ('51-60세', 20),
+    ('61-64세', 9), ('65세 이상', 15), ('미분류', 1),
+]
+VICTIM_AGE_GROUP = [
+    ('12세 이하', 3), ('13-20세', 6), ('21-30세', 17), ('31-40세', 16), ('41-50세', 16),
+    ('51-60세', 17), ('61-64세', 8), ('65세 이상', 16), ('미분류', 1),
+]
+OFFENDER_INJURY = [('상해없음', 85), ('경상', 8), ('부상신고', 4), ('중상', 2), ('기타불명', 1)]
+# 사고내용별 피해운전자 상해정도 (가장 심한 피해와 사고내용 등급이 일치)
+VICTIM_INJURY_BY_DESCRIPTION = {
+    '경상사고': '경상', '중상사고': '중상', '부상신고사고': '부상신고', '사망사고': '사망',
+}
+NO_VICTIM = '해당없음'
+
+
+def _choice(rng: np.random.Generator, table: list, n: int) -> np.ndarray:
+    values, weights = zip(*table)
+    p = np.asarray(weights, dtype=float)
+    return rng.choice(np.asarray(values, dtype=object), size=n, p=p / p.sum())
+
+
+def _casualty_counts(rng: np.random.Generator, description: np.ndarray) -> dict:
+    """
+    사고내용 등급과 맞도록 사망/중상/경상/부상신고자수를 생성합니다.
+    (해당 등급 인원 1명 이상 + 낮은 등급 인원은 포아송 분포)
+    """
+    n = len(description)
+    rank = pd.Series(description).map({'사망사고': 0, '중상사고': 1, '경상사고': 2, '부상신고사고': 3}).to_numpy()
+    counts = {}
+    for level, col, extra_rate in [(0, '사망자수', 0.05), (1, '중상자수', 0.15),
+                                   (2, '경상자수', 0.25), (3, '부상신고자수', 0.08)]:
+        primary = np.where(rank == level, 1 + rng.poisson(extra_rate, n), 0)
+        # 더 심한 등급의 사고에도 낮은 등급 사상자가 함께 나올 수 있음
+        secondary = np.where(rank < level, rng.poisson(extra_rate, n), 0)
+        counts[col] = (primary + secondary).astype('int64')
+    return counts
+
+
+def generate_chunk(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    """
+    accident_df_preprocessed.csv 와 같은 컬럼 구성의 합성 데이터 n건을 생성합니다.
+    """
+    months = pd.date_range(START_MONTH, periods=N_MONTHS, freq='MS')
+    # 봄/가을에 조금 더 많이 발생하는 계절성
+    month_weights = 1.0 + 0.08 * np.sin((months.month.to_numpy() - 2) / 12 * 2 * np.pi)
+    occurred = months[rng.choice(N_MONTHS, size=n, p=month_weights / month_weights.sum())]
+
+    description = _choice(rng, DESCRIPTION, n)
+    accident_type = _choice(rng, ACCIDENT_TYPE, n)
+    category = pd.Series(accident_type).str.split(' - ').str[0].to_numpy()
+    single = category == '차량단독'
+    pedestrian = category == '차대사람'
+
+    districts = np.asarray(['서울특별시 ' + d for d in SEOUL_DISTRICTS], dtype=object)
+    p = np.asarray(DISTRICT_WEIGHTS) / sum(DISTRICT_WEIGHTS)
+
+    df = pd.DataFrame({
+        '주야': _choice(rng, DAY_NIGHT, n),
+        '시군구': rng.choice(districts, size=n, p=p),
+        '사고내용': description,
+    })
+    for col, values in _casualty_counts(rng, description).items():
+        df[col] = values
+    df['사고유형'] = accident_type
+    df['법규위반'] = _choice(rng, LAW_VIOLATION, n)
+    df['노면상태'] = _choice(rng, ROAD_SURFACE, n)
+    df['기상상태'] = _choice(rng, WEATHER, n)
+    df['도로형태'] = _choice(rng, ROAD_FORM, n)
+    df['가해운전자 차종'] = _choice(rng, VEHICLE_TYPE, n)
+    df['가해운전자 성별'] = _choice(rng, GENDER, n)
+    df['가해운전자 연령대'] = _choice(rng, AGE_GROUP, n)
+    df['가해운전자 상해정도'] = np.where(single, pd.Series(description).map(VICTIM_INJURY_BY_DESCRIPTION),
+                                  _choice(rng, OFFENDER_INJURY, n))
+
+    # 피해운전자: 차량단독 사고는 '해당없음', 차대사람 사고는 보행자
+    df['피해운전자 차종'] = np.where(single, NO_VICTIM,
+                              np.where(pedestrian, '보행자', _choice(rng, VEHICLE_TYPE, n)))
+    df['피해운전자 성별'] = np.where(single, NO_VICTIM, _choice(rng, GENDER[:2], n))
+    df['피해운전자 연령대'] = np.where(single, NO_VICTIM, _choice(rng, VICTIM_AGE_GROUP, n))
+    df['피해운전자 상해정도'] = np.where(single, NO_VICTIM,
+                                  pd.Series(description).map(VICTIM_INJURY_BY_DESCRIPTION).to_numpy())
+
+    # 전처리 결과와 같은 파생 컬럼 (발생일시, Year, Month, 총 사상자수)
+    df['발생일시'] = occurred
+    df['Year'] = occurred.year
+    df['Month'] = occurred.month
+    df['총 사상자수'] = df[['사망자수', '중상자수', '경상자수', '부상신고자수']].sum(axis=1)
+    return df
+
+
+def parse_size(value: str) -> int:
+    """
+    '100k', '1m', '10m' 같은 별칭 또는 정수를 행 수로 변환합니다.
+    """
+    key = str(value).lower().replace('_', '').replace(',', '')
+    if key in SIZE_PRESETS:
+        return SIZE_PRESETS[key]
+    if key.endswith('k'):
+        return int(float(key[:-1]) * 1_000)
+    if key.endswith('m'):
+        return int(float(key[:-1]) * 1_000_000)
+    return int(key)
+
+
+def generate(rows: int, output_file_path: str = OUTPUT_FILE, seed: int = DEFAULT_SEED,
+             chunk_rows: int = DEFAULT_CHUNK_ROWS) -> str:
+    """
+    합성 데이터 rows건을 청크 단위로 생성하여 CSV(utf-8-sig) 또는 Parquet 파일로 저장합니다.
+
+    Args:
+        rows (int): 생성할 행 수
+        output_file_path (str): 저장 경로 (.parquet 이면 Parquet, 그 외는 CSV)
+        seed (int): 난수 seed
+        chunk_rows (int): 한 번에 생성할 행 수
+
+    Returns:
+        str: 저장된 파일 경로
+    """
+    rng = np.random.default_rng(seed)
+    to_parquet = output_file_path.lower().endswith('.parquet')
+    written = 0
+
+    if to_parquet:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            while written < rows:
+                n = min(chunk_rows, rows - written)
+                table = pa.Table.from_pandas(generate_chunk(rng, n), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_file_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+                written += n
+                print(f"  ... {written:,} / {rows:,} 건 생성 ...")
+        finally:
+            if writer is not None:
+                writer.close()
+        return output_file_path
+
+    # 한글 깨짐 방지를 위해 'utf-8-sig' 인코딩 사용 (BOM은 파일 맨 앞에 한 번만 기록)
+    with open(output_file_path, 'w', encoding='utf-8-sig', newline='') as f:
+        while written < rows:
+            n = min(chunk_rows, rows - written)
+            generate_chunk(rng, n).to_csv(f, index=False, header=(written == 0))
+            written += n
+            print(f"  ... {written:,} / {rows:,} 건 생성 ...")
+    return output_file_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="accident_df_preprocessed.csv 형태의 합성 사고 데이터를 생성합니다.")
+    parser.add_argument('rows', help="생성할 행 수 (예: 100000, 100k, 1m, 10m)")
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help="저장 경로 (.csv 또는 .parquet)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="난수 seed (같으면 같은 데이터)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help="청크당 생성 행 수")
+    args = parser.parse_args()
+
+    try:
+        n_rows = parse_size(args.rows)
+    except ValueError:
+        parser.error(f"행 수를 해석할 수 없습니다: {args.rows}")
+    if n_rows <= 0 or args.chunk_rows <= 0:
+        parser.error("행 수와 --chunk-rows는 1 이상이어야 합니다.")
+
+    print(f"합성 데이터 {n_rows:,}건 생성 시작 (seed={args.seed})")
+    saved = generate(n_rows, args.output, args.seed, args.chunk_rows)
+    print(f"\n생성 완료! 결과가 '{saved}' 파일로 저장되었습니다.")
+    sys.exit(0)
@@ -1,7 +1,6 @@
 import streamlit as st
 import sys
 import os
-from sqlalchemy import create_engine
 import plotly.express as px
 
 # -----------------------------
@@ -31,7 +30,8 @@ if project_root not in sys.path:
 
 try:
     # 'web_design/' 폴더에 있는 'visualizer.py' 파일에서 클래스를 가져옵니다.
-    from web_design.visualizer import AccidentVisualizer
+    from web_design.visualizer import AccidentVisualizer, figure_from_payload, figure_to_payload
+    from web_design.db_backend import create_db_engine, database_url, is_embedded
 except ImportError:
     st.error("치명적 오류: 'web_design/visualizer.py' 모듈을 찾을 수 없습니다. 파일 경로를 확인하세요.")
     st.stop() # 모듈이 없으면 앱 실행 중지
@@ -45,16 +45,13 @@ def init_visualizer():
     """
     DB에 연결하고 AccidentVisualizer 객체를 초기화합니다.
     연결 실패 시 None을 반환합니다.
+    DB 백엔드(MySQL / 내장 SQLite)는 web_design/db_backend.py 설정(SAFECAR_DB_BACKEND 등)을 따릅니다.
     """
-    MYSQL_USER = 'skn22'
-    MYSQL_PASSWORD = 'skn22'
-    MYSQL_HOST = 'localhost'
-    MYSQL_PORT = '3306'
-    MYSQL_DB_NAME = 'project_1'
-    
     try:
-        DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB_NAME}?charset=utf8mb4"
-        engine = create_engine(DATABASE_URL)
+        engine = create_db_engine(database_url())
+        if is_embedded(engine) and not os.path.exists(engine.url.database):
+            st.error(f"내장 DB 파일이 없습니다: {engine.url.database} (sql/csv_to_db.py --backend sqlite로 먼저 적재하세요)")
+            return None
         # 연결 테스트 (실패를 빨리 감지)
         with engine.connect() as conn:
             pass  # 연결 성공
@@ -101,6 +98,36 @@ except Exception as e:
 
 
 
+# ===== 조회 조건 (선택) =====
+# 아래 차트와 대시보드에 공통으로 적용됩니다. 값은 바인드 파라미터로 전달됩니다.
+def build_filters() -> dict:
+    filters = {}
+    with st.expander("조회 조건 (선택)"):
+        try:
+            months = viz.get_filter_options('발생년월')
+        except Exception as e:
+            st.warning(f"조건 목록 로드 실패: {e}")
+            return filters
+        if len(months) > 1:
+            start, end = st.select_slider("발생년월 범위", options=months, value=(months[0], months[-1]), key="f_ym")
+            if (start, end) != (months[0], months[-1]):
+                filters['발생년월'] = (start, end)
+        cols = st.columns(3)
+        for i, label in enumerate(['주야', '사고유형', '법규위반 여부', '기상상태', '노면상태', '도로형태']):
+            with cols[i % 3]:
+                selected = st.multiselect(label, viz.get_filter_options(label), key=f"f_{label}")
+            if selected:
+                filters[label] = selected
+        # 사고내용을 검색할 수 없는 DB(압축 저장 등)면 get_filter_columns에서 빠짐
+        if '사고내용' in viz.get_filter_columns():
+            keyword = st.text_input("사고내용 검색어", key="f_desc").strip()
+            if keyword:
+                filters['사고내용'] = keyword
+    return filters
+
+
+filters = build_filters() if korean_labels else {}
+
 # ===== 입력 박스 (Visualizer와 연동) =====
 # 컬럼 목록이 비어있지 않은 경우에만 selectbox를 표시
 if korean_labels:
@@ -122,7 +149,10 @@ if korean_labels:
             # visualizer 객체를 사용하여 차트 생성
             with st.spinner(f"'{label1}'와(과) '{label2}' 관계를 분석 중입니다..."):
                 try:
-                    fig, title = viz.generate_visualization(label1, label2)
+                    # Figure 대신 간결한 JSON(payload)을 받아 세션에 저장 (새로고침 때 차트를 다시 만들지 않음)
+                    fig, title = viz.generate_visualization_payload(label1, label2, filters)
+                    # 단계별 소요 시간 (아래 성능 디버그 패널에서 표시)
+                    st.session_state['last_timing'] = viz.last_timing()
                     
                     # 결과를 세션 상태에 저장 (페이지가 새로고침되어도 유지됨)
                     if fig:
@@ -143,11 +173,74 @@ if korean_labels:
 if 'last_fig' in st.session_state:
     if st.session_state['last_fig']:
         st.write(f"### {st.session_state['last_title']}")
-        st.plotly_chart(st.session_state['last_fig'], use_container_width=True)
+        st.plotly_chart(figure_from_payload(st.session_state['last_fig']), use_container_width=True)
     else:
         # 차트 생성 실패 시 (fig is None 또는 오류 발생)
         st.error(f"차트 생성 실패: {st.session_state['last_title']}")
 
+# ===== 대시보드 (여러 차트 한 번에) =====
+# 기준 변수 하나와 비교 변수 여러 개를 고르면 각 조합의 차트를 동시에 생성하고,
+# 완성되는 순서대로 자리(placeholder)에 채워 넣습니다.
+if korean_labels:
+    st.divider()
+    st.subheader("대시보드: 여러 조합을 한 번에 보기")
+    base_label = st.selectbox("기준 변수:", korean_labels, index=0, key="dash_base")
+    compare_labels = st.multiselect("비교할 변수 (여러 개 선택):",
+                                    [label for label in korean_labels if label != base_label],
+                                    key="dash_others")
+
+    if st.button("대시보드 생성", key="dashboard_btn", use_container_width=True):
+        pairs = [(base_label, other) for other in compare_labels]
+        if not pairs:
+            st.warning("비교할 변수를 하나 이상 선택하세요.")
+        else:
+            st.session_state['dashboard'] = []
+            grid = st.columns(2)
+            slots = {pair: grid[i % 2].empty() for i, pair in enumerate(pairs)}
+            for pair, slot in slots.items():
+                slot.info(f"'{pair[0]}' / '{pair[1]}' 분석 중...")
+            for label1, label2, fig, title in viz.generate_visualizations(pairs, filters=filters):
+                payload = figure_to_payload(fig) if fig else None
+                st.session_state['dashboard'].append((label1, label2, payload, title))
+                with slots[(label1, label2)].container():
+                    if fig:
+                        st.write(f"#### {title}")
+                        st.plotly_chart(fig, use_container_width=True)
+                    else:
+                        st.error(f"차트 생성 실패: {title}")
+    elif st.session_state.get('dashboard'):
+        # 새로고침 시 마지막 대시보드를 다시 표시
+        grid = st.columns(2)
+        for i, (label1, label2, payload, title) in enumerate(st.session_state['dashboard']):
+            with grid[i % 2]:
+                if payload:
+                    st.write(f"#### {title}")
+                    st.plotly_chart(figure_from_payload(payload), use_container_width=True)
+                else:
+                    st.error(f"차트 생성 실패: {title}")
+
+# ===== 성능 디버그 (선택) =====
+# 주소 뒤에 ?debug=1 을 붙이거나 SAFECAR_DEBUG_PANEL=1 로 실행하면 표시됩니다.
+# 느린 차트는 web_design/instrumentation.py 설정의 느린 쿼리 로그(data/logs/slow_query.log)에도 남습니다.
+if os.environ.get("SAFECAR_DEBUG_PANEL") == "1" or st.query_params.get("debug") == "1":
+    with st.expander("성능 디버그"):
+        timing = st.session_state.get('last_timing')
+        if timing:
+            st.write(f"**마지막 차트: {timing['label1']} / {timing['label2']}**"
+                     + (" (만들어 둔 결과 사용)" if timing['cached'] else ""))
+            stage_cols = st.columns(5)
+            for col, (name, key) in zip(stage_cols, [("전체", 'total_ms'), ("SQL 실행", 'query_ms'),
+                                                     ("DataFrame 변환", 'dataframe_ms'), ("차트 생성", 'figure_ms'),
+                                                     ("JSON 직렬화", 'payload_ms')]):
+                col.metric(name, f"{timing[key]:,.1f} ms")
+            if timing['queries']:
+                st.dataframe([{'SQL': q['sql'], 'ms': q['ms'], '행 수': q['rows']} for q in timing['queries']],
+                             use_container_width=True)
+        st.write("**레이블 쌍별 최근 생성 시간 (p95 큰 순서)**")
+        st.dataframe(viz.timing_summary(), use_container_width=True)
+        st.write("**조회 캐시 / 연결 풀**")
+        st.json({'cache': viz.cache_stats(), 'pool': viz.pool_stats()})
+
 # -----------------------------
 # 하단 좌측: 이전페이지 버튼
 # -----------------------------
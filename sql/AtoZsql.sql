@@ -41,6 +41,7 @@ CREATE TABLE ACCIDENT (
     RoadSurfaceState      VARCHAR(50)  NOT NULL COMMENT '노면상태',
     WeatherState          VARCHAR(50)  NOT NULL COMMENT '기상상태',
     RoadForm              VARCHAR(50)  NOT NULL COMMENT '도로형태',
+    SourceHash            CHAR(16)     NULL     COMMENT '원본 행 내용 해시(증분 적재용)',
     PRIMARY KEY (AccidentID),
     KEY idx_accident_ym         (OccurYearMonth),
     KEY idx_accident_region     (RegionCode),
@@ -93,4 +94,264 @@ CREATE TABLE DRIVER (
 CREATE INDEX idx_accident_weather  ON ACCIDENT (WeatherState);
 CREATE INDEX idx_accident_surface  ON ACCIDENT (RoadSurfaceState);
 CREATE INDEX idx_accident_roadform ON ACCIDENT (RoadForm);
+-- 조회 조건(web_design/visualizer.py filters)용 복합 인덱스 (기존 DB에도 그대로 실행하면 추가됨)
+-- 발생년월 범위 + 사고 범주 조건/GROUP BY: 범위 탐색 후 인덱스만 읽고 집계 (커버링)
+CREATE INDEX idx_accident_ym_dims ON ACCIDENT
+    (OccurYearMonth, DayNight, AccidentType, WeatherState, RoadSurfaceState, RoadForm, LawViolationYn);
+-- 기상 + 노면 동시 조건
+CREATE INDEX idx_accident_weather_surface ON ACCIDENT (WeatherState, RoadSurfaceState);
+-- 주야 조건 + 발생년월 추이 (정렬된 인덱스 순서로 월별 집계, 커버링)
+CREATE INDEX idx_accident_daynight_ym ON ACCIDENT (DayNight, OccurYearMonth);
 
+
+-- 5) ETL 적재 워터마크 (csv_to_db.py 증분 적재용, 발생년월별 행 수/내용 해시)
+--    기존 DB라면: ALTER TABLE ACCIDENT ADD COLUMN SourceHash CHAR(16) NULL COMMENT '원본 행 내용 해시(증분 적재용)' AFTER RoadForm;
+DROP TABLE IF EXISTS ETL_LOAD_WATERMARK;
+CREATE TABLE ETL_LOAD_WATERMARK (
+    OccurYearMonth  CHAR(6)      NOT NULL COMMENT '발생년월(YYYYMM)',
+    RowCount        INT          NOT NULL COMMENT '적재된 사고 건수',
+    ContentHash     CHAR(32)     NOT NULL COMMENT '월 단위 내용 해시(행 해시 합/XOR)',
+    LoadedAt        DATETIME     NOT NULL COMMENT '적재 시각',
+    PRIMARY KEY (OccurYearMonth)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='ETL 적재 워터마크';
+
+-- 6) ETL 체크포인트 상태 (csv_to_db.py --resume 용, 원본 파일 해시별 진행 상황)
+DROP TABLE IF EXISTS ETL_STATE;
+CREATE TABLE ETL_STATE (
+    SourceFileHash        CHAR(64)     NOT NULL COMMENT '원본 파일 해시(SHA-256)',
+    SourceFile            VARCHAR(255) NOT NULL COMMENT '원본 파일 경로',
+    BatchSize             INT          NOT NULL COMMENT '배치 크기(행)',
+    LastBatch             INT          NOT NULL DEFAULT -1 COMMENT '마지막으로 커밋된 배치 번호',
+    AccidentIdHighWater   BIGINT       NOT NULL DEFAULT 0 COMMENT '커밋된 최대 AccidentID',
+    RejectedRows          INT          NOT NULL DEFAULT 0 COMMENT '거부된 행 수',
+    Status                VARCHAR(10)  NOT NULL COMMENT '상태(running/done)',
+    UpdatedAt             DATETIME     NOT NULL COMMENT '갱신 시각',
+    PRIMARY KEY (SourceFileHash),
+    CONSTRAINT chk_etl_state_status
+        CHECK (Status IN ('running','done'))
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='ETL 체크포인트 상태';
+
+-- 7) (옵션) 정규화 스키마 변형: 저카디널리티 컬럼 사전(룩업) 테이블
+--    csv_to_db.py --normalized 가 REGION과 같은 방식으로 레이블을 동기화하고 코드로 적재합니다.
+--    AccidentVisualizer는 코드로 집계한 뒤 결과에만 레이블을 붙입니다.
+DROP TABLE IF EXISTS LK_DAY_NIGHT;
+CREATE TABLE LK_DAY_NIGHT (
+    Code    SMALLINT     NOT NULL COMMENT '주야 코드',
+    Label   VARCHAR(50)  NOT NULL COMMENT '주야',
+    PRIMARY KEY (Code),
+    UNIQUE KEY uq_lk_day_night_label (Label)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='주야 룩업';
+
+DROP TABLE IF EXISTS LK_ACCIDENT_TYPE;
+CREATE TABLE LK_ACCIDENT_TYPE (
+    Code    SMALLINT     NOT NULL COMMENT '사고유형 코드',
+    Label   VARCHAR(50)  NOT NULL COMMENT '사고유형',
+    PRIMARY KEY (Code),
+    UNIQUE KEY uq_lk_accident_type_label (Label)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='사고유형 룩업';
+
+DROP TABLE IF EXISTS LK_WEATHER_STATE;
+CREATE TABLE LK_WEATHER_STATE (
+    Code    SMALLINT     NOT NULL COMMENT '기상상태 코드',
+    Label   VARCHAR(50)  NOT NULL COMMENT '기상상태',
+    PRIMARY KEY (Code),
+    UNIQUE KEY uq_lk_weather_state_label (Label)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='기상상태 룩업';
+
+DROP TABLE IF EXISTS LK_ROAD_SURFACE_STATE;
+CREATE TABLE LK_ROAD_SURFACE_STATE (
+    Code    SMALLINT     NOT NULL COMMENT '노면상태 코드',
+    Label   VARCHAR(50)  NOT NULL COMMENT '노면상태',
+    PRIMARY KEY (Code),
+    UNIQUE KEY uq_lk_road_surface_state_label (Label)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='노면상태 룩업';
+
+DROP TABLE IF EXISTS LK_ROAD_FORM;
+CREATE TABLE LK_ROAD_FORM (
+    Code    SMALLINT     NOT NULL COMMENT '도로형태 코드',
+    Label   VARCHAR(50)  NOT NULL COMMENT '도로형태',
+    PRIMARY KEY (Code),
+    UNIQUE KEY uq_lk_road_form_label (Label)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='도로형태 룩업';
+
+DROP TABLE IF EXISTS LK_VEHICLE_TYPE;
+CREATE TABLE LK_VEHICLE_TYPE (
+    Code    SMALLINT     NOT NULL COMMENT '차종 코드',
+    Label   VARCHAR(50)  NOT NULL COMMENT '차종',
+    PRIMARY KEY (Code),
+    UNIQUE KEY uq_lk_vehicle_type_label (Label)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='차종 룩업';
+
+DROP TABLE IF EXISTS LK_AGE_GROUP;
+CREATE TABLE LK_AGE_GROUP (
+    Code    SMALLINT     NOT NULL COMMENT '연령대 코드',
+    Label   VARCHAR(50)  NOT NULL COMMENT '연령대',
+    PRIMARY KEY (Code),
+    UNIQUE KEY uq_lk_age_group_label (Label)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='연령대 룩업';
+
+DROP TABLE IF EXISTS LK_INJURY_LEVEL;
+CREATE TABLE LK_INJURY_LEVEL (
+    Code    SMALLINT     NOT NULL COMMENT '상해정도 코드',
+    Label   VARCHAR(50)  NOT NULL COMMENT '상해정도',
+    PRIMARY KEY (Code),
+    UNIQUE KEY uq_lk_injury_level_label (Label)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='상해정도 룩업';
+
+-- 변형 스키마 적용: 테이블이 비어 있을 때 sql/AtoZsql_coded.sql 실행
+--   (ACCIDENT/DRIVER/ACCIDENT_WIDE의 코드 컬럼을 SMALLINT + 룩업 FK로 변경.
+--    csv_to_db.py --normalized는 코드 컬럼이 정수형이 아니면 적재하지 않습니다.)
+
+-- 적재 전/후 테이블·인덱스 크기 비교 (ANALYZE TABLE ACCIDENT, DRIVER; 이후 실행)
+-- SELECT TABLE_NAME, TABLE_ROWS,
+--        ROUND(DATA_LENGTH / 1024 / 1024, 1)  AS data_mb,
+--        ROUND(INDEX_LENGTH / 1024 / 1024, 1) AS index_mb
+-- FROM information_schema.TABLES
+-- WHERE TABLE_SCHEMA = 'project_1' AND TABLE_NAME IN ('ACCIDENT', 'DRIVER');
+
+-- 8) (옵션) csv_to_db.py --mode infile 사용 시 서버에서 LOCAL INFILE 허용
+--    (비활성화 상태면 로더가 자동으로 배치 INSERT 경로로 대체합니다)
+-- SET GLOBAL local_infile = 1;
+
+-- 9) (옵션) 사고내용 분리 스키마: ACCIDENT를 고정 폭 컬럼만 남긴 좁은 팩트 테이블로 유지
+--    csv_to_db.py --description-table 이 사고내용을 아래 두 테이블에 적재합니다.
+--    (--description-dedup: 같은 본문은 한 번만 저장 / --description-codec mysql_compress: COMPRESS() 형식 압축)
+--    차트 집계 쿼리는 ACCIDENT만 스캔하고, 사고내용 조회 조건만 EXISTS 하위 쿼리로 이 테이블들을 검색합니다.
+--    (web_design/descriptions.py가 저장 위치를 판별, 압축 본문은 LIKE로 검색할 수 없음)
+DROP TABLE IF EXISTS ACCIDENT_DESCRIPTION;
+DROP TABLE IF EXISTS DESCRIPTION_TEXT;
+CREATE TABLE DESCRIPTION_TEXT (
+    DescriptionID  BIGINT       NOT NULL COMMENT '본문ID (dedup이 아니면 AccidentID와 같음)',
+    ContentHash    CHAR(16)     NOT NULL COMMENT '본문 해시(BLAKE2b 64bit)',
+    Codec          VARCHAR(16)  NOT NULL DEFAULT 'none' COMMENT '저장 형식(none/mysql_compress)',
+    Body           MEDIUMBLOB   NOT NULL COMMENT '사고내용 본문(UTF-8, 압축 시 COMPRESS() 형식)',
+    PRIMARY KEY (DescriptionID),
+    KEY idx_description_hash (ContentHash)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='사고내용 본문';
+
+CREATE TABLE ACCIDENT_DESCRIPTION (
+    AccidentID     BIGINT       NOT NULL COMMENT '사고ID',
+    DescriptionID  BIGINT       NOT NULL COMMENT '본문ID',
+    PRIMARY KEY (AccidentID),
+    KEY idx_accident_description (DescriptionID),
+    CONSTRAINT fk_description_accident
+        FOREIGN KEY (AccidentID)
+        REFERENCES ACCIDENT (AccidentID)
+        ON DELETE CASCADE,
+    CONSTRAINT fk_description_text
+        FOREIGN KEY (DescriptionID)
+        REFERENCES DESCRIPTION_TEXT (DescriptionID)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='사고 -> 사고내용 매핑';
+
+-- 변형 스키마 적용 (사고내용을 사이드 테이블로 옮긴 뒤 ACCIDENT에서 TEXT 컬럼 제거)
+-- ALTER TABLE ACCIDENT DROP COLUMN Description;
+
+-- 사고내용이 필요할 때 조회
+-- SELECT a.AccidentID,
+--        CONVERT(CASE t.Codec WHEN 'mysql_compress' THEN UNCOMPRESS(t.Body) ELSE t.Body END USING utf8mb4) AS Description
+-- FROM ACCIDENT a
+-- JOIN ACCIDENT_DESCRIPTION d ON d.AccidentID = a.AccidentID
+-- JOIN DESCRIPTION_TEXT t ON t.DescriptionID = d.DescriptionID;
+
+-- 10) 시각화용 사전 집계 (web_design/summary.py, csv_to_db.py 적재 후 자동 갱신)
+--     AccidentVisualizer의 모든 범주형/시간형 차원 단일/쌍 조합별 건수와 수치형 컬럼 합계.
+--     차트 조회는 기본 테이블 대신 이 테이블에서 DimPair 한 구간만 읽습니다.
+--     AGG_SUMMARY_STATE에 행이 없으면(적재 중/실패) 시각화는 기본 테이블에서 집계합니다.
+DROP TABLE IF EXISTS AGG_PAIR_SUMMARY;
+CREATE TABLE AGG_PAIR_SUMMARY (
+    DimPair              VARCHAR(80)  NOT NULL COMMENT '차원 조합(정렬된 내부 컬럼명, | 구분)',
+    Value1               VARCHAR(100) NULL     COMMENT '첫 번째 차원 값',
+    Value2               VARCHAR(100) NULL     COMMENT '두 번째 차원 값(단일 차원이면 NULL)',
+    RowCount             BIGINT       NOT NULL COMMENT '행 수(사고건수, DRIVER 조합은 운전자 행 기준)',
+    DeathCount           BIGINT       NOT NULL COMMENT '사망자수 합계',
+    SevereInjuryCount    BIGINT       NOT NULL COMMENT '중상자수 합계',
+    MinorInjuryCount     BIGINT       NOT NULL COMMENT '경상자수 합계',
+    ReportedInjuryCount  BIGINT       NOT NULL COMMENT '부상신고자수 합계',
+    KEY idx_agg_pair (DimPair)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='시각화용 차원 조합별 사전 집계';
+
+DROP TABLE IF EXISTS AGG_SUMMARY_STATE;
+CREATE TABLE AGG_SUMMARY_STATE (
+    StateID      TINYINT   NOT NULL COMMENT '항상 1',
+    RefreshedAt  DATETIME  NOT NULL COMMENT '갱신 시각',
+    SummaryRows  INT       NOT NULL COMMENT '사전 집계 행 수',
+    PRIMARY KEY (StateID)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='사전 집계 갱신 상태';
+
+-- 11) 데이터 세대(generation) 카운터 (web_design/query_cache.py)
+--     csv_to_db.py가 적재에 성공할 때마다 Generation을 1 증가시키고,
+--     AccidentVisualizer의 조회 결과 캐시는 값이 바뀌면 전체를 무효화합니다.
+DROP TABLE IF EXISTS DATA_GENERATION;
+CREATE TABLE DATA_GENERATION (
+    GenerationID  TINYINT   NOT NULL COMMENT '항상 1',
+    Generation    BIGINT    NOT NULL COMMENT '적재 성공 횟수',
+    UpdatedAt     DATETIME  NOT NULL COMMENT '마지막 적재 완료 시각',
+    PRIMARY KEY (GenerationID)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='데이터 세대 카운터 (조회 캐시 무효화용)';
+
+-- 12) (옵션) 와이드 팩트 테이블 (csv_to_db.py 적재 후 자동 재생성, web_design/visualizer.py)
+--     사고 1건을 1행으로 하여 지역명과 가해/피해 운전자 속성을 역할별 컬럼으로 펼칩니다.
+--     '가해운전자 차종' 등 역할별 컬럼 차트는 JOIN 없이 이 테이블만 읽고, 사고 1건이 한 번만 집계됩니다.
+--     같은 역할의 운전자가 여러 명이면 DriverID가 가장 작은 운전자를 사용합니다. (DriverCount = 전체 인원)
+DROP TABLE IF EXISTS ACCIDENT_WIDE;
+CREATE TABLE ACCIDENT_WIDE (
+    AccidentID            BIGINT       NOT NULL COMMENT '사고ID',
+    OccurYearMonth        CHAR(6)      NOT NULL COMMENT '발생년월(YYYYMM)',
+    DayNight              VARCHAR(10)  NOT NULL COMMENT '주야',
+    RegionCode            VARCHAR(20)  NOT NULL COMMENT '시군구코드',
+    RegionName            VARCHAR(100) NOT NULL COMMENT '시군구명',
+    AccidentType          VARCHAR(50)  NOT NULL COMMENT '사고유형',
+    LawViolationYn        CHAR(1)      NOT NULL COMMENT '법규위반 여부(Y/N)',
+    RoadSurfaceState      VARCHAR(50)  NOT NULL COMMENT '노면상태',
+    WeatherState          VARCHAR(50)  NOT NULL COMMENT '기상상태',
+    RoadForm              VARCHAR(50)  NOT NULL COMMENT '도로형태',
+    DeathCount            INT          NOT NULL COMMENT '사망자수',
+    SevereInjuryCount     INT          NOT NULL COMMENT '중상자수',
+    MinorInjuryCount      INT          NOT NULL COMMENT '경상자수',
+    ReportedInjuryCount   INT          NOT NULL COMMENT '부상신고자수',
+    DriverCount           SMALLINT     NOT NULL COMMENT '운전자 수',
+    OffenderVehicleType   VARCHAR(50)  NULL     COMMENT '가해운전자 차종',
+    OffenderGender        CHAR(1)      NULL     COMMENT '가해운전자 성별',
+    OffenderAgeGroup      VARCHAR(20)  NULL     COMMENT '가해운전자 연령대',
+    OffenderInjuryLevel   VARCHAR(20)  NULL     COMMENT '가해운전자 상해정도',
+    VictimVehicleType     VARCHAR(50)  NULL     COMMENT '피해운전자 차종 (단독 사고면 NULL)',
+    VictimGender          CHAR(1)      NULL     COMMENT '피해운전자 성별',
+    VictimAgeGroup        VARCHAR(20)  NULL     COMMENT '피해운전자 연령대',
+    VictimInjuryLevel     VARCHAR(20)  NULL     COMMENT '피해운전자 상해정도',
+    PRIMARY KEY (AccidentID),
+    KEY idx_wide_ym (OccurYearMonth)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COMMENT='사고-운전자 와이드 팩트 (조회 전용, 적재 후 재생성)';
+
+-- 정규화 스키마 변형(7)의 sql/AtoZsql_coded.sql이 와이드 테이블의 코드 컬럼 타입도 함께 맞춥니다.
@@ -0,0 +1,43 @@
+-- ------------------------------------------------------------
+-- 정규화(룩업 코드) 스키마 변형 - MySQL
+-- csv_to_db.py --normalized 용: 저카디널리티 컬럼을 LK_* 룩업 테이블의 SMALLINT 코드로 저장합니다.
+-- AtoZsql.sql 실행 직후(ACCIDENT/DRIVER/ACCIDENT_WIDE가 비어 있을 때) 실행하세요.
+-- 문자열 스키마 그대로 --normalized로 적재하면 csv_to_db.py가 적재를 중단합니다.
+-- 되돌리려면 AtoZsql.sql을 다시 실행합니다.
+-- ------------------------------------------------------------
+
+USE project_1;
+
+ALTER TABLE ACCIDENT
+    MODIFY DayNight          SMALLINT NOT NULL COMMENT '주야 코드',
+    MODIFY AccidentType      SMALLINT NOT NULL COMMENT '사고유형 코드',
+    MODIFY RoadSurfaceState  SMALLINT NOT NULL COMMENT '노면상태 코드',
+    MODIFY WeatherState      SMALLINT NOT NULL COMMENT '기상상태 코드',
+    MODIFY RoadForm          SMALLINT NOT NULL COMMENT '도로형태 코드',
+    ADD CONSTRAINT fk_accident_daynight  FOREIGN KEY (DayNight)         REFERENCES LK_DAY_NIGHT (Code),
+    ADD CONSTRAINT fk_accident_type      FOREIGN KEY (AccidentType)     REFERENCES LK_ACCIDENT_TYPE (Code),
+    ADD CONSTRAINT fk_accident_surface   FOREIGN KEY (RoadSurfaceState) REFERENCES LK_ROAD_SURFACE_STATE (Code),
+    ADD CONSTRAINT fk_accident_weather   FOREIGN KEY (WeatherState)     REFERENCES LK_WEATHER_STATE (Code),
+    ADD CONSTRAINT fk_accident_roadform  FOREIGN KEY (RoadForm)         REFERENCES LK_ROAD_FORM (Code);
+
+ALTER TABLE DRIVER
+    MODIFY VehicleType  SMALLINT NOT NULL COMMENT '차종 코드',
+    MODIFY AgeGroup     SMALLINT NOT NULL COMMENT '연령대 코드',
+    MODIFY InjuryLevel  SMALLINT NOT NULL COMMENT '상해정도 코드',
+    ADD CONSTRAINT fk_driver_vehicle  FOREIGN KEY (VehicleType) REFERENCES LK_VEHICLE_TYPE (Code),
+    ADD CONSTRAINT fk_driver_age      FOREIGN KEY (AgeGroup)    REFERENCES LK_AGE_GROUP (Code),
+    ADD CONSTRAINT fk_driver_injury   FOREIGN KEY (InjuryLevel) REFERENCES LK_INJURY_LEVEL (Code);
+
+-- 와이드 팩트 테이블은 적재 후 ACCIDENT/DRIVER에서 다시 만들어지므로 코드 컬럼 타입을 같게 맞춥니다.
+ALTER TABLE ACCIDENT_WIDE
+    MODIFY DayNight             SMALLINT NOT NULL COMMENT '주야 코드',
+    MODIFY AccidentType         SMALLINT NOT NULL COMMENT '사고유형 코드',
+    MODIFY RoadSurfaceState     SMALLINT NOT NULL COMMENT '노면상태 코드',
+    MODIFY WeatherState         SMALLINT NOT NULL COMMENT '기상상태 코드',
+    MODIFY RoadForm             SMALLINT NOT NULL COMMENT '도로형태 코드',
+    MODIFY OffenderVehicleType  SMALLINT NULL     COMMENT '가해운전자 차종 코드',
+    MODIFY OffenderAgeGroup     SMALLINT NULL     COMMENT '가해운전자 연령대 코드',
+    MODIFY OffenderInjuryLevel  SMALLINT NULL     COMMENT '가해운전자 상해정도 코드',
+    MODIFY VictimVehicleType    SMALLINT NULL     COMMENT '피해운전자 차종 코드',
+    MODIFY VictimAgeGroup       SMALLINT NULL     COMMENT '피해운전자 연령대 코드',
+    MODIFY VictimInjuryLevel    SMALLINT NULL     COMMENT '피해운전자 상해정도 코드';
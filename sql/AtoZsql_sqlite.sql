@@ -0,0 +1,84 @@
+-- 내장(단일 파일) SQLite 백엔드용 스키마
+-- AtoZsql.sql(MySQL)의 테이블 구조를 SQLite 문법으로 옮긴 것입니다.
+-- web_design/db_backend.py의 ensure_schema()가 빈 DB 파일에 자동으로 실행하며,
+-- AtoZsql.sql을 변경하면 이 파일도 함께 맞춰야 합니다.
+
+CREATE TABLE REGION (
+  RegionCode VARCHAR(20) PRIMARY KEY, RegionName VARCHAR(100) NOT NULL
+);
+CREATE TABLE ACCIDENT (
+  AccidentID INTEGER PRIMARY KEY AUTOINCREMENT, OccurYearMonth CHAR(6) NOT NULL,
+  DayNight VARCHAR(10) NOT NULL, RegionCode VARCHAR(20) NOT NULL REFERENCES REGION (RegionCode),
+  Description TEXT, DeathCount INT NOT NULL DEFAULT 0, SevereInjuryCount INT NOT NULL DEFAULT 0,
+  MinorInjuryCount INT NOT NULL DEFAULT 0, ReportedInjuryCount INT NOT NULL DEFAULT 0,
+  AccidentType VARCHAR(50) NOT NULL, LawViolationYn CHAR(1) NOT NULL,
+  RoadSurfaceState VARCHAR(50) NOT NULL, WeatherState VARCHAR(50) NOT NULL,
+  RoadForm VARCHAR(50) NOT NULL, SourceHash CHAR(16)
+);
+CREATE INDEX idx_accident_ym ON ACCIDENT (OccurYearMonth);
+CREATE INDEX idx_accident_region ON ACCIDENT (RegionCode);
+CREATE INDEX idx_accident_type ON ACCIDENT (AccidentType);
+CREATE INDEX idx_accident_weather ON ACCIDENT (WeatherState);
+CREATE INDEX idx_accident_surface ON ACCIDENT (RoadSurfaceState);
+CREATE INDEX idx_accident_roadform ON ACCIDENT (RoadForm);
+CREATE INDEX idx_accident_ym_dims ON ACCIDENT
+  (OccurYearMonth, DayNight, AccidentType, WeatherState, RoadSurfaceState, RoadForm, LawViolationYn);
+CREATE INDEX idx_accident_weather_surface ON ACCIDENT (WeatherState, RoadSurfaceState);
+CREATE INDEX idx_accident_daynight_ym ON ACCIDENT (DayNight, OccurYearMonth);
+CREATE TABLE DRIVER (
+  DriverID INTEGER PRIMARY KEY AUTOINCREMENT,
+  AccidentID BIGINT NOT NULL REFERENCES ACCIDENT (AccidentID), `Role` VARCHAR(10) NOT NULL,
+  VehicleType VARCHAR(50) NOT NULL, Gender CHAR(1) NOT NULL, AgeGroup VARCHAR(20) NOT NULL,
+  InjuryLevel VARCHAR(20) NOT NULL
+);
+CREATE INDEX idx_driver_accident ON DRIVER (AccidentID);
+CREATE INDEX idx_driver_role ON DRIVER (`Role`);
+CREATE TABLE DESCRIPTION_TEXT (
+  DescriptionID BIGINT PRIMARY KEY, ContentHash CHAR(16) NOT NULL,
+  Codec VARCHAR(16) NOT NULL DEFAULT 'none', Body BLOB NOT NULL
+);
+CREATE INDEX idx_description_hash ON DESCRIPTION_TEXT (ContentHash);
+CREATE TABLE ACCIDENT_DESCRIPTION (
+  AccidentID BIGINT PRIMARY KEY REFERENCES ACCIDENT (AccidentID),
+  DescriptionID BIGINT NOT NULL REFERENCES DESCRIPTION_TEXT (DescriptionID)
+);
+CREATE INDEX idx_accident_description ON ACCIDENT_DESCRIPTION (DescriptionID);
+CREATE TABLE ACCIDENT_WIDE (
+  AccidentID BIGINT PRIMARY KEY, OccurYearMonth CHAR(6) NOT NULL, DayNight VARCHAR(10) NOT NULL,
+  RegionCode VARCHAR(20) NOT NULL, RegionName VARCHAR(100) NOT NULL, AccidentType VARCHAR(50) NOT NULL,
+  LawViolationYn CHAR(1) NOT NULL, RoadSurfaceState VARCHAR(50) NOT NULL, WeatherState VARCHAR(50) NOT NULL,
+  RoadForm VARCHAR(50) NOT NULL, DeathCount INT NOT NULL, SevereInjuryCount INT NOT NULL,
+  MinorInjuryCount INT NOT NULL, ReportedInjuryCount INT NOT NULL, DriverCount SMALLINT NOT NULL,
+  OffenderVehicleType VARCHAR(50), OffenderGender CHAR(1), OffenderAgeGroup VARCHAR(20), OffenderInjuryLevel VARCHAR(20),
+  VictimVehicleType VARCHAR(50), VictimGender CHAR(1), VictimAgeGroup VARCHAR(20), VictimInjuryLevel VARCHAR(20)
+);
+CREATE INDEX idx_wide_ym ON ACCIDENT_WIDE (OccurYearMonth);
+CREATE TABLE AGG_PAIR_SUMMARY (
+  DimPair VARCHAR(80) NOT NULL, Value1 VARCHAR(100), Value2 VARCHAR(100),
+  RowCount BIGINT NOT NULL, DeathCount BIGINT NOT NULL, SevereInjuryCount BIGINT NOT NULL,
+  MinorInjuryCount BIGINT NOT NULL, ReportedInjuryCount BIGINT NOT NULL
+);
+CREATE INDEX idx_agg_pair ON AGG_PAIR_SUMMARY (DimPair);
+CREATE TABLE AGG_SUMMARY_STATE (
+  StateID TINYINT PRIMARY KEY, RefreshedAt DATETIME NOT NULL, SummaryRows INT NOT NULL
+);
+CREATE TABLE DATA_GENERATION (
+  GenerationID TINYINT PRIMARY KEY, Generation BIGINT NOT NULL, UpdatedAt DATETIME NOT NULL
+);
+CREATE TABLE ETL_LOAD_WATERMARK (
+  OccurYearMonth CHAR(6) PRIMARY KEY, RowCount INT NOT NULL, ContentHash CHAR(32) NOT NULL,
+  LoadedAt DATETIME NOT NULL
+);
+CREATE TABLE ETL_STATE (
+  SourceFileHash CHAR(64) PRIMARY KEY, SourceFile VARCHAR(255) NOT NULL, BatchSize INT NOT NULL,
+  LastBatch INT NOT NULL DEFAULT -1, AccidentIdHighWater BIGINT NOT NULL DEFAULT 0,
+  RejectedRows INT NOT NULL DEFAULT 0, Status VARCHAR(10) NOT NULL, UpdatedAt DATETIME NOT NULL
+);
+CREATE TABLE LK_DAY_NIGHT (Code SMALLINT PRIMARY KEY, Label VARCHAR(50) NOT NULL UNIQUE);
+CREATE TABLE LK_ACCIDENT_TYPE (Code SMALLINT PRIMARY KEY, Label VARCHAR(50) NOT NULL UNIQUE);
+CREATE TABLE LK_WEATHER_STATE (Code SMALLINT PRIMARY KEY, Label VARCHAR(50) NOT NULL UNIQUE);
+CREATE TABLE LK_ROAD_SURFACE_STATE (Code SMALLINT PRIMARY KEY, Label VARCHAR(50) NOT NULL UNIQUE);
+CREATE TABLE LK_ROAD_FORM (Code SMALLINT PRIMARY KEY, Label VARCHAR(50) NOT NULL UNIQUE);
+CREATE TABLE LK_VEHICLE_TYPE (Code SMALLINT PRIMARY KEY, Label VARCHAR(50) NOT NULL UNIQUE);
+CREATE TABLE LK_AGE_GROUP (Code SMALLINT PRIMARY KEY, Label VARCHAR(50) NOT NULL UNIQUE);
+CREATE TABLE LK_INJURY_LEVEL (Code SMALLINT PRIMARY KEY, Label VARCHAR(50) NOT NULL UNIQUE);
@@ -0,0 +1,49 @@
+-- 정규화(룩업 코드) 스키마 변형 - 내장 SQLite 백엔드용 (AtoZsql_coded.sql과 같은 구조)
+-- SQLite는 컬럼 타입을 ALTER로 바꿀 수 없으므로 AtoZsql_sqlite.sql 실행 직후(빈 테이블)
+-- ACCIDENT/DRIVER/ACCIDENT_WIDE를 코드(SMALLINT) 컬럼으로 다시 만듭니다.
+-- web_design/db_backend.py의 ensure_schema(coded=True)가 새 DB 파일에 자동으로 실행합니다.
+-- (csv_to_db.py --backend sqlite --normalized로 처음 적재할 때)
+
+DROP TABLE ACCIDENT_WIDE;
+DROP TABLE DRIVER;
+DROP TABLE ACCIDENT;
+CREATE TABLE ACCIDENT (
+  AccidentID INTEGER PRIMARY KEY AUTOINCREMENT, OccurYearMonth CHAR(6) NOT NULL,
+  DayNight SMALLINT NOT NULL REFERENCES LK_DAY_NIGHT (Code),
+  RegionCode VARCHAR(20) NOT NULL REFERENCES REGION (RegionCode),
+  Description TEXT, DeathCount INT NOT NULL DEFAULT 0, SevereInjuryCount INT NOT NULL DEFAULT 0,
+  MinorInjuryCount INT NOT NULL DEFAULT 0, ReportedInjuryCount INT NOT NULL DEFAULT 0,
+  AccidentType SMALLINT NOT NULL REFERENCES LK_ACCIDENT_TYPE (Code), LawViolationYn CHAR(1) NOT NULL,
+  RoadSurfaceState SMALLINT NOT NULL REFERENCES LK_ROAD_SURFACE_STATE (Code),
+  WeatherState SMALLINT NOT NULL REFERENCES LK_WEATHER_STATE (Code),
+  RoadForm SMALLINT NOT NULL REFERENCES LK_ROAD_FORM (Code), SourceHash CHAR(16)
+);
+CREATE INDEX idx_accident_ym ON ACCIDENT (OccurYearMonth);
+CREATE INDEX idx_accident_region ON ACCIDENT (RegionCode);
+CREATE INDEX idx_accident_type ON ACCIDENT (AccidentType);
+CREATE INDEX idx_accident_weather ON ACCIDENT (WeatherState);
+CREATE INDEX idx_accident_surface ON ACCIDENT (RoadSurfaceState);
+CREATE INDEX idx_accident_roadform ON ACCIDENT (RoadForm);
+CREATE INDEX idx_accident_ym_dims ON ACCIDENT
+  (OccurYearMonth, DayNight, AccidentType, WeatherState, RoadSurfaceState, RoadForm, LawViolationYn);
+CREATE INDEX idx_accident_weather_surface ON ACCIDENT (WeatherState, RoadSurfaceState);
+CREATE INDEX idx_accident_daynight_ym ON ACCIDENT (DayNight, OccurYearMonth);
+CREATE TABLE DRIVER (
+  DriverID INTEGER PRIMARY KEY AUTOINCREMENT,
+  AccidentID BIGINT NOT NULL REFERENCES ACCIDENT (AccidentID), `Role` VARCHAR(10) NOT NULL,
+  VehicleType SMALLINT NOT NULL REFERENCES LK_VEHICLE_TYPE (Code), Gender CHAR(1) NOT NULL,
+  AgeGroup SMALLINT NOT NULL REFERENCES LK_AGE_GROUP (Code),
+  InjuryLevel SMALLINT NOT NULL REFERENCES LK_INJURY_LEVEL (Code)
+);
+CREATE INDEX idx_driver_accident ON DRIVER (AccidentID);
+CREATE INDEX idx_driver_role ON DRIVER (`Role`);
+CREATE TABLE ACCIDENT_WIDE (
+  AccidentID BIGINT PRIMARY KEY, OccurYearMonth CHAR(6) NOT NULL, DayNight SMALLINT NOT NULL,
+  RegionCode VARCHAR(20) NOT NULL, RegionName VARCHAR(100) NOT NULL, AccidentType SMALLINT NOT NULL,
+  LawViolationYn CHAR(1) NOT NULL, RoadSurfaceState SMALLINT NOT NULL, WeatherState SMALLINT NOT NULL,
+  RoadForm SMALLINT NOT NULL, DeathCount INT NOT NULL, SevereInjuryCount INT NOT NULL,
+  MinorInjuryCount INT NOT NULL, ReportedInjuryCount INT NOT NULL, DriverCount SMALLINT NOT NULL,
+  OffenderVehicleType SMALLINT, OffenderGender CHAR(1), OffenderAgeGroup SMALLINT, OffenderInjuryLevel SMALLINT,
+  VictimVehicleType SMALLINT, VictimGender CHAR(1), VictimAgeGroup SMALLINT, VictimInjuryLevel SMALLINT
+);
+CREATE INDEX idx_wide_ym ON ACCIDENT_WIDE (OccurYearMonth);
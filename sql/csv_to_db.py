@@ -1,98 +1,405 @@
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import inspect, text
+from sqlalchemy.types import Integer
+from contextlib import contextmanager
+import argparse
+import csv
+import hashlib
+import numpy as np
+import os
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+from etl_metrics import EtlMetrics, peak_rss_mb
+
+# 프로젝트 루트(web_design 패키지)를 경로에 추가: 적재 후 시각화용 사전 집계 갱신
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+  sys.path.insert(0, PROJECT_ROOT)
+from web_design.summary import SummaryCube
+from web_design.query_cache import GENERATION_TABLE, bump_data_generation
+from web_design.db_backend import BACKENDS, create_db_engine, database_url, default_backend, ensure_schema
+from web_design.descriptions import DESCRIPTION_CODECS, description_tables_exist, encode_description
 
 # --- 1. 설정 (사용자 제공 값으로 하드코딩) ---
 CSV_FILE = 'accident_df_preprocessed.csv'
+# data/preprocessing.py가 만드는 타입 지정 Parquet (있으면 CSV 대신 우선 사용)
+PARQUET_FILE = 'accident_df_preprocessed.parquet'
+
+# SQLAlchemy 연결 문자열 (MySQL 계정/내장 SQLite 파일 경로는 web_design/db_backend.py에서 설정)
+DATABASE_URL = database_url()
+
+# 적재 모드: 'row' = 기존 Row-by-Row, 'batch' = executemany 배치 적재,
+#           'infile' = TSV 스테이징 + LOAD DATA LOCAL INFILE (불가 시 batch로 대체)
+LOAD_MODES = ('row', 'batch', 'infile')
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_METRICS_FILE = 'etl_metrics.json'
+
+# --bulk 모드에서 적재 중 보조 인덱스를 내렸다가 다시 만드는 테이블
+# (FK가 사용하는 인덱스와 UNIQUE 인덱스는 유지)
+BULK_INDEX_TABLES = ('ACCIDENT', 'DRIVER')
+
+# 실행 단위 계측 (main()에서 실행마다 새로 생성)
+metrics = EtlMetrics()
+
+# ACCIDENT 컬럼 <- 전처리 DF 컬럼 매핑 (DDL 컬럼명과 정확히 일치해야 함)
+ACCIDENT_COLUMN_MAP = {
+  "OccurYearMonth": "OccurYearMonth",
+  "DayNight": "주야",
+  "RegionCode": "RegionCode",
+  "Description": "사고내용",
+  "DeathCount": "사망자수",
+  "SevereInjuryCount": "중상자수",
+  "MinorInjuryCount": "경상자수",
+  "ReportedInjuryCount": "부상신고자수",
+  "AccidentType": "사고유형",
+  "LawViolationYn": "LawViolationYn",
+  "RoadSurfaceState": "노면상태",
+  "WeatherState": "기상상태",
+  "RoadForm": "도로형태",
+  "SourceHash": "SourceHash",
+}
+
+# 행 내용 해시(SourceHash)를 계산할 원본 CSV 컬럼 (전처리 결과 파일의 컬럼 순서와 무관하게 고정)
+SOURCE_HASH_COLUMNS = [
+  '발생일시', '주야', '시군구', '사고내용', '사망자수', '중상자수', '경상자수', '부상신고자수',
+  '사고유형', '노면상태', '기상상태', '도로형태',
+  '가해운전자 차종', '가해운전자 성별', '가해운전자 연령대', '가해운전자 상해정도',
+  '피해운전자 차종', '피해운전자 성별', '피해운전자 연령대', '피해운전자 상해정도',
+]
+
+# DRIVER 역할별 컬럼 매핑 (가해 -> 피해 순서로 DriverID가 부여됨)
+DRIVER_COLUMN_MAP = {
+  "가해": {
+    "VehicleType": "가해운전자 차종",
+    "Gender": "g_gender_mapped",
+    "AgeGroup": "가해운전자 연령대",
+    "InjuryLevel": "가해운전자 상해정도",
+  },
+  "피해": {
+    "VehicleType": "피해운전자 차종",
+    "Gender": "p_gender_mapped",
+    "AgeGroup": "피해운전자 연령대",
+    "InjuryLevel": "피해운전자 상해정도",
+  },
+}
+
+# SQL 쿼리 정의 (text() 사용)
+# 컬럼 이름은 DDL과 정확히 일치해야 함
+SQL_INSERT_ACCIDENT = text("""
+  INSERT INTO ACCIDENT (
+    OccurYearMonth, DayNight, RegionCode, Description,
+    DeathCount, SevereInjuryCount, MinorInjuryCount, ReportedInjuryCount,
+    AccidentType, LawViolationYn, RoadSurfaceState, WeatherState, RoadForm, SourceHash
+  ) VALUES (
+    :OccurYearMonth, :DayNight, :RegionCode, :Description,
+    :DeathCount, :SevereInjuryCount, :MinorInjuryCount, :ReportedInjuryCount,
+    :AccidentType, :LawViolationYn, :RoadSurfaceState, :WeatherState, :RoadForm, :SourceHash
+  )
+""")
+
+# 배치 적재용: AccidentID를 클라이언트에서 미리 할당하므로 명시적으로 INSERT
+SQL_INSERT_ACCIDENT_WITH_ID = text("""
+  INSERT INTO ACCIDENT (
+    AccidentID, OccurYearMonth, DayNight, RegionCode, Description,
+    DeathCount, SevereInjuryCount, MinorInjuryCount, ReportedInjuryCount,
+    AccidentType, LawViolationYn, RoadSurfaceState, WeatherState, RoadForm, SourceHash
+  ) VALUES (
+    :AccidentID, :OccurYearMonth, :DayNight, :RegionCode, :Description,
+    :DeathCount, :SevereInjuryCount, :MinorInjuryCount, :ReportedInjuryCount,
+    :AccidentType, :LawViolationYn, :RoadSurfaceState, :WeatherState, :RoadForm, :SourceHash
+  )
+""")
+
+# 사고내용 분리 스키마(--description-table): Description 없는 ACCIDENT INSERT
+SQL_INSERT_ACCIDENT_NARROW_WITH_ID = text("""
+  INSERT INTO ACCIDENT (
+    AccidentID, OccurYearMonth, DayNight, RegionCode,
+    DeathCount, SevereInjuryCount, MinorInjuryCount, ReportedInjuryCount,
+    AccidentType, LawViolationYn, RoadSurfaceState, WeatherState, RoadForm, SourceHash
+  ) VALUES (
+    :AccidentID, :OccurYearMonth, :DayNight, :RegionCode,
+    :DeathCount, :SevereInjuryCount, :MinorInjuryCount, :ReportedInjuryCount,
+    :AccidentType, :LawViolationYn, :RoadSurfaceState, :WeatherState, :RoadForm, :SourceHash
+  )
+""")
+SQL_INSERT_DESCRIPTION_TEXT = text("""
+  INSERT INTO DESCRIPTION_TEXT (DescriptionID, ContentHash, Codec, Body)
+  VALUES (:DescriptionID, :ContentHash, :Codec, :Body)
+""")
+SQL_INSERT_ACCIDENT_DESCRIPTION = text("""
+  INSERT INTO ACCIDENT_DESCRIPTION (AccidentID, DescriptionID) VALUES (:AccidentID, :DescriptionID)
+""")
+
+# DRIVER 테이블의 `Role` 컬럼은 백틱(`)으로 감싸야 함 (예약어)
+SQL_INSERT_DRIVER = text("""
+  INSERT INTO DRIVER (
+    AccidentID, `Role`, VehicleType, Gender, AgeGroup, InjuryLevel
+  ) VALUES (
+    :AccidentID, :Role, :VehicleType, :Gender, :AgeGroup, :InjuryLevel
+  )
+""")
+
+# --- [수정됨] 기존 데이터 삭제 쿼리 정의 ---
+SQL_DELETE_DRIVERS = text("DELETE FROM DRIVER")
+SQL_DELETE_ACCIDENTS = text("DELETE FROM ACCIDENT")
+SQL_DELETE_ACCIDENT_DESCRIPTIONS = text("DELETE FROM ACCIDENT_DESCRIPTION")
+SQL_DELETE_DESCRIPTION_TEXTS = text("DELETE FROM DESCRIPTION_TEXT")
+# --- [수정 완료] ---
+
+# 증분 적재용: 특정 발생년월만 교체
+SQL_DELETE_MONTH_DRIVERS = text("""
+  DELETE FROM DRIVER WHERE AccidentID IN (
+    SELECT AccidentID FROM ACCIDENT WHERE OccurYearMonth = :ym
+  )
+""")
+SQL_DELETE_MONTH_ACCIDENTS = text("DELETE FROM ACCIDENT WHERE OccurYearMonth = :ym")
+SQL_DELETE_MONTH_ACCIDENT_DESCRIPTIONS = text("""
+  DELETE FROM ACCIDENT_DESCRIPTION WHERE AccidentID IN (
+    SELECT AccidentID FROM ACCIDENT WHERE OccurYearMonth = :ym
+  )
+""")
+# 어느 사고에서도 참조하지 않는 사고내용 본문 정리 (월 교체 후)
+SQL_DELETE_ORPHAN_DESCRIPTION_TEXTS = text("""
+  DELETE FROM DESCRIPTION_TEXT WHERE NOT EXISTS (
+    SELECT 1 FROM ACCIDENT_DESCRIPTION ad WHERE ad.DescriptionID = DESCRIPTION_TEXT.DescriptionID
+  )
+""")
+SQL_SELECT_MONTH_HASHES = text("SELECT SourceHash FROM ACCIDENT WHERE OccurYearMonth = :ym")
+
+# 적재 워터마크 (발생년월별 행 수 / 내용 해시)
+SQL_SELECT_WATERMARKS = text("SELECT OccurYearMonth, RowCount, ContentHash FROM ETL_LOAD_WATERMARK")
+SQL_DELETE_WATERMARKS = text("DELETE FROM ETL_LOAD_WATERMARK")
+SQL_DELETE_WATERMARK = text("DELETE FROM ETL_LOAD_WATERMARK WHERE OccurYearMonth = :OccurYearMonth")
+SQL_INSERT_WATERMARK = text("""
+  INSERT INTO ETL_LOAD_WATERMARK (OccurYearMonth, RowCount, ContentHash, LoadedAt)
+  VALUES (:OccurYearMonth, :RowCount, :ContentHash, CURRENT_TIMESTAMP)
+""")
 
-MYSQL_USER = 'skn22'
-MYSQL_PASSWORD = 'skn22'     # MySQL 비밀번호
-MYSQL_HOST = 'localhost'     # 또는 127.0.0.1
-MYSQL_PORT = '3306'
-MYSQL_DB_NAME = 'project_1'  # 사용자가 생성한 dcDB 이름
+# (옵션) 와이드 팩트 테이블: 사고 1행에 지역명과 가해/피해 운전자 속성을 펼침
+# (전체 적재 후 전체 재생성, 증분 적재 후 변경된 월만 재생성)
+# 같은 역할의 운전자가 여러 명이면 DriverID가 가장 작은 운전자를 사용하고, DriverCount에 전체 인원을 기록
+WIDE_TABLE = 'ACCIDENT_WIDE'
+SQL_DELETE_WIDE = text("DELETE FROM ACCIDENT_WIDE")
+SQL_DELETE_WIDE_MONTH = text("DELETE FROM ACCIDENT_WIDE WHERE OccurYearMonth = :ym")
+_INSERT_WIDE = """
+  INSERT INTO ACCIDENT_WIDE (
+    AccidentID, OccurYearMonth, DayNight, RegionCode, RegionName, AccidentType, LawViolationYn,
+    RoadSurfaceState, WeatherState, RoadForm,
+    DeathCount, SevereInjuryCount, MinorInjuryCount, ReportedInjuryCount, DriverCount,
+    OffenderVehicleType, OffenderGender, OffenderAgeGroup, OffenderInjuryLevel,
+    VictimVehicleType, VictimGender, VictimAgeGroup, VictimInjuryLevel
+  )
+  SELECT
+    a.AccidentID, a.OccurYearMonth, a.DayNight, a.RegionCode, r.RegionName, a.AccidentType, a.LawViolationYn,
+    a.RoadSurfaceState, a.WeatherState, a.RoadForm,
+    a.DeathCount, a.SevereInjuryCount, a.MinorInjuryCount, a.ReportedInjuryCount, COALESCE(d.DriverCount, 0),
+    o.VehicleType, o.Gender, o.AgeGroup, o.InjuryLevel,
+    v.VehicleType, v.Gender, v.AgeGroup, v.InjuryLevel
+  FROM ACCIDENT a
+  JOIN REGION r ON r.RegionCode = a.RegionCode
+  LEFT JOIN (
+    SELECT AccidentID, COUNT(*) AS DriverCount,
+           MIN(CASE WHEN Role = '가해' THEN DriverID END) AS OffenderID,
+           MIN(CASE WHEN Role = '피해' THEN DriverID END) AS VictimID
+    FROM DRIVER {driver_where} GROUP BY AccidentID
+  ) d ON d.AccidentID = a.AccidentID
+  LEFT JOIN DRIVER o ON o.DriverID = d.OffenderID
+  LEFT JOIN DRIVER v ON v.DriverID = d.VictimID
+  {where}
+"""
+SQL_INSERT_WIDE = text(_INSERT_WIDE.format(driver_where='', where=''))
+SQL_INSERT_WIDE_MONTH = text(_INSERT_WIDE.format(
+  driver_where="WHERE AccidentID IN (SELECT AccidentID FROM ACCIDENT WHERE OccurYearMonth = :ym)",
+  where="WHERE a.OccurYearMonth = :ym",
+))
+
+# 체크포인트 상태 (원본 파일 해시별 마지막 커밋 배치 / AccidentID 최고점)
+SQL_SELECT_STATE = text("""
+  SELECT SourceFileHash, BatchSize, LastBatch, AccidentIdHighWater, RejectedRows, Status
+  FROM ETL_STATE WHERE SourceFileHash = :SourceFileHash
+""")
+SQL_DELETE_STATE = text("DELETE FROM ETL_STATE WHERE SourceFileHash = :SourceFileHash")
+SQL_INSERT_STATE = text("""
+  INSERT INTO ETL_STATE (
+    SourceFileHash, SourceFile, BatchSize, LastBatch, AccidentIdHighWater, RejectedRows, Status, UpdatedAt
+  ) VALUES (
+    :SourceFileHash, :SourceFile, :BatchSize, -1, 0, 0, 'running', CURRENT_TIMESTAMP
+  )
+""")
+SQL_UPDATE_STATE = text("""
+  UPDATE ETL_STATE
+  SET LastBatch = :LastBatch, AccidentIdHighWater = :AccidentIdHighWater,
+      RejectedRows = :RejectedRows, Status = :Status, UpdatedAt = CURRENT_TIMESTAMP
+  WHERE SourceFileHash = :SourceFileHash
+""")
+
+# DDL 제약조건과 동일한 적재 전 검증 규칙 (NOT NULL 컬럼 / VARCHAR 길이)
+ACCIDENT_REQUIRED_LENGTHS = {
+  "DayNight": 10, "RegionCode": 20, "AccidentType": 50,
+  "RoadSurfaceState": 50, "WeatherState": 50, "RoadForm": 50,
+}
+DRIVER_REQUIRED_LENGTHS = {"VehicleType": 50, "Gender": 1, "AgeGroup": 20, "InjuryLevel": 20}
+DEFAULT_REJECT_FILE = 'accident_rejects.csv'
+
+# (옵션) 사고내용 분리 스키마(--description-table): 본문 압축 방식(DESCRIPTION_CODECS)과
+# 저장 형식은 시각화(사고내용 검색)와 공유하므로 web_design/descriptions.py에 있음
+
+# (옵션) 정규화 스키마(--normalized): 저카디널리티 문자열 컬럼을 SMALLINT 코드로 저장
+# 룩업 테이블 -> 해당 코드를 사용하는 전처리 DF 컬럼 목록
+LOOKUP_TABLES = {
+  "LK_DAY_NIGHT": ["주야"],
+  "LK_ACCIDENT_TYPE": ["사고유형"],
+  "LK_WEATHER_STATE": ["기상상태"],
+  "LK_ROAD_SURFACE_STATE": ["노면상태"],
+  "LK_ROAD_FORM": ["도로형태"],
+  "LK_VEHICLE_TYPE": ["가해운전자 차종", "피해운전자 차종"],
+  "LK_AGE_GROUP": ["가해운전자 연령대", "피해운전자 연령대"],
+  "LK_INJURY_LEVEL": ["가해운전자 상해정도", "피해운전자 상해정도"],
+}
+# 룩업 코드가 저장되는 DB 컬럼 (정수형이어야 함, sql/AtoZsql_coded.sql로 변경)
+CODED_COLUMNS = {
+  "ACCIDENT": ["DayNight", "AccidentType", "RoadSurfaceState", "WeatherState", "RoadForm"],
+  "DRIVER": ["VehicleType", "AgeGroup", "InjuryLevel"],
+  "ACCIDENT_WIDE": ["DayNight", "AccidentType", "RoadSurfaceState", "WeatherState", "RoadForm",
+                    "OffenderVehicleType", "OffenderAgeGroup", "OffenderInjuryLevel",
+                    "VictimVehicleType", "VictimAgeGroup", "VictimInjuryLevel"],
+}
+
+# LOAD DATA LOCAL INFILE 문 (스테이징 TSV: 탭 구분, 백슬래시 이스케이프, NULL = \N)
+# 파일 경로는 PyMySQL이 문자열 리터럴로 치환합니다.
+SQL_LOAD_INFILE = """
+  LOAD DATA LOCAL INFILE :path INTO TABLE {table}
+  CHARACTER SET utf8mb4
+  FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+  LINES TERMINATED BY '\\n'
+  ({columns})
+"""
 
-# SQLAlchemy 연결 문자열 생성 (PyMySQL 드라이버 사용)
-DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB_NAME}?charset=utf8mb4"
 
 # --- 2. DB 엔진 생성 및 연결 ---
-try:
-  engine = create_engine(DATABASE_URL)
-  with engine.connect() as conn:
-    print(f"MySQL '{MYSQL_DB_NAME}' 데이터베이스에 성공적으로 연결했습니다.")
-except ImportError:
-  print("오류: 'PyMySQL' 라이브러리를 찾을 수 없습니다.")
-  print("터미널에서 'pip install pymysql'을 실행해주세요.")
-  sys.exit()
-except Exception as e:
-  print(f"DB 연결 오류: {e}")
-  print("DB 설정(사용자, 비밀번호, 호스트, DB 이름)을 확인하세요.")
-  sys.exit()
-
-# --- 3. CSV 데이터 읽기 ---
-try:
-  df = pd.read_csv(CSV_FILE)
-  # 날짜 컬럼은 datetime으로 다시 변환 (Year, Month 추출을 위해)
-  df['발생일시'] = pd.to_datetime(df['발생일시'])
-  print(f"'{CSV_FILE}' 읽기 완료 (행: {len(df)})")
-except FileNotFoundError:
-  print(f"오류: '{CSV_FILE}'을 찾을 수 없습니다. 전처리 스크립트를 먼저 실행하세요.")
-  engine.dispose()
-  sys.exit()
-except Exception as e:
-  print(f"CSV 읽기 오류: {e}")
-  engine.dispose()
-  sys.exit()
-
-# --- 4. ETL (Extract, Transform, Load) 시작 ---
-print("ETL (Extract, Transform, Load)을 시작합니다...")
-
-try:
-  # --- 4a. REGION 차원 테이블 준비 ---
-  print("REGION 테이블 확인 및 동기화 중...")
-  
-  # 1. DB에서 현재 REGION 맵 읽기
+def connect_engine(database_url: str = DATABASE_URL, local_infile: bool = False, pool_size: int = 5,
+                   coded_schema: bool = False):
+  """
+  DB 엔진을 생성하고 연결을 확인합니다. 실패 시 프로그램을 종료합니다.
+  local_infile=True이면 PyMySQL 클라이언트의 LOAD DATA LOCAL INFILE을 허용합니다.
+  pool_size는 병렬 적재 시 워커 수만큼 연결을 확보하기 위한 풀 크기입니다.
+  coded_schema=True(--normalized)면 새 내장 DB에 정규화(룩업 코드) 스키마 변형을 함께 만듭니다.
+  적재/재계산 쿼리는 오래 걸릴 수 있으므로 조회 실행 시간 제한을 두지 않습니다.
+  """
   try:
-    db_regions_df = pd.read_sql("SELECT RegionCode, RegionName FROM REGION", engine)
-    print(f"기존 REGION 테이블에서 {len(db_regions_df)}건 로드됨.")
+    connect_args = {}
+    if local_infile and database_url.startswith('mysql'):
+      connect_args['local_infile'] = True
+    engine = create_db_engine(database_url, pool_size=pool_size, statement_timeout_ms=0, connect_args=connect_args)
+    with engine.connect() as conn:
+      print(f"'{engine.url.database}' 데이터베이스에 성공적으로 연결했습니다.")
+    if ensure_schema(engine, coded=coded_schema):
+      print("내장 DB에 스키마(AtoZsql_sqlite.sql" + (" + AtoZsql_sqlite_coded.sql" if coded_schema else "")
+            + ")를 생성했습니다.")
+    return engine
+  except ImportError:
+    print("오류: 'PyMySQL' 라이브러리를 찾을 수 없습니다.")
+    print("터미널에서 'pip install pymysql'을 실행해주세요.")
+    sys.exit()
   except Exception as e:
-    print(f"REGION 테이블 읽기 오류: {e}. 스키마가 DDL과 일치하는지 확인하세요.")
-    raise e
+    print(f"DB 연결 오류: {e}")
+    print("DB 설정(사용자, 비밀번호, 호스트, DB 이름)을 확인하세요.")
+    sys.exit()
+
+
+# --- 3. 전처리 데이터 읽기 (Parquet 또는 CSV) ---
+def default_source() -> str:
+  """
+  전처리된 Parquet 파일이 있으면 그것을, 없으면 CSV 파일 경로를 반환합니다.
+  """
+  return PARQUET_FILE if os.path.exists(PARQUET_FILE) else CSV_FILE
+
+
+def is_parquet(path: str) -> bool:
+  return path.lower().endswith('.parquet')
+
+
+def read_source(source_file: str = CSV_FILE) -> pd.DataFrame:
+  """
+  전처리된 파일을 읽습니다.
+  Parquet은 타입(category/int32/datetime)이 보존되므로 그대로 사용하고,
+  CSV는 날짜 컬럼을 datetime으로 다시 변환합니다.
+  """
+  with metrics.stage('read'):
+    if is_parquet(source_file):
+      df = pd.read_parquet(source_file)
+    else:
+      df = pd.read_csv(source_file)
+      # 날짜 컬럼은 datetime으로 다시 변환 (Year, Month 추출을 위해)
+      df['발생일시'] = pd.to_datetime(df['발생일시'])
+  metrics.add_rows('read', len(df))
+  print(f"'{source_file}' 읽기 완료 (행: {len(df)})")
+  return df
+
+
+# --- 4a. REGION 차원 테이블 준비 ---
+def sync_regions(connectable, df: pd.DataFrame, known_regions: pd.DataFrame = None) -> pd.DataFrame:
+  """
+  CSV의 시군구 중 DB에 없는 것을 REGION에 추가하고 전체 REGION 맵을 반환합니다.
+  known_regions가 주어지면 DB를 다시 읽지 않고 그 맵을 기준으로 증분 동기화합니다. (청크 적재용)
+  """
+  # 1. DB에서 현재 REGION 맵 읽기
+  if known_regions is None:
+    print("REGION 테이블 확인 및 동기화 중...")
+    try:
+      db_regions_df = pd.read_sql("SELECT RegionCode, RegionName FROM REGION", connectable)
+      print(f"기존 REGION 테이블에서 {len(db_regions_df)}건 로드됨.")
+    except Exception as e:
+      print(f"REGION 테이블 읽기 오류: {e}. 스키마가 DDL과 일치하는지 확인하세요.")
+      raise e
+  else:
+    db_regions_df = known_regions
 
   # 2. CSV에서 고유 시군구 목록(RegionName) 추출
   csv_regions_set = set(df['시군구'].unique())
-  
+
   # 3. DB에 없는 새로운 시군구(RegionName) 찾기
   existing_region_names = set(db_regions_df['RegionName'])
   new_region_names = csv_regions_set - existing_region_names
-  
-  if new_region_names:
-    print(f"새로운 REGION {len(new_region_names)}건 발견. DB에 추가합니다...")
-    
-    # 4. 새 RegionCode 생성 (예: R001, R002...)
-    # 마지막 RegionCode에서 숫자 부분 추출
-    last_code_num = 0
-    if not db_regions_df.empty:
-      last_code_num = db_regions_df['RegionCode'].str.replace('R', '').astype(int).max()
-      
-    new_regions_list = []
-    for i, name in enumerate(new_region_names, 1):
-      new_code = f"R{last_code_num + i:03d}" # R001, R002...
-      new_regions_list.append({'RegionCode': new_code, 'RegionName': name})
-      
-    # 5. 새 REGION 데이터를 DB에 적재
-    new_regions_df = pd.DataFrame(new_regions_list)
-    new_regions_df.to_sql('REGION', engine, if_exists='append', index=False)
-    print(f"{len(new_regions_df)}건 REGION 테이블에 추가 완료.")
-    
-    # 6. 전체 REGION 맵 다시 로드
-    all_regions_map = pd.read_sql("SELECT RegionCode, RegionName FROM REGION", engine)
-  else:
-    print("CSV의 모든 REGION이 DB에 이미 존재합니다.")
-    all_regions_map = db_regions_df.copy()
 
-  # --- 4b. 메인 DF에 REGION FK(RegionCode) 매핑 ---
+  if not new_region_names:
+    if known_regions is None:
+      print("CSV의 모든 REGION이 DB에 이미 존재합니다.")
+    return db_regions_df.copy()
+
+  print(f"새로운 REGION {len(new_region_names)}건 발견. DB에 추가합니다...")
+
+  # 4. 새 RegionCode 생성 (예: R001, R002...)
+  # 마지막 RegionCode에서 숫자 부분 추출
+  last_code_num = 0
+  if not db_regions_df.empty:
+    last_code_num = db_regions_df['RegionCode'].str.replace('R', '').astype(int).max()
+
+  new_regions_list = []
+  for i, name in enumerate(sorted(new_region_names), 1):
+    new_code = f"R{last_code_num + i:03d}" # R001, R002...
+    new_regions_list.append({'RegionCode': new_code, 'RegionName': name})
+
+  # 5. 새 REGION 데이터를 DB에 적재
+  new_regions_df = pd.DataFrame(new_regions_list)
+  new_regions_df.to_sql('REGION', connectable, if_exists='append', index=False)
+  print(f"{len(new_regions_df)}건 REGION 테이블에 추가 완료.")
+
+  # 6. 전체 REGION 맵 (기존 + 신규)
+  return pd.concat([db_regions_df, new_regions_df], ignore_index=True)
+
+
+# --- 4b/4c. REGION FK 매핑 및 스키마 변환 ---
+def transform(df: pd.DataFrame, all_regions_map: pd.DataFrame) -> pd.DataFrame:
+  """
+  메인 DF에 RegionCode를 매핑하고 스키마에 맞는 파생 컬럼을 추가합니다.
+  """
   df = pd.merge(df, all_regions_map, left_on='시군구', right_on='RegionName', how='left')
-  
+
   # 누락된 RegionCode가 있는지 확인 (있으면 안 됨)
   if df['RegionCode'].isnull().any():
     print("오류: 일부 행의 RegionCode를 매핑할 수 없습니다.")
@@ -100,130 +407,1242 @@ try:
     print(f"매핑 실패한 시군구: {missing}")
     raise ValueError("RegionCode 매핑 실패")
 
-  # --- 4c. 메인 DF에 스키마 맞게 데이터 변환 ---
   print("데이터프레임 전처리 중 (스키마 매핑)...")
-  
+
   # OccurYearMonth (YYYYMM)
   df['OccurYearMonth'] = df['Year'].astype(str) + df['Month'].astype(str).str.zfill(2)
-  
+
   # LawViolationYn (Y/N)
   # '법규위반' 컬럼에 값이 있으므로 'Y'로 간주 (스키마 제약조건)
   df['LawViolationYn'] = 'Y'
-  
+
   # Gender (M/F/O/N)
   gender_map = {'남': 'M', '여': 'F', '기타불명': 'O', '해당없음': 'N'}
-  df['g_gender_mapped'] = df['가해운전자 성별'].map(gender_map).fillna('O') # 기본값 'Other'
-  df['p_gender_mapped'] = df['피해운전자 성별'].map(gender_map).fillna('N') # 기본값 'N/A'
-  
-  # --- 4d. ACCIDENT / DRIVER 테이블 적재 (Row-by-Row 트랜잭션) ---
-  print(f"ACCIDENT 및 DRIVER 테이블 적재 시작 (총 {len(df)}건)...")
-  
-  # SQL 쿼리 정의 (text() 사용)
-  # 컬럼 이름은 DDL과 정확히 일치해야 함
-  sql_insert_accident = text("""
-    INSERT INTO ACCIDENT (
-      OccurYearMonth, DayNight, RegionCode, Description, 
-      DeathCount, SevereInjuryCount, MinorInjuryCount, ReportedInjuryCount, 
-      AccidentType, LawViolationYn, RoadSurfaceState, WeatherState, RoadForm
-    ) VALUES (
-      :OccurYearMonth, :DayNight, :RegionCode, :Description, 
-      :DeathCount, :SevereInjuryCount, :MinorInjuryCount, :ReportedInjuryCount, 
-      :AccidentType, :LawViolationYn, :RoadSurfaceState, :WeatherState, :RoadForm
-    )
-  """)
-  
-  # DRIVER 테이블의 `Role` 컬럼은 백틱(`)으로 감싸야 함 (예약어)
-  sql_insert_driver = text("""
-    INSERT INTO DRIVER (
-      AccidentID, `Role`, VehicleType, Gender, AgeGroup, InjuryLevel
-    ) VALUES (
-      :AccidentID, :Role, :VehicleType, :Gender, :AgeGroup, :InjuryLevel
-    )
-  """)
-
-  # --- [수정됨] 기존 데이터 삭제 쿼리 정의 ---
-  sql_delete_drivers = text("DELETE FROM DRIVER")
-  sql_delete_accidents = text("DELETE FROM ACCIDENT")
-  # --- [수정 완료] ---
+  df['g_gender_mapped'] = df['가해운전자 성별'].astype(object).map(gender_map).fillna('O') # 기본값 'Other'
+  df['p_gender_mapped'] = df['피해운전자 성별'].astype(object).map(gender_map).fillna('N') # 기본값 'N/A'
+
+  # HasVictim: 피해 운전자(DRIVER 피해 행) 존재 여부
+  df['HasVictim'] = df['피해운전자 차종'] != '해당없음'
+
+  # SourceHash: 원본 컬럼 내용의 64bit 해시 (증분 적재 시 변경 감지용, DB에는 16자리 hex로 저장)
+  # (CSV/Parquet 어느 쪽에서 읽어도 같은 값이 나오도록 날짜 해상도를 ns로 통일)
+  hash_source = df[SOURCE_HASH_COLUMNS].astype({'발생일시': 'datetime64[ns]'})
+  df['SourceHash64'] = pd.util.hash_pandas_object(hash_source, index=False).to_numpy()
+  df['SourceHash'] = [f"{h:016x}" for h in df['SourceHash64'].tolist()]
+  return df
+
+
+# --- 4c'. (옵션) 룩업 테이블 동기화 및 코드 인코딩 ---
+def sync_lookups(connectable, df: pd.DataFrame, known_lookups: dict = None) -> dict:
+  """
+  REGION과 같은 방식으로 룩업 테이블(LK_*)에 없는 레이블을 추가하고
+  {룩업 테이블: {레이블: 코드}} 맵을 반환합니다.
+  known_lookups가 주어지면 DB를 다시 읽지 않고 증분 동기화합니다.
+  """
+  lookups = {}
+  for table, columns in LOOKUP_TABLES.items():
+    if known_lookups is None:
+      db_lookup_df = pd.read_sql(f"SELECT Code, Label FROM {table}", connectable)
+      label_to_code = dict(zip(db_lookup_df['Label'], db_lookup_df['Code'].astype(int)))
+    else:
+      label_to_code = dict(known_lookups[table])
+
+    labels = pd.unique(pd.concat([df[col] for col in columns], ignore_index=True).dropna())
+    new_labels = sorted(set(labels) - set(label_to_code))
+    if new_labels:
+      last_code = max(label_to_code.values(), default=0)
+      new_lookup_df = pd.DataFrame({'Code': range(last_code + 1, last_code + 1 + len(new_labels)),
+                                    'Label': new_labels})
+      new_lookup_df.to_sql(table, connectable, if_exists='append', index=False)
+      label_to_code.update(zip(new_lookup_df['Label'], new_lookup_df['Code']))
+      print(f"{table}에 새 레이블 {len(new_labels)}건 추가 완료.")
+    lookups[table] = label_to_code
+  return lookups
+
+
+def check_coded_schema(connectable):
+  """
+  --normalized 적재 전에 코드 컬럼(CODED_COLUMNS)이 정수형(SMALLINT)인지 확인합니다.
+  문자열 컬럼에 넣으면 코드가 '9' 같은 문자열로 저장되어 시각화가 레이블을 붙이지 못하므로,
+  아니면 ValueError로 적재를 중단합니다. (와이드 테이블은 있는 경우만 확인)
+  """
+  insp = inspect(connectable)
+  missing = [table for table in LOOKUP_TABLES if not insp.has_table(table)]
+  wrong = []
+  for table, columns in CODED_COLUMNS.items():
+    if table == WIDE_TABLE and not insp.has_table(table):
+      continue
+    col_types = {c['name']: c['type'] for c in insp.get_columns(table)}
+    wrong += [f"{table}.{col}" for col in columns if not isinstance(col_types.get(col), Integer)]
+  if missing or wrong:
+    if insp.dialect.name == 'sqlite':
+      remedy = ("코드 스키마는 새 DB 파일에만 만들 수 있으니 다른 --sqlite-path(또는 기존 파일 삭제 후)로 "
+                "--normalized 적재하세요. (sql/AtoZsql_sqlite_coded.sql 자동 적용)")
+    else:
+      remedy = "빈 DB에 sql/AtoZsql.sql 다음 sql/AtoZsql_coded.sql을 실행한 뒤 다시 적재하세요."
+    details = '; '.join(filter(None, [
+      f"룩업 테이블 없음: {', '.join(missing)}" if missing else '',
+      f"정수형이 아닌 코드 컬럼: {', '.join(wrong)}" if wrong else '',
+    ]))
+    raise ValueError(f"--normalized 적재에는 코드(SMALLINT) 스키마가 필요합니다 ({details}). {remedy}")
+
+
+def encode_lookups(df: pd.DataFrame, lookups: dict) -> pd.DataFrame:
+  """
+  룩업 대상 컬럼의 레이블을 SMALLINT 코드로 바꿉니다. (SourceHash는 인코딩 전 레이블 기준)
+  """
+  for table, columns in LOOKUP_TABLES.items():
+    for col in columns:
+      df[col] = df[col].astype(object).map(lookups[table]).astype('Int16')
+  return df
+
+
+def prepare_frame(connectable, df: pd.DataFrame, args, known: dict = None):
+  """
+  REGION 동기화 -> 변환 -> (--normalized 시) 룩업 동기화/인코딩을 수행하고
+  (변환된 DF, 다음 청크에 넘길 {'regions', 'lookups'} 맵)을 반환합니다.
+  """
+  known = known or {}
+  with metrics.stage('region_sync', rows=len(df)):
+    regions_map = sync_regions(connectable, df, known.get('regions'))
+  with metrics.stage('transform', rows=len(df)):
+    df = transform(df, regions_map)
+  lookups = None
+  if getattr(args, 'normalized', False):
+    with metrics.stage('lookup_sync', rows=len(df)):
+      lookups = sync_lookups(connectable, df, known.get('lookups'))
+      df = encode_lookups(df, lookups)
+  return df, {'regions': regions_map, 'lookups': lookups}
+
 
+def build_accident_frame(df: pd.DataFrame, start_id: int) -> pd.DataFrame:
+  """
+  변환된 DF에서 ACCIDENT 적재용 DF를 벡터 연산으로 생성합니다.
+  AccidentID는 start_id부터 클라이언트 측에서 연속으로 할당합니다.
+  """
+  # 사고내용(Description)은 분리 스키마에서 적재 전에 제외되므로 없으면 건너뜀
+  accident_df = pd.DataFrame({col: df[src].to_numpy() for col, src in ACCIDENT_COLUMN_MAP.items()
+                              if col != 'Description' or src in df.columns})
+  accident_df.insert(0, 'AccidentID', range(start_id, start_id + len(df)))
+  return accident_df
+
+
+def build_driver_frame(df: pd.DataFrame, accident_ids: pd.Series) -> pd.DataFrame:
+  """
+  변환된 DF에서 DRIVER 적재용 DF를 벡터 연산으로 생성합니다.
+  피해 운전자 행은 '피해운전자 차종'이 '해당없음'이 아닌 경우(HasVictim)에만 생성됩니다.
+  """
+  accident_ids = pd.Series(accident_ids).to_numpy()
+  frames = []
+  for role_order, (role, columns) in enumerate(DRIVER_COLUMN_MAP.items()):
+    if role == '피해':
+      mask = df['HasVictim'].to_numpy(dtype=bool)
+    else:
+      mask = slice(None)
+    part = pd.DataFrame({col: df[src].to_numpy()[mask] for col, src in columns.items()})
+    part.insert(0, 'AccidentID', accident_ids[mask])
+    part.insert(1, 'Role', role)
+    part['_role_order'] = role_order
+    frames.append(part)
+
+  # Row-by-Row 경로와 동일하게 사고별 (가해 -> 피해) 순서를 유지
+  driver_df = pd.concat(frames, ignore_index=True)
+  driver_df = driver_df.sort_values(['AccidentID', '_role_order'], kind='stable')
+  return driver_df.drop(columns='_role_order').reset_index(drop=True)
+
+
+def iter_param_batches(frame: pd.DataFrame, batch_size: int):
+  """
+  DF를 batch_size 단위로 잘라 executemany용 파라미터 리스트(dict)로 반환합니다.
+  NaN은 None(NULL)으로 변환됩니다.
+  """
+  for start in range(0, len(frame), batch_size):
+    batch = frame.iloc[start:start + batch_size]
+    batch = batch.astype(object).where(batch.notna(), None)
+    yield batch.to_dict('records')
+
+
+def next_accident_id(conn) -> int:
+  """
+  현재 ACCIDENT의 최대 AccidentID 다음 값을 반환합니다. (범위 할당 시작점)
+  """
+  max_id = conn.execute(text("SELECT MAX(AccidentID) FROM ACCIDENT")).scalar()
+  return int(max_id or 0) + 1
+
+
+class LoadChanges:
+  """
+  적재 한 번의 변경 내역 (run_* 함수의 반환값)
+  - inserted: 새로 추가한 사고 행 수 (새 월, 기존 월에 추가된 행, 전체 적재의 모든 행)
+  - replaced: 내용이 바뀌어 월 전체를 다시 넣은 사고 행 수
+  - deleted: 삭제한 기존 사고 행 수 (교체한 월의 기존 행, 전체 적재 전 기존 데이터)
+  - months: 변경된 발생년월 집합 (None이면 전체 교체)
+  - summary_before: 변경 전 해당 월의 사전 집계 (capture_summary, 없으면 적재 후 전체 재계산)
+  """
+
+  def __init__(self, months: set = None):
+    self.inserted = 0
+    self.replaced = 0
+    self.deleted = 0
+    self.months = months
+    self.summary_before = None
+
+  @property
+  def loaded(self) -> int:
+    return self.inserted + self.replaced
+
+  @property
+  def total(self) -> int:
+    return self.inserted + self.replaced + self.deleted
+
+
+def delete_existing(conn) -> int:
+  """
+  기존 ACCIDENT/DRIVER 데이터를 삭제하고 삭제한 사고 행 수를 반환합니다.
+  외래 키 제약조건(DRIVER.AccidentID -> ACCIDENT.AccidentID) 때문에
+  반드시 DRIVER 테이블부터 삭제해야 합니다.
+  """
+  with metrics.stage('delete'):
+    print("기존 DRIVER 테이블 데이터 삭제 중...")
+    conn.execute(SQL_DELETE_DRIVERS)
+
+    if description_tables_exist(conn):
+      print("기존 ACCIDENT_DESCRIPTION / DESCRIPTION_TEXT 테이블 데이터 삭제 중...")
+      conn.execute(SQL_DELETE_ACCIDENT_DESCRIPTIONS)
+      conn.execute(SQL_DELETE_DESCRIPTION_TEXTS)
+
+    print("기존 ACCIDENT 테이블 데이터 삭제 중...")
+    deleted = conn.execute(SQL_DELETE_ACCIDENTS).rowcount
+  print("기존 데이터 삭제 완료. 새 데이터 삽입을 시작합니다.")
+  return max(deleted, 0)
+
+
+# --- 4d. ACCIDENT / DRIVER 테이블 적재 (Row-by-Row 트랜잭션) ---
+def load_row_by_row(conn, df: pd.DataFrame) -> int:
+  """
+  한 행씩 ACCIDENT를 INSERT하고 lastrowid로 DRIVER를 INSERT합니다. (기존 방식)
+  """
+  inserted_count = 0
+  for index, row in df.iterrows():
+    try:
+      row_started = time.perf_counter()
+      # 1. ACCIDENT 행 INSERT
+      acc_params = {col: row[src] for col, src in ACCIDENT_COLUMN_MAP.items()}
+      result = conn.execute(SQL_INSERT_ACCIDENT, acc_params)
+
+      # 2. 방금 생성된 AccidentID (AUTO_INCREMENT 값) 가져오기
+      new_accident_id = result.lastrowid
+
+      # 3. DRIVER (가해) 행 / 4. DRIVER (피해) 행 INSERT (존재하는 경우)
+      for role, columns in DRIVER_COLUMN_MAP.items():
+        if role == '피해' and not row['HasVictim']:
+          continue
+        driver_params = {"AccidentID": new_accident_id, "Role": role}
+        driver_params.update({col: row[src] for col, src in columns.items()})
+        conn.execute(SQL_INSERT_DRIVER, driver_params)
+
+      inserted_count += 1
+      metrics.observe_batch('row', time.perf_counter() - row_started, 1)
+
+      # 진행 상황 출력
+      if (inserted_count % 1000) == 0:
+        print(f"  ... {inserted_count} / {len(df)} 건 처리 완료 ...")
+
+    except Exception as e:
+      print(f"오류: {index}번 행 데이터 적재 중 문제 발생: {e}")
+      print(f"데이터: {row}")
+      raise e # 오류 발생 시 트랜잭션 롤백
+  return inserted_count
+
+
+def build_load_frames(conn, df: pd.DataFrame, start_id: int = None):
+  """
+  AccidentID를 범위로 미리 할당하고 (ACCIDENT DF, DRIVER DF)를 반환합니다.
+  start_id가 없으면 현재 MAX(AccidentID) 다음 값부터 할당합니다.
+  """
+  if start_id is None:
+    start_id = next_accident_id(conn)
+  accident_df = build_accident_frame(df, start_id)
+  driver_df = build_driver_frame(df, accident_df['AccidentID'])
+  print(f"AccidentID {start_id} ~ {start_id + len(accident_df) - 1} 범위 할당 (DRIVER {len(driver_df)}건)")
+  return accident_df, driver_df
+
+
+# --- 4d'. ACCIDENT / DRIVER 테이블 적재 (배치 executemany) ---
+def load_batched(conn, df: pd.DataFrame, batch_size: int = DEFAULT_BATCH_SIZE, start_id: int = None) -> int:
+  """
+  ACCIDENT/DRIVER 파라미터를 벡터 연산으로 만들고
+  batch_size 단위 executemany(PyMySQL은 multi-row VALUES로 변환)로 전송합니다.
+  """
+  accident_df, driver_df = build_load_frames(conn, df, start_id)
+  return insert_frames_batched(conn, accident_df, driver_df, batch_size)
+
+
+def insert_frames_batched(conn, accident_df: pd.DataFrame, driver_df: pd.DataFrame,
+                          batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+  """
+  미리 만든 ACCIDENT/DRIVER DF를 batch_size 단위 executemany로 전송합니다.
+  """
+  print(f"배치 INSERT 시작 (배치 크기 {batch_size})")
   inserted_count = 0
+  accident_sql = SQL_INSERT_ACCIDENT_WITH_ID if 'Description' in accident_df.columns else SQL_INSERT_ACCIDENT_NARROW_WITH_ID
+  for params in iter_param_batches(accident_df, batch_size):
+    with metrics.time_batch('ACCIDENT', len(params)):
+      conn.execute(accident_sql, params)
+    inserted_count += len(params)
+    print(f"  ... ACCIDENT {inserted_count} / {len(accident_df)} 건 처리 완료 ...")
+
+  driver_count = 0
+  for params in iter_param_batches(driver_df, batch_size):
+    with metrics.time_batch('DRIVER', len(params)):
+      conn.execute(SQL_INSERT_DRIVER, params)
+    driver_count += len(params)
+  print(f"  ... DRIVER {driver_count} 건 처리 완료 ...")
+  return inserted_count
+
+
+# --- 4d''. ACCIDENT / DRIVER 테이블 적재 (LOAD DATA LOCAL INFILE) ---
+def local_infile_enabled(conn) -> bool:
+  """
+  서버의 local_infile 설정이 켜져 있는지 확인합니다. (MySQL 이외의 DB는 False)
+  """
+  if conn.dialect.name != 'mysql':
+    return False
+  try:
+    return bool(int(conn.execute(text("SELECT @@GLOBAL.local_infile")).scalar()))
+  except Exception as e:
+    print(f"local_infile 설정 확인 실패: {e}")
+    return False
+
+
+def _tsv_escape(value):
+  """
+  LOAD DATA 기본 이스케이프 규칙에 맞춰 문자열 값을 변환합니다.
+  """
+  return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def write_staging_tsv(frame: pd.DataFrame, path: str):
+  """
+  DF를 LOAD DATA용 TSV(헤더 없음, NULL = \\N)로 저장합니다.
+  """
+  staged = frame.copy()
+  for col in staged.columns:
+    if not pd.api.types.is_numeric_dtype(staged[col]):
+      staged[col] = staged[col].map(_tsv_escape, na_action='ignore')
+  staged.to_csv(path, sep='\t', header=False, index=False, na_rep='\\N',
+                lineterminator='\n', encoding='utf-8', quoting=csv.QUOTE_NONE)
+
+
+def load_staging_file(conn, table: str, path: str, columns) -> int:
+  """
+  스테이징 TSV 파일을 LOAD DATA LOCAL INFILE로 적재하고 적재된 행 수를 반환합니다.
+  """
+  column_sql = ", ".join(f"`{col}`" for col in columns)
+  statement = text(SQL_LOAD_INFILE.format(table=table, columns=column_sql))
+  with metrics.time_batch(f'LOAD DATA {table}'):
+    result = conn.execute(statement, {"path": path})
+  return result.rowcount
+
+
+def load_infile(conn, df: pd.DataFrame, batch_size: int = DEFAULT_BATCH_SIZE,
+                staging_dir: str = None, keep_staging: bool = False, start_id: int = None) -> int:
+  """
+  변환이 끝난 ACCIDENT/DRIVER DF(AccidentID 사전 할당)를 TSV 스테이징 파일로 쓰고
+  같은 트랜잭션 안에서 LOAD DATA LOCAL INFILE로 적재합니다.
+  서버에서 local_infile이 꺼져 있으면 배치 INSERT 경로로 대체합니다.
+
+  로컬 MySQL에서 테스트하려면 서버에서 `SET GLOBAL local_infile = 1;`을 실행한 뒤
+  `python csv_to_db.py --mode infile --keep-staging`으로 실행하면 됩니다.
+  """
+  accident_df, driver_df = build_load_frames(conn, df, start_id)
+
+  if not local_infile_enabled(conn):
+    print("서버의 local_infile이 비활성화되어 있습니다. 배치 INSERT 경로로 대체합니다.")
+    return insert_frames_batched(conn, accident_df, driver_df, batch_size)
+
+  staging = tempfile.mkdtemp(prefix='accident_staging_', dir=staging_dir)
+  accident_path = os.path.join(staging, 'ACCIDENT.tsv')
+  driver_path = os.path.join(staging, 'DRIVER.tsv')
+  try:
+    write_staging_tsv(accident_df, accident_path)
+    write_staging_tsv(driver_df, driver_path)
+    print(f"스테이징 파일 생성 완료: {staging}")
+
+    try:
+      accident_count = load_staging_file(conn, 'ACCIDENT', accident_path, accident_df.columns)
+    except Exception as e:
+      # 클라이언트/서버 어느 한쪽에서 LOCAL INFILE이 거부된 경우 (행이 적재되지 않음)
+      print(f"LOAD DATA LOCAL INFILE 실패: {e}. 배치 INSERT 경로로 대체합니다.")
+      return insert_frames_batched(conn, accident_df, driver_df, batch_size)
+    print(f"  ... ACCIDENT {accident_count} 건 LOAD DATA 완료 ...")
+
+    driver_count = load_staging_file(conn, 'DRIVER', driver_path, driver_df.columns)
+    print(f"  ... DRIVER {driver_count} 건 LOAD DATA 완료 ...")
+
+    if accident_count != len(accident_df) or driver_count != len(driver_df):
+      raise ValueError(f"LOAD DATA 행 수 불일치 (ACCIDENT {accident_count}/{len(accident_df)}, "
+                       f"DRIVER {driver_count}/{len(driver_df)})")
+    return accident_count
+  finally:
+    if keep_staging:
+      print(f"스테이징 파일 보존: {staging}")
+    else:
+      for path in (accident_path, driver_path):
+        if os.path.exists(path):
+          os.remove(path)
+      os.rmdir(staging)
+
+
+def load_frame(conn, df: pd.DataFrame, args, start_id: int = None) -> int:
+  """
+  선택된 적재 모드(args.mode)로 변환된 DF 하나를 적재합니다.
+  start_id는 batch/infile 모드의 AccidentID 범위 시작값입니다. (row 모드는 AUTO_INCREMENT 사용)
+  """
+  descriptions = None
+  if getattr(args, 'description_table', False):
+    # 사고내용은 사이드 테이블로 보내고 ACCIDENT에는 고정 폭 컬럼만 적재
+    if start_id is None:
+      start_id = next_accident_id(conn)
+    descriptions = df['사고내용']
+    df = df.drop(columns='사고내용')
+
+  with metrics.stage('load'):
+    if args.mode == 'row':
+      inserted = load_row_by_row(conn, df)
+    elif args.mode == 'infile':
+      inserted = load_infile(conn, df, args.batch_size, args.staging_dir, args.keep_staging, start_id)
+    else:
+      inserted = load_batched(conn, df, args.batch_size, start_id)
+  metrics.add_rows('load', inserted)
+
+  if descriptions is not None:
+    with metrics.stage('description', rows=len(descriptions)):
+      load_descriptions(conn, descriptions, start_id, args.description_dedup,
+                        args.description_codec, args.batch_size)
+  return inserted
+
+
+# --- 4f. (옵션) 사고내용(Description) 사이드 테이블 적재 ---
+def load_descriptions(conn, descriptions: pd.Series, start_id: int, dedup: bool = False,
+                      codec: str = 'none', batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+  """
+  사고내용을 DESCRIPTION_TEXT(본문)와 ACCIDENT_DESCRIPTION(AccidentID -> DescriptionID)에 적재합니다.
+  descriptions는 ACCIDENT에 적재된 순서 그대로이며 AccidentID는 start_id부터 연속입니다.
+  dedup이면 같은 내용(ContentHash)의 본문을 한 번만 저장하고 기존 본문도 재사용합니다.
+  dedup이 아니면 DescriptionID = AccidentID로 두어 병렬 적재 워커끼리 ID가 겹치지 않게 합니다.
+  NULL 사고내용은 사이드 테이블에 행을 만들지 않습니다.
+  """
+  present = descriptions.notna().to_numpy()
+  accident_ids = np.arange(start_id, start_id + len(descriptions))[present]
+  texts = descriptions[present].astype(str).to_numpy()
+  if len(texts) == 0:
+    return 0
+  unique_texts = pd.unique(texts)
+  hash_of = {t: hashlib.blake2b(t.encode('utf-8'), digest_size=8).hexdigest() for t in unique_texts}
+  row_hashes = pd.Series(texts).map(hash_of).to_numpy()
+
+  if dedup:
+    next_id = int(conn.execute(text("SELECT MAX(DescriptionID) FROM DESCRIPTION_TEXT")).scalar() or 0) + 1
+    existing = pd.read_sql(text("SELECT ContentHash, DescriptionID FROM DESCRIPTION_TEXT"), conn)
+    id_of = dict(zip(existing['ContentHash'], existing['DescriptionID'].astype('int64')))
+    new_texts = [t for t in unique_texts if hash_of[t] not in id_of]
+    text_df = pd.DataFrame({
+      'DescriptionID': np.arange(next_id, next_id + len(new_texts), dtype='int64'),
+      'ContentHash': [hash_of[t] for t in new_texts],
+      'Codec': codec,
+      'Body': [encode_description(t, codec) for t in new_texts],
+    })
+    id_of.update(zip(text_df['ContentHash'], text_df['DescriptionID']))
+    description_ids = pd.Series(row_hashes).map(id_of).to_numpy(dtype='int64')
+  else:
+    description_ids = accident_ids.astype('int64')
+    text_df = pd.DataFrame({
+      'DescriptionID': description_ids,
+      'ContentHash': row_hashes,
+      'Codec': codec,
+      'Body': [encode_description(t, codec) for t in texts],
+    })
+
+  link_df = pd.DataFrame({'AccidentID': accident_ids, 'DescriptionID': description_ids})
+  for params in iter_param_batches(text_df, batch_size):
+    with metrics.time_batch('DESCRIPTION_TEXT', len(params)):
+      conn.execute(SQL_INSERT_DESCRIPTION_TEXT, params)
+  for params in iter_param_batches(link_df, batch_size):
+    with metrics.time_batch('ACCIDENT_DESCRIPTION', len(params)):
+      conn.execute(SQL_INSERT_ACCIDENT_DESCRIPTION, params)
+  print(f"  ... 사고내용 {len(link_df)}건 분리 적재 (본문 {len(text_df)}건, codec={codec}) ...")
+  return len(link_df)
+
+
+# --- 4e. 대량 적재(bulk) 세션: 보조 인덱스/FK/UNIQUE 검사 지연 ---
+def _fk_index_prefixes(insp, table: str) -> list:
+  return [fk['constrained_columns'] for fk in insp.get_foreign_keys(table)]
+
+
+def drop_secondary_indexes(conn) -> list:
+  """
+  적재 대상 테이블의 보조 인덱스를 삭제하고, 다시 만들 수 있도록 정의 목록을 반환합니다.
+  FK를 뒷받침하는 인덱스(선두 컬럼이 FK 컬럼)와 UNIQUE 인덱스는 삭제하지 않습니다.
+  """
+  insp = inspect(conn)
+  dropped = []
+  for table in BULK_INDEX_TABLES:
+    fk_prefixes = _fk_index_prefixes(insp, table)
+    for index in insp.get_indexes(table):
+      columns = index['column_names']
+      if index.get('unique') or any(columns[:len(fk)] == fk for fk in fk_prefixes):
+        continue
+      dropped.append({"table": table, "name": index['name'], "columns": columns})
+
+  quote = conn.dialect.identifier_preparer.quote
+  for table in BULK_INDEX_TABLES:
+    names = [index['name'] for index in dropped if index['table'] == table]
+    if not names:
+      continue
+    if conn.dialect.name == 'mysql':
+      conn.execute(text(f"ALTER TABLE {table} " + ", ".join(f"DROP INDEX {quote(n)}" for n in names)))
+    else:
+      for name in names:
+        conn.execute(text(f"DROP INDEX {quote(name)}"))
+    print(f"  {table}: 보조 인덱스 {len(names)}개 삭제 ({', '.join(names)})")
+  return dropped
+
+
+def rebuild_secondary_indexes(conn, dropped: list):
+  """
+  drop_secondary_indexes가 삭제한 인덱스를 다시 만듭니다.
+  MySQL은 테이블당 ALTER TABLE 한 번으로 모든 인덱스를 한 번의 테이블 스캔(정렬 빌드)으로 생성합니다.
+  """
+  quote = conn.dialect.identifier_preparer.quote
+  for table in BULK_INDEX_TABLES:
+    indexes = [index for index in dropped if index['table'] == table]
+    if not indexes:
+      continue
+    definitions = [(quote(index['name']), ", ".join(quote(c) for c in index['columns'])) for index in indexes]
+    if conn.dialect.name == 'mysql':
+      conn.execute(text(f"ALTER TABLE {table} " + ", ".join(f"ADD INDEX {n} ({c})" for n, c in definitions)))
+    else:
+      for name, columns in definitions:
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+    print(f"  {table}: 보조 인덱스 {len(indexes)}개 재생성")
+
+
+def check_referential_integrity(conn):
+  """
+  적재 대상 테이블의 모든 FK를 집합 연산(anti-join) 한 번씩으로 검사합니다.
+  위반 행이 있으면 ValueError를 발생시켜 트랜잭션을 롤백합니다.
+  """
+  insp = inspect(conn)
+  quote = conn.dialect.identifier_preparer.quote
+  violations = []
+  for table in BULK_INDEX_TABLES:
+    for fk in insp.get_foreign_keys(table):
+      join_on = " AND ".join(f"p.{quote(r)} = c.{quote(c)}"
+                             for c, r in zip(fk['constrained_columns'], fk['referred_columns']))
+      first_ref = quote(fk['referred_columns'][0])
+      count = conn.execute(text(
+        f"SELECT COUNT(*) FROM {table} c LEFT JOIN {fk['referred_table']} p ON {join_on} "
+        f"WHERE p.{first_ref} IS NULL"
+      )).scalar()
+      label = fk.get('name') or f"{table}->{fk['referred_table']}"
+      if count:
+        violations.append(f"{label}: {count}건")
+  if violations:
+    raise ValueError(f"참조 무결성 위반: {', '.join(violations)}")
+  print("참조 무결성 검사 통과.")
+
+
+@contextmanager
+def load_transaction(engine, args):
+  """
+  적재용 트랜잭션 연결을 제공합니다.
+  args.bulk이면 보조 인덱스를 내리고 세션의 FK/UNIQUE 검사를 끈 상태로 적재한 뒤,
+  커밋 전에 참조 무결성을 한 번에 검사하고 커밋 후 인덱스를 한 번에 재생성합니다.
+  (MySQL에서 인덱스 DDL은 암묵적 커밋을 일으키므로 적재 트랜잭션 밖에서 실행)
+  """
+  if not getattr(args, 'bulk', False):
+    with engine.begin() as conn:
+      yield conn
+    return
+
+  is_mysql = engine.dialect.name == 'mysql'
+  with engine.connect() as conn:
+    print("대량 적재 모드: 보조 인덱스 삭제 및 FK/UNIQUE 검사 비활성화...")
+    if is_mysql:
+      conn.execute(text("SET SESSION foreign_key_checks = 0, unique_checks = 0"))
+    with metrics.stage('index_drop'):
+      dropped = drop_secondary_indexes(conn)
+    conn.commit()
+    try:
+      with conn.begin():
+        yield conn
+        with metrics.stage('integrity_check'):
+          check_referential_integrity(conn)
+    finally:
+      if conn.in_transaction():
+        conn.rollback()
+      print("보조 인덱스 재생성 중...")
+      with metrics.stage('index_rebuild'):
+        rebuild_secondary_indexes(conn, dropped)
+      if is_mysql:
+        conn.execute(text("SET SESSION foreign_key_checks = 1, unique_checks = 1"))
+      conn.commit()
+
+
+def run_full(engine, args) -> LoadChanges:
+  """
+  CSV 전체를 메모리에 올려 REGION 동기화 -> 변환 -> 단일 트랜잭션 적재를 수행합니다.
+  """
+  df = read_source(args.csv)
+
+  # --- 4. ETL (Extract, Transform, Load) 시작 ---
+  print("ETL (Extract, Transform, Load)을 시작합니다...")
+  df, _ = prepare_frame(engine, df, args)
+
+  print(f"ACCIDENT 및 DRIVER 테이블 적재 시작 (총 {len(df)}건, 모드: {args.mode})...")
   # .begin()을 사용하여 트랜잭션 시작
+  digest = MonthDigest()
+  digest.update(df)
+  changes = LoadChanges()
+  with load_transaction(engine, args) as conn:
+    changes.deleted = delete_existing(conn)
+    changes.inserted = load_frame(conn, df, args)
+    write_watermarks(conn, digest.records(), replace_all=True)
+  return changes
+
+
+# --- 3'. 청크 스트리밍 ---
+def iter_source_chunks(source_file: str = CSV_FILE, chunksize: int = DEFAULT_BATCH_SIZE):
+  """
+  전처리된 파일(CSV 또는 Parquet)을 chunksize 행 단위로 읽어 하나씩 반환하는 제너레이터입니다.
+  """
+  if is_parquet(source_file):
+    import pyarrow.parquet as pq
+    reader = (batch.to_pandas() for batch in pq.ParquetFile(source_file).iter_batches(batch_size=chunksize))
+  else:
+    reader = iter(pd.read_csv(source_file, chunksize=chunksize))
+
+  while True:
+    with metrics.stage('read'):
+      chunk = next(reader, None)
+      if chunk is not None and not is_parquet(source_file):
+        # 날짜 컬럼은 datetime으로 다시 변환 (Year, Month 추출을 위해)
+        chunk['발생일시'] = pd.to_datetime(chunk['발생일시'])
+    if chunk is None:
+      return
+    metrics.add_rows('read', len(chunk))
+    yield chunk
+
+
+def run_chunked(engine, args) -> LoadChanges:
+  """
+  CSV를 청크 단위로 스트리밍하며 청크마다 REGION 증분 동기화 -> 변환 -> 적재를 수행합니다.
+  한 번에 하나의 청크만 메모리에 있으므로 입력 크기와 무관하게 최대 메모리가 일정합니다.
+  전체 적재는 하나의 트랜잭션으로 처리됩니다.
+  """
+  print(f"ETL (Extract, Transform, Load)을 청크 단위({args.chunksize}행)로 시작합니다...")
+  changes = LoadChanges()
+  digest = MonthDigest()
+  with load_transaction(engine, args) as conn:
+    changes.deleted = delete_existing(conn)
+    known = None
+    for chunk_no, chunk in enumerate(iter_source_chunks(args.csv, args.chunksize), 1):
+      chunk, known = prepare_frame(conn, chunk, args, known)
+      changes.inserted += load_frame(conn, chunk, args)
+      digest.update(chunk)
+      print(f"  ... 청크 {chunk_no}: 누적 {changes.inserted} 건 적재 (peak RSS {peak_rss_mb():,.0f} MB) ...")
+    write_watermarks(conn, digest.records(), replace_all=True)
+  return changes
+
+
+# --- 5. 증분(Delta) 적재 ---
+class MonthDigest:
+  """
+  발생년월별 내용 요약(행 수 + 행 해시의 합/XOR)을 누적합니다.
+  행 순서와 무관하고 청크 단위로 합칠 수 있어 전체 데이터를 다시 읽지 않아도 됩니다.
+  """
+
+  def __init__(self):
+    self.months = {}
+
+  def update(self, df: pd.DataFrame):
+    for ym, values in df['SourceHash64'].groupby(df['OccurYearMonth']):
+      arr = values.to_numpy()
+      count, total, xor = self.months.get(ym, (0, np.uint64(0), np.uint64(0)))
+      with np.errstate(over='ignore'):
+        total = np.uint64(total + np.add.reduce(arr, dtype=np.uint64))
+      xor = np.uint64(xor ^ np.bitwise_xor.reduce(arr))
+      self.months[ym] = (count + len(arr), total, xor)
+
+  def records(self) -> list:
+    return [
+      {"OccurYearMonth": ym, "RowCount": count, "ContentHash": f"{int(total):016x}{int(xor):016x}"}
+      for ym, (count, total, xor) in sorted(self.months.items())
+    ]
+
+
+def read_watermarks(connectable) -> dict:
+  """
+  ETL_LOAD_WATERMARK를 {발생년월: (행 수, 내용 해시)} 형태로 읽습니다.
+  """
+  rows = pd.read_sql(SQL_SELECT_WATERMARKS, connectable)
+  return {r.OccurYearMonth: (int(r.RowCount), r.ContentHash) for r in rows.itertuples()}
+
+
+def write_watermarks(conn, records: list, replace_all: bool = False):
+  """
+  발생년월별 워터마크를 기록합니다. replace_all이면 기존 워터마크를 모두 지웁니다. (전체 재적재)
+  """
+  with metrics.stage('watermark'):
+    if replace_all:
+      conn.execute(SQL_DELETE_WATERMARKS)
+    else:
+      for record in records:
+        conn.execute(SQL_DELETE_WATERMARK, {"OccurYearMonth": record["OccurYearMonth"]})
+    if records:
+      conn.execute(SQL_INSERT_WATERMARK, records)
+
+
+def _occurrence_keys(hashes: pd.Series) -> pd.Series:
+  """
+  동일 내용 행이 여러 개일 수 있으므로 (해시, 등장 순번)으로 행을 식별합니다.
+  """
+  return hashes + ':' + hashes.groupby(hashes).cumcount().astype(str)
+
+
+def delete_month(conn, ym: str):
+  conn.execute(SQL_DELETE_MONTH_DRIVERS, {"ym": ym})
+  has_descriptions = description_tables_exist(conn)
+  if has_descriptions:
+    conn.execute(SQL_DELETE_MONTH_ACCIDENT_DESCRIPTIONS, {"ym": ym})
+  conn.execute(SQL_DELETE_MONTH_ACCIDENTS, {"ym": ym})
+  if has_descriptions:
+    conn.execute(SQL_DELETE_ORPHAN_DESCRIPTION_TEXTS)
+
+
+def run_incremental(engine, args) -> LoadChanges:
+  """
+  발생년월(OccurYearMonth) 단위 증분 적재를 수행합니다.
+  - 워터마크의 내용 해시가 같은 월: 건너뜀 (변경 없는 CSV 재실행 시 거의 작업 없음)
+  - 새로운 월: 해당 월 전체 INSERT
+  - 기존 행이 모두 남아 있고 행만 추가된 월: 추가된 행만 INSERT
+  - 그 외 변경된 월: 해당 월만 DELETE 후 다시 INSERT
+  CSV에 없는 월은 건드리지 않으며, 월마다 별도 트랜잭션으로 처리해 잠금 시간을 줄입니다.
+  바뀐 월이 있으면 첫 변경 전에 해당 월의 기존 사전 집계를 읽어 두고 사전 집계를 무효화합니다.
+  """
+  df = read_source(args.csv)
+  print("증분 ETL (Extract, Transform, Load)을 시작합니다...")
+  df, _ = prepare_frame(engine, df, args)
+
+  digest = MonthDigest()
+  digest.update(df)
+  watermarks = read_watermarks(engine)
+
+  pending = [record for record in digest.records()
+             if watermarks.get(record["OccurYearMonth"]) != (record["RowCount"], record["ContentHash"])]
+  changes = LoadChanges({record["OccurYearMonth"] for record in pending})
+  if pending:
+    changes.summary_before = capture_summary(engine, changes.months, args)
+
+  for record in pending:
+    ym = record["OccurYearMonth"]
+    month_df = df[df['OccurYearMonth'] == ym]
+    replaced = False
+    with engine.begin() as conn:
+      if ym not in watermarks:
+        print(f"[{ym}] 새로운 월: {len(month_df)}건 적재")
+        rows = month_df
+      else:
+        existing = pd.read_sql(SQL_SELECT_MONTH_HASHES, conn, params={"ym": ym})['SourceHash']
+        new_keys = _occurrence_keys(month_df['SourceHash'])
+        old_keys = set(_occurrence_keys(existing.dropna().astype(str)))
+        if existing.notna().all() and old_keys.issubset(set(new_keys)):
+          rows = month_df[~new_keys.isin(old_keys)]
+          print(f"[{ym}] 행 추가: {len(rows)}건 적재")
+        else:
+          print(f"[{ym}] 내용 변경: 월 전체 교체 ({len(existing)}건 -> {len(month_df)}건)")
+          delete_month(conn, ym)
+          changes.deleted += len(existing)
+          rows, replaced = month_df, True
+      if not rows.empty:
+        loaded = load_frame(conn, rows, args)
+        if replaced:
+          changes.replaced += loaded
+        else:
+          changes.inserted += loaded
+      write_watermarks(conn, [record])
+
+  print(f"변경 없는 월 {len(digest.months) - len(pending)}개 건너뜀, 처리한 월 {len(pending)}개")
+  return changes
+
+
+# --- 6. 병렬(파티션) 적재 ---
+def split_partitions(df: pd.DataFrame, partition_by: str = 'month', workers: int = 4) -> list:
+  """
+  변환된 DF를 파티션 목록 [(파티션 키, DF), ...]으로 나눕니다.
+  - month: 발생년월(OccurYearMonth) 단위
+  - hash: 행 내용 해시(SourceHash64) 기준 workers * 4개 범위
+  """
+  if partition_by == 'hash':
+    keys = (df['SourceHash64'] % np.uint64(workers * 4)).astype(int).map(lambda k: f"h{k:02d}")
+  else:
+    keys = df['OccurYearMonth']
+  return [(key, part) for key, part in df.groupby(keys, sort=True)]
+
+
+def _load_partition(engine, key: str, part: pd.DataFrame, start_id: int, args) -> dict:
+  """
+  [워커] 파티션 하나를 풀에서 받은 자체 연결/트랜잭션으로 적재합니다. (파티션 단위 원자성)
+  """
+  started = time.perf_counter()
   with engine.begin() as conn:
-    
-    # --- [수정됨] 트랜잭션 내부에서 기존 데이터 삭제 ---
-    # 외래 키 제약조건(DRIVER.AccidentID -> ACCIDENT.AccidentID) 때문에
-    # 반드시 DRIVER 테이블부터 삭제해야 합니다.
-    print("기존 DRIVER 테이블 데이터 삭제 중...")
-    conn.execute(sql_delete_drivers)
-    
-    print("기존 ACCIDENT 테이블 데이터 삭제 중...")
-    conn.execute(sql_delete_accidents)
-    print("기존 데이터 삭제 완료. 새 데이터 삽입을 시작합니다.")
-    # --- [수정 완료] ---
-    
-    for index, row in df.iterrows():
+    inserted = load_frame(conn, part, args, start_id)
+  metrics.observe_batch('partition', time.perf_counter() - started, inserted)
+  return {
+    "partition": key,
+    "worker": threading.current_thread().name,
+    "rows": inserted,
+    "elapsed": time.perf_counter() - started,
+  }
+
+
+def print_worker_summary(results: list):
+  """
+  워커별 처리 파티션 수, 행 수, 소요 시간, 처리량(rows/sec)을 출력합니다.
+  """
+  if not results:
+    return
+  summary = pd.DataFrame(results).groupby('worker').agg(
+    partitions=('partition', 'count'), rows=('rows', 'sum'), busy_sec=('elapsed', 'sum'))
+  summary['rows_per_sec'] = (summary['rows'] / summary['busy_sec']).round(0)
+  print("\n--- 워커별 처리량 ---")
+  print(summary.round({'busy_sec': 2}).to_string())
+
+
+def run_parallel(engine, args) -> LoadChanges:
+  """
+  변환된 DF를 파티션으로 나눠 스레드 풀에서 동시에 적재합니다.
+  파티션마다 AccidentID 범위를 미리 나눠 주므로 워커끼리 ID가 겹치지 않고,
+  각 파티션은 자체 연결에서 하나의 트랜잭션으로 커밋됩니다.
+  기존 데이터 삭제는 파티션 적재 전에 별도 트랜잭션으로 커밋됩니다.
+  """
+  df = read_source(args.csv)
+  print(f"병렬 ETL (Extract, Transform, Load)을 시작합니다... (워커 {args.workers}개)")
+  df, _ = prepare_frame(engine, df, args)
+  partitions = split_partitions(df, args.partition_by, args.workers)
+
+  digest = MonthDigest()
+  digest.update(df)
+  changes = LoadChanges()
+  with engine.begin() as conn:
+    changes.deleted = delete_existing(conn)
+    next_id = next_accident_id(conn)
+
+  tasks = []
+  for key, part in partitions:
+    tasks.append((key, part, next_id))
+    next_id += len(part)
+  print(f"파티션 {len(tasks)}개 적재 시작 (기준: {args.partition_by})")
+
+  results, failed = [], []
+  with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix='etl-worker') as pool:
+    futures = {pool.submit(_load_partition, engine, key, part, start_id, args): key
+               for key, part, start_id in tasks}
+    for future in as_completed(futures):
+      key = futures[future]
       try:
-        # 1. ACCIDENT 행 INSERT
-        acc_params = {
-          "OccurYearMonth": row['OccurYearMonth'],
-          "DayNight": row['주야'],
-          "RegionCode": row['RegionCode'], # 4b에서 매핑됨
-          "Description": row['사고내용'],
-          "DeathCount": row['사망자수'],
-          "SevereInjuryCount": row['중상자수'],
-          "MinorInjuryCount": row['경상자수'],
-          "ReportedInjuryCount": row['부상신고자수'],
-          "AccidentType": row['사고유형'],
-          "LawViolationYn": row['LawViolationYn'], # 4c에서 매핑됨
-          "RoadSurfaceState": row['노면상태'],
-          "WeatherState": row['기상상태'],
-          "RoadForm": row['도로형태']
-        }
-        result = conn.execute(sql_insert_accident, acc_params)
-        
-        # 2. 방금 생성된 AccidentID (AUTO_INCREMENT 값) 가져오기
-        new_accident_id = result.lastrowid
-        
-        # 3. DRIVER (가해) 행 INSERT
-        driver_g_params = {
-          "AccidentID": new_accident_id,
-          "Role": "가해",
-          "VehicleType": row['가해운전자 차종'],
-          "Gender": row['g_gender_mapped'], # 4c에서 매핑됨
-          "AgeGroup": row['가해운전자 연령대'],
-          "InjuryLevel": row['가해운전자 상해정도']
-        }
-        conn.execute(sql_insert_driver, driver_g_params)
-        
-        # 4. DRIVER (피해) 행 INSERT (존재하는 경우)
-        if row['피해운전자 차종'] != '해당없음':
-          driver_p_params = {
-            "AccidentID": new_accident_id,
-            "Role": "피해",
-            "VehicleType": row['피해운전자 차종'],
-            "Gender": row['p_gender_mapped'], # 4c에서 매핑됨
-            "AgeGroup": row['피해운전자 연령대'],
-            "InjuryLevel": row['피해운전자 상해정도']
-          }
-          conn.execute(sql_insert_driver, driver_p_params)
-        
-        inserted_count += 1
-        
-        # 진행 상황 출력
-        if (inserted_count % 1000) == 0:
-          print(f"  ... {inserted_count} / {len(df)} 건 처리 완료 ...")
-          
+        results.append(future.result())
       except Exception as e:
-        print(f"오류: {index}번 행 데이터 적재 중 문제 발생: {e}")
-        print(f"데이터: {row}")
-        raise e # 오류 발생 시 트랜잭션 롤백
-
-  print(f"\n--- 모든 데이터 적재 완료! (총 {inserted_count}건의 사고 및 관련 운전자 정보) ---")
-
-except Exception as e:
-  print(f"ETL 프로세스 중 심각한 오류 발생: {e}")
-finally:
-  # 엔진 리소스 해제
-  engine.dispose()
-  print("데이터베이스 엔진 연결을 종료했습니다.")
-  
\ No newline at end of file
+        print(f"오류: 파티션 {key} 적재 실패 (해당 파티션만 롤백됨): {e}")
+        failed.append(key)
+
+  print_worker_summary(results)
+  if failed:
+    raise RuntimeError(f"{len(failed)}개 파티션 적재 실패: {sorted(failed)}")
+
+  with engine.begin() as conn:
+    write_watermarks(conn, digest.records(), replace_all=True)
+  changes.inserted = sum(r["rows"] for r in results)
+  return changes
+
+
+# --- 7. 체크포인트 기반 재시작 가능 적재 ---
+def file_sha256(path: str) -> str:
+  """
+  원본 파일의 SHA-256 해시를 계산합니다. (같은 파일에 대한 재실행인지 판별)
+  """
+  digest = hashlib.sha256()
+  with open(path, 'rb') as f:
+    for block in iter(lambda: f.read(1024 * 1024), b''):
+      digest.update(block)
+  return digest.hexdigest()
+
+
+def validate_rows(df: pd.DataFrame) -> pd.Series:
+  """
+  변환된 DF를 DDL 제약조건 기준으로 검증하고 행별 거부 사유를 반환합니다. (정상 행은 빈 문자열)
+  """
+  reasons = pd.Series('', index=df.index)
+
+  def flag(mask, reason):
+    mask = pd.Series(mask, index=df.index).fillna(True).astype(bool)
+    reasons[mask] = reasons[mask] + reason + ';'
+
+  flag(~df['OccurYearMonth'].astype(str).str.fullmatch(r'[0-9]{6}'), 'chk_accident_ym')
+  for col in ('사망자수', '중상자수', '경상자수', '부상신고자수'):
+    values = pd.to_numeric(df[col], errors='coerce')
+    flag(values.isna() | (values < 0), f'chk_nonnegative_counts({col})')
+
+  for col, max_len in ACCIDENT_REQUIRED_LENGTHS.items():
+    values = df[ACCIDENT_COLUMN_MAP[col]]
+    flag(values.isna() | (values.astype(str).str.len() > max_len), f'ACCIDENT.{col}')
+
+  has_victim = df['HasVictim'].astype(bool)
+  for role, columns in DRIVER_COLUMN_MAP.items():
+    applies = has_victim if role == '피해' else pd.Series(True, index=df.index)
+    for col, max_len in DRIVER_REQUIRED_LENGTHS.items():
+      values = df[columns[col]]
+      flag(applies & (values.isna() | (values.astype(str).str.len() > max_len)), f'DRIVER({role}).{col}')
+  return reasons
+
+
+def write_rejects(path: str, rows: pd.DataFrame, reasons, batch_no: int):
+  """
+  거부된 원본 행을 사유/배치 번호와 함께 reject 파일(CSV)에 추가합니다.
+  """
+  if rows.empty:
+    return
+  rejected = rows.copy()
+  rejected['_reject_reason'] = list(reasons)
+  rejected['_batch'] = batch_no
+  write_header = not os.path.exists(path)
+  rejected.to_csv(path, mode='a', header=write_header, index=False, encoding='utf-8-sig')
+
+
+def _load_rows_individually(conn, df: pd.DataFrame, args):
+  """
+  배치 적재가 DB 오류로 실패했을 때 SAVEPOINT를 사용해 한 행씩 다시 적재합니다.
+  실패한 행은 (행 DF, 오류 메시지 목록)으로 반환합니다.
+  """
+  inserted = 0
+  failed_index, failed_reasons = [], []
+  for index in df.index:
+    try:
+      with conn.begin_nested():
+        inserted += load_frame(conn, df.loc[[index]], args)
+    except Exception as e:
+      failed_index.append(index)
+      failed_reasons.append(f"db_error: {e}".replace('\n', ' ')[:500])
+  return inserted, df.loc[failed_index], failed_reasons
+
+
+def run_resumable(engine, args) -> LoadChanges:
+  """
+  배치(청크) 단위로 커밋하며 진행 상황을 ETL_STATE에 기록하는 재시작 가능한 적재를 수행합니다.
+  - 같은 파일(SHA-256 동일)에 대해 'running' 상태가 남아 있으면 마지막 커밋 배치 다음부터 이어서 적재
+  - 각 배치의 적재와 체크포인트 갱신은 하나의 트랜잭션으로 커밋
+  - 제약조건 검증에 실패한 행(또는 DB가 거부한 행)은 reject 파일로 보내고 계속 진행
+  이어서 적재하면 중단 전 실행이 커밋한 행도 이번 적재의 추가 행으로 셉니다. (사전 집계 등 후처리는 아직 안 됨)
+  """
+  source_hash = file_sha256(args.csv)
+  changes = LoadChanges()
+  state = pd.read_sql(SQL_SELECT_STATE, engine, params={"SourceFileHash": source_hash})
+  batch_size = args.batch_size
+
+  if not state.empty and state.loc[0, 'Status'] == 'running':
+    last_batch = int(state.loc[0, 'LastBatch'])
+    high_water = int(state.loc[0, 'AccidentIdHighWater'])
+    rejected_total = int(state.loc[0, 'RejectedRows'])
+    if int(state.loc[0, 'BatchSize']) != batch_size:
+      batch_size = int(state.loc[0, 'BatchSize'])
+      print(f"체크포인트의 배치 크기({batch_size})로 이어서 적재합니다.")
+    print(f"체크포인트 발견: 배치 {last_batch}까지 커밋됨 (AccidentID 최고점 {high_water}). 이어서 적재합니다.")
+    with engine.connect() as conn:
+      changes.inserted = conn.execute(text("SELECT COUNT(*) FROM ACCIDENT")).scalar()
+  else:
+    last_batch, high_water, rejected_total = -1, 0, 0
+    with engine.begin() as conn:
+      changes.deleted = delete_existing(conn)
+      conn.execute(SQL_DELETE_STATE, {"SourceFileHash": source_hash})
+      conn.execute(SQL_INSERT_STATE, {"SourceFileHash": source_hash, "SourceFile": os.path.abspath(args.csv),
+                                      "BatchSize": batch_size})
+    print(f"새 체크포인트 실행 시작 (파일 해시 {source_hash[:12]}..., 배치 크기 {batch_size})")
+
+  digest = MonthDigest()
+  known = {}
+  batch_no = last_batch
+  for batch_no, chunk in enumerate(iter_source_chunks(args.csv, batch_size)):
+    if batch_no <= last_batch:
+      # 이미 커밋된 배치: 워터마크 계산만 수행
+      known['regions'] = sync_regions(engine, chunk, known.get('regions'))
+      digest.update(transform(chunk, known['regions']))
+      continue
+
+    rejects = []
+    null_region = chunk['시군구'].isna()
+    if null_region.any():
+      rejects.append((chunk[null_region], ['REGION.RegionName'] * int(null_region.sum())))
+      chunk = chunk[~null_region]
+
+    batch_started = time.perf_counter()
+    try:
+      with engine.begin() as conn:
+        chunk, batch_known = prepare_frame(conn, chunk, args, known)
+        digest.update(chunk)
+        reasons = validate_rows(chunk)
+        invalid = reasons != ''
+        if invalid.any():
+          rejects.append((chunk[invalid], reasons[invalid]))
+        valid = chunk[~invalid]
+
+        batch_inserted = 0
+        if not valid.empty:
+          start_id = max(high_water + 1, next_accident_id(conn))
+          try:
+            with conn.begin_nested():
+              batch_inserted = load_frame(conn, valid, args, start_id)
+          except Exception as e:
+            print(f"배치 {batch_no} 적재 오류: {e}. 행 단위로 다시 시도합니다.")
+            batch_inserted, failed_rows, failed_reasons = _load_rows_individually(conn, valid, args)
+            rejects.append((failed_rows, failed_reasons))
+
+        high_water = max(high_water, next_accident_id(conn) - 1)
+        rejected_total += sum(len(rows) for rows, _ in rejects)
+        conn.execute(SQL_UPDATE_STATE, {"SourceFileHash": source_hash, "LastBatch": batch_no,
+                                        "AccidentIdHighWater": high_water, "RejectedRows": rejected_total,
+                                        "Status": 'running'})
+    except Exception:
+      print(f"배치 {batch_no}에서 중단되었습니다. 같은 명령으로 다시 실행하면 이 배치부터 이어서 적재합니다.")
+      raise
+
+    metrics.observe_batch('checkpoint_batch', time.perf_counter() - batch_started, batch_inserted)
+    known = batch_known
+    for rows, row_reasons in rejects:
+      write_rejects(args.reject_file, rows.drop(columns=['SourceHash64', 'HasVictim'], errors='ignore'), row_reasons, batch_no)
+    changes.inserted += batch_inserted
+    print(f"  ... 배치 {batch_no} 커밋 (적재 {batch_inserted}건, 누적 거부 {rejected_total}건) ...")
+
+  with engine.begin() as conn:
+    write_watermarks(conn, digest.records(), replace_all=True)
+    conn.execute(SQL_UPDATE_STATE, {"SourceFileHash": source_hash, "LastBatch": batch_no,
+                                    "AccidentIdHighWater": high_water, "RejectedRows": rejected_total,
+                                    "Status": 'done'})
+  if rejected_total:
+    print(f"거부된 행 {rejected_total}건은 '{args.reject_file}'에 기록되었습니다.")
+  return changes
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description="전처리된 사고 CSV를 MySQL 또는 내장 SQLite(ACCIDENT/DRIVER/REGION)에 적재합니다.")
+  parser.add_argument('--source', '--csv', dest='csv', default=default_source(),
+                      help="전처리된 Parquet/CSV 파일 경로 (기본: Parquet이 있으면 Parquet)")
+  parser.add_argument('--db-url', default=None, help="SQLAlchemy DB URL (지정 시 --backend보다 우선)")
+  parser.add_argument('--backend', choices=BACKENDS, default=default_backend(),
+                      help="DB 백엔드 (mysql: MySQL 서버, sqlite: 서버 없는 단일 파일 DB, 스키마 자동 생성)")
+  parser.add_argument('--sqlite-path', default=None,
+                      help="--backend sqlite: DB 파일 경로 (기본 data/traffic_accident.db)")
+  parser.add_argument('--mode', choices=LOAD_MODES, default='batch',
+                      help="적재 방식 (row: 행 단위, batch: executemany 배치, infile: LOAD DATA LOCAL INFILE)")
+  parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                      help="batch 모드에서 한 번에 전송할 행 수")
+  parser.add_argument('--chunksize', type=int, default=None,
+                      help="지정 시 CSV를 이 행 수 단위로 스트리밍 적재 (메모리 사용량 고정)")
+  parser.add_argument('--incremental', action='store_true',
+                      help="전체 삭제 대신 발생년월 단위로 새로운/변경된 월만 적재")
+  parser.add_argument('--workers', type=int, default=1,
+                      help="2 이상이면 파티션을 나눠 여러 연결로 병렬 적재")
+  parser.add_argument('--partition-by', choices=('month', 'hash'), default='month',
+                      help="병렬 적재 파티션 기준 (month: 발생년월, hash: 행 해시 범위)")
+  parser.add_argument('--normalized', action='store_true',
+                      help="정규화 스키마 변형: 저카디널리티 컬럼을 룩업 테이블(LK_*) SMALLINT 코드로 적재 "
+                           "(코드 스키마 sql/AtoZsql_coded.sql 필요)")
+  parser.add_argument('--bulk', action='store_true',
+                      help="대량 적재: 보조 인덱스 삭제, FK/UNIQUE 검사 비활성화 후 적재하고 인덱스 일괄 재생성 및 무결성 검사")
+  parser.add_argument('--description-table', action='store_true',
+                      help="사고내용을 ACCIDENT 대신 사이드 테이블(ACCIDENT_DESCRIPTION/DESCRIPTION_TEXT)에 적재")
+  parser.add_argument('--description-dedup', action='store_true',
+                      help="--description-table: 같은 사고내용 본문을 한 번만 저장")
+  parser.add_argument('--description-codec', choices=DESCRIPTION_CODECS, default='none',
+                      help="--description-table: 본문 압축 방식 (mysql_compress = MySQL COMPRESS() 형식)")
+  parser.add_argument('--resume', action='store_true',
+                      help="배치 단위로 커밋/체크포인트하며, 중단된 실행을 마지막 체크포인트부터 이어서 적재")
+  parser.add_argument('--reject-file', default=DEFAULT_REJECT_FILE,
+                      help="--resume 모드에서 제약조건 검증에 실패한 행을 기록할 CSV 파일")
+  parser.add_argument('--metrics-json', default=DEFAULT_METRICS_FILE,
+                      help="단계별 계측 결과(JSON 리포트) 저장 경로 (빈 문자열이면 저장하지 않음)")
+  parser.add_argument('--metrics-log', action='store_true',
+                      help="계측 결과를 로그 라인(key=value)으로도 출력")
+  parser.add_argument('--no-summary', action='store_true',
+                      help="적재 후 시각화용 사전 집계(AGG_PAIR_SUMMARY) 갱신을 생략")
+  parser.add_argument('--staging-dir', default=None, help="infile 모드의 TSV 스테이징 디렉터리 (기본: 임시 디렉터리)")
+  parser.add_argument('--keep-staging', action='store_true', help="infile 모드의 TSV 스테이징 파일을 삭제하지 않음")
+  args = parser.parse_args(argv)
+  if args.incremental and args.chunksize:
+    parser.error("--incremental은 --chunksize와 함께 사용할 수 없습니다.")
+  if args.workers > 1 and (args.incremental or args.chunksize):
+    parser.error("--workers는 --incremental/--chunksize와 함께 사용할 수 없습니다.")
+  if args.resume and (args.incremental or args.chunksize or args.workers > 1):
+    parser.error("--resume은 --incremental/--chunksize/--workers와 함께 사용할 수 없습니다. (배치 크기는 --batch-size)")
+  if args.bulk and (args.incremental or args.workers > 1 or args.resume):
+    parser.error("--bulk는 --incremental/--workers/--resume과 함께 사용할 수 없습니다. (전체 적재 또는 --chunksize만 가능)")
+  if args.description_table and args.mode == 'row':
+    parser.error("--description-table은 batch/infile 모드에서만 사용할 수 있습니다.")
+  if (args.description_dedup or args.description_codec != 'none') and not args.description_table:
+    parser.error("--description-dedup/--description-codec은 --description-table과 함께 사용해야 합니다.")
+  if args.description_dedup and args.workers > 1:
+    parser.error("--description-dedup은 --workers와 함께 사용할 수 없습니다. (본문 ID 할당 경합)")
+  if args.db_url is None:
+    args.db_url = database_url(args.backend, args.sqlite_path)
+  return args
+
+
+def capture_summary(engine, months: set, args):
+  """
+  증분 적재가 월을 바꾸기 전에 호출합니다. 해당 월의 기존 사전 집계를 읽어 두고 사전 집계를 무효화합니다.
+  사전 집계가 최신이 아니거나 --no-summary이면 None (적재 후 전체 재계산 또는 갱신 안 함)
+  """
+  cube = SummaryCube(engine)
+  before = None
+  if not args.no_summary and cube.is_ready():
+    with metrics.stage('summary'):
+      before = cube.aggregate_months(months)
+  cube.invalidate()
+  return before
+
+
+def refresh_summary(engine, changes: LoadChanges):
+  """
+  적재가 끝난 뒤 AccidentVisualizer용 사전 집계(AGG_PAIR_SUMMARY)를 갱신합니다.
+  증분 적재로 일부 월만 바뀌었고 변경 전 집계가 있으면 해당 월만 다시 집계하고, 아니면 전체를 다시 만듭니다.
+  사전 집계 테이블이 없는 스키마면 건너뜁니다.
+  """
+  if not inspect(engine).has_table(SummaryCube.SUMMARY_TABLE):
+    print(f"{SummaryCube.SUMMARY_TABLE} 테이블이 없어 사전 집계 갱신을 건너뜁니다.")
+    return
+  cube = SummaryCube(engine)
+  with metrics.stage('summary'):
+    if changes.months is not None and changes.summary_before is not None:
+      print(f"시각화용 사전 집계 갱신 중... (변경된 월 {len(changes.months)}개)")
+      rows = cube.apply_months(changes.months, changes.summary_before)
+    else:
+      print("시각화용 사전 집계 갱신 중...")
+      rows = cube.refresh()
+  metrics.add_rows('summary', rows)
+  print(f"사전 집계 갱신 완료 ({rows}행)")
+
+
+def refresh_wide_table(engine, changes: LoadChanges):
+  """
+  적재가 끝난 뒤 와이드 팩트 테이블(ACCIDENT_WIDE)을 ACCIDENT/REGION/DRIVER로부터 다시 만듭니다.
+  증분 적재로 일부 월만 바뀌었으면 해당 월의 행만 지우고 다시 넣습니다.
+  테이블이 없는 스키마면 건너뜁니다.
+  """
+  if not inspect(engine).has_table(WIDE_TABLE):
+    return
+  if changes.months is None:
+    print(f"와이드 팩트 테이블({WIDE_TABLE}) 재생성 중...")
+  else:
+    print(f"와이드 팩트 테이블({WIDE_TABLE}) 재생성 중... (변경된 월 {len(changes.months)}개)")
+  with metrics.stage('wide'):
+    with engine.begin() as conn:
+      if changes.months is None:
+        conn.execute(SQL_DELETE_WIDE)
+        rows = conn.execute(SQL_INSERT_WIDE).rowcount
+      else:
+        rows = 0
+        for ym in sorted(changes.months):
+          conn.execute(SQL_DELETE_WIDE_MONTH, {"ym": ym})
+          rows += conn.execute(SQL_INSERT_WIDE_MONTH, {"ym": ym}).rowcount
+  metrics.add_rows('wide', rows)
+  print(f"와이드 팩트 테이블 재생성 완료 ({rows}행)")
+
+
+def bump_generation(engine):
+  """
+  데이터 세대 번호를 올려 시각화의 조회 결과 캐시를 무효화합니다. (세대 테이블이 없으면 건너뜀)
+  데이터가 바뀐 적재에서만 호출합니다.
+  """
+  if not inspect(engine).has_table(GENERATION_TABLE):
+    print(f"{GENERATION_TABLE} 테이블이 없어 데이터 세대 갱신을 건너뜁니다.")
+    return
+  with engine.begin() as conn:
+    generation = bump_data_generation(conn)
+  print(f"데이터 세대 갱신: {generation}")
+
+
+def finish_metrics(args, changes: LoadChanges, elapsed: float):
+  """
+  실행 결과를 계측 리포트에 기록하고 JSON 파일/로그 라인으로 출력합니다.
+  """
+  metrics.run_info.update({
+    "mode": args.mode, "batch_size": args.batch_size, "chunksize": args.chunksize,
+    "incremental": args.incremental, "workers": args.workers, "resume": args.resume,
+    "normalized": args.normalized, "bulk": args.bulk,
+    "description_table": args.description_table, "source": args.csv, "inserted": changes.inserted,
+    "replaced": changes.replaced, "deleted": changes.deleted,
+    "elapsed_seconds": round(elapsed, 4),
+  })
+  if args.metrics_json:
+    metrics.write_json(args.metrics_json)
+    print(f"계측 리포트 저장: '{args.metrics_json}'")
+  if args.metrics_log:
+    logging.basicConfig(level=logging.INFO)
+    metrics.log_lines()
+
+
+def main(argv=None):
+  global metrics
+  args = parse_args(argv)
+  metrics = EtlMetrics()
+  engine = connect_engine(args.db_url, local_infile=(args.mode == 'infile'), pool_size=max(5, args.workers),
+                          coded_schema=args.normalized)
+  metrics.attach(engine)
+
+  try:
+    started = time.perf_counter()
+    if args.normalized:
+      # 기존 데이터를 지우기 전에 확인 (문자열 컬럼에 코드가 들어가는 것 방지)
+      check_coded_schema(engine)
+    # 적재 중/실패 시 시각화가 오래된 사전 집계를 쓰지 않도록 먼저 무효화
+    # (증분 적재는 바뀐 월이 있을 때만 run_incremental 안에서 무효화)
+    if not args.incremental:
+      SummaryCube(engine).invalidate()
+    if args.resume:
+      changes = run_resumable(engine, args)
+    elif args.incremental:
+      changes = run_incremental(engine, args)
+    elif args.chunksize:
+      changes = run_chunked(engine, args)
+    elif args.workers > 1:
+      changes = run_parallel(engine, args)
+    else:
+      changes = run_full(engine, args)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n--- 모든 데이터 적재 완료! (총 {changes.loaded}건의 사고 및 관련 운전자 정보) ---")
+    rows_per_sec = changes.loaded / elapsed if elapsed > 0 else float('inf')
+    print(f"적재 소요 시간: {elapsed:.2f}초 ({rows_per_sec:,.0f} rows/sec, 모드: {args.mode}, "
+          f"peak RSS {peak_rss_mb():,.0f} MB)")
+    if changes.total == 0:
+      # 조회 캐시/인메모리 집계 엔진이 같은 데이터를 다시 읽지 않도록 세대 번호도 그대로 둠
+      print("변경된 데이터가 없어 와이드 팩트 테이블, 데이터 세대, 사전 집계 갱신을 건너뜁니다.")
+    else:
+      refresh_wide_table(engine, changes)
+      bump_generation(engine)
+      if not args.no_summary:
+        refresh_summary(engine, changes)
+    finish_metrics(args, changes, elapsed)
+
+  except FileNotFoundError:
+    print(f"오류: '{args.csv}'을 찾을 수 없습니다. 전처리 스크립트를 먼저 실행하세요.")
+  except Exception as e:
+    print(f"ETL 프로세스 중 심각한 오류 발생: {e}")
+  finally:
+    # 엔진 리소스 해제
+    engine.dispose()
+    print("데이터베이스 엔진 연결을 종료했습니다.")
+
+
+if __name__ == "__main__":
+  main()
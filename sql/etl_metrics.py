@@ -0,0 +1,187 @@
+"""
+csv_to_db.py ETL 계측 모듈
+
+단계(stage)별 소요 시간 / 처리 행 수(rows/sec) / DB 왕복(round trip) 횟수 / 최대 메모리와
+배치 지연 시간 히스토그램을 모아 JSON 리포트와 로그 라인으로 출력합니다.
+릴리스 간 적재 성능 회귀를 비교하기 위한 용도입니다.
+"""
+from contextlib import contextmanager
+from sqlalchemy import event
+import bisect
+import json
+import logging
+import sys
+import threading
+import time
+
+# 배치 지연 시간 히스토그램 버킷 상한 (ms)
+LATENCY_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000, 30000]
+
+
+def peak_rss_mb() -> float:
+  """
+  현재 프로세스의 최대 메모리 사용량(RSS, MB)을 반환합니다. (측정 불가 시 0)
+  """
+  try:
+    import resource
+  except ImportError: # Windows
+    return 0.0
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  # Linux는 KB, macOS는 byte 단위
+  return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+  if not sorted_values:
+    return 0.0
+  index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+  return sorted_values[index]
+
+
+class EtlMetrics:
+  """
+  ETL 실행 한 번의 계측값을 모읍니다. 병렬 적재 워커에서 동시에 호출해도 안전합니다.
+
+  사용 예:
+    metrics = EtlMetrics()
+    metrics.attach(engine)               # DB 왕복 횟수 집계
+    with metrics.stage('transform', rows=len(df)):
+      ...
+    metrics.observe_batch('ACCIDENT', seconds, rows)
+    metrics.write_json('etl_metrics.json')
+  """
+
+  def __init__(self):
+    self.started_at = time.time()
+    self._started = time.perf_counter()
+    self._lock = threading.Lock()
+    self._local = threading.local()
+    self.stages = {}
+    self.batches = {}
+    self.round_trips = 0
+    self.run_info = {}
+
+  # --- 단계(stage) 계측 ---
+  def _stage_entry(self, name: str) -> dict:
+    return self.stages.setdefault(name, {
+      "calls": 0, "seconds": 0.0, "rows": 0, "round_trips": 0, "peak_rss_mb": 0.0,
+    })
+
+  def _current_stage(self):
+    stack = getattr(self._local, 'stack', None)
+    return stack[-1] if stack else None
+
+  @contextmanager
+  def stage(self, name: str, rows: int = None):
+    """
+    with 블록의 소요 시간과 처리 행 수를 name 단계에 누적합니다. (중첩 가능)
+    """
+    stack = self._local.__dict__.setdefault('stack', [])
+    stack.append(name)
+    started = time.perf_counter()
+    try:
+      yield
+    finally:
+      elapsed = time.perf_counter() - started
+      stack.pop()
+      with self._lock:
+        entry = self._stage_entry(name)
+        entry["calls"] += 1
+        entry["seconds"] += elapsed
+        entry["rows"] += rows or 0
+        entry["peak_rss_mb"] = max(entry["peak_rss_mb"], peak_rss_mb())
+
+  def add_rows(self, name: str, rows: int):
+    """
+    단계가 끝난 뒤에야 행 수를 알 수 있을 때 사용합니다. (예: 적재 결과 행 수)
+    """
+    with self._lock:
+      self._stage_entry(name)["rows"] += rows
+
+  # --- DB 왕복 / 배치 지연 계측 ---
+  def attach(self, engine):
+    """
+    엔진의 커서 실행 이벤트를 구독하여 DB 왕복 횟수를 현재 단계별로 집계합니다.
+    (executemany는 드라이버가 multi-row VALUES로 묶어 보내므로 1회로 계산)
+    """
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _count_round_trip(conn, cursor, statement, parameters, context, executemany):
+      stage = self._current_stage()
+      with self._lock:
+        self.round_trips += 1
+        if stage is not None:
+          self._stage_entry(stage)["round_trips"] += 1
+    return engine
+
+  def observe_batch(self, kind: str, seconds: float, rows: int = 0):
+    """
+    배치(또는 행/파일/파티션) 하나의 전송 지연 시간을 kind별 히스토그램에 기록합니다.
+    """
+    with self._lock:
+      entry = self.batches.setdefault(kind, {"latencies_ms": [], "rows": 0})
+      entry["latencies_ms"].append(seconds * 1000)
+      entry["rows"] += rows
+
+  @contextmanager
+  def time_batch(self, kind: str, rows: int = 0):
+    started = time.perf_counter()
+    yield
+    self.observe_batch(kind, time.perf_counter() - started, rows)
+
+  # --- 리포트 ---
+  def report(self) -> dict:
+    """
+    계측 결과를 JSON 직렬화 가능한 dict로 반환합니다.
+    """
+    total = time.perf_counter() - self._started
+    with self._lock:
+      stages = {}
+      for name, entry in self.stages.items():
+        stages[name] = dict(entry, seconds=round(entry["seconds"], 4),
+                            rows_per_sec=round(entry["rows"] / entry["seconds"], 1) if entry["seconds"] > 0 else None)
+      batches = {}
+      for kind, entry in self.batches.items():
+        values = sorted(entry["latencies_ms"])
+        histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for value in values:
+          histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, value)] += 1
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        batches[kind] = {
+          "count": len(values),
+          "rows": entry["rows"],
+          "p50_ms": round(_percentile(values, 50), 3),
+          "p95_ms": round(_percentile(values, 95), 3),
+          "max_ms": round(values[-1], 3) if values else 0.0,
+          "histogram": dict(zip(labels, histogram)),
+        }
+      return {
+        "started_at": time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+        "total_seconds": round(total, 4),
+        "round_trips": self.round_trips,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "run": self.run_info,
+        "stages": stages,
+        "batches": batches,
+      }
+
+  def write_json(self, path: str) -> dict:
+    report = self.report()
+    with open(path, 'w', encoding='utf-8') as f:
+      json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+  def log_lines(self, logger: logging.Logger = None):
+    """
+    리포트를 단계/배치별 한 줄씩 로그로 남깁니다. (key=value 형식)
+    """
+    logger = logger or logging.getLogger('etl')
+    report = self.report()
+    logger.info(f"etl total_seconds={report['total_seconds']} round_trips={report['round_trips']} "
+                f"peak_rss_mb={report['peak_rss_mb']}")
+    for name, entry in report["stages"].items():
+      logger.info(f"etl stage={name} seconds={entry['seconds']} rows={entry['rows']} "
+                  f"rows_per_sec={entry['rows_per_sec']} round_trips={entry['round_trips']} "
+                  f"peak_rss_mb={entry['peak_rss_mb']:.1f}")
+    for kind, entry in report["batches"].items():
+      logger.info(f"etl batch={kind} count={entry['count']} p50_ms={entry['p50_ms']} "
+                  f"p95_ms={entry['p95_ms']} max_ms={entry['max_ms']}")
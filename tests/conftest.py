@@ -0,0 +1,91 @@
+"""
+pytest 공용 설정
+
+MySQL 서버 없이 실행되도록 모든 테스트는 임시 디렉터리의 내장 SQLite DB(web_design/db_backend.py)와
+합성 데이터(data/synthetic_data.py)를 사용합니다.
+
+실행: 프로젝트 루트에서 python -m pytest -q
+"""
+import logging
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# csv_to_db.py/etl_metrics.py(sql/)와 synthetic_data.py(data/)는 패키지가 아니므로 디렉터리를 경로에 추가
+for path in (PROJECT_ROOT, os.path.join(PROJECT_ROOT, 'sql'), os.path.join(PROJECT_ROOT, 'data')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import csv_to_db
+from synthetic_data import generate
+from web_design.db_backend import create_db_engine
+
+# 적재 모드를 모두 돌려도 빠르도록 작은 규모 (월 36개 x 범주 조합이 고루 나오는 정도)
+SAMPLE_ROWS = 3000
+SAMPLE_SEED = 11
+
+
+@pytest.fixture(scope='session')
+def sample_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp('data') / 'synthetic.csv'
+    generate(SAMPLE_ROWS, str(path), SAMPLE_SEED)
+    return str(path)
+
+
+def write_edited_csv(source: str, path) -> str:
+    """
+    source CSV에서 첫 번째 월에는 행 3개를 추가하고, 두 번째 월은 한 행의 사고내용과 사망자수를 바꿔
+    path에 저장합니다. (증분 적재에서 '행 추가'와 '월 전체 교체'가 한 번씩 일어나는 입력)
+    """
+    df = pd.read_csv(source, encoding='utf-8-sig')
+    months = df['발생일시'].drop_duplicates().tolist()
+    appended = df[df['발생일시'] == months[0]].head(3)
+    changed = df.index[df['발생일시'] == months[1]][0]
+    df.loc[changed, '사고내용'] = '내용 변경'
+    df.loc[changed, ['사망자수', '총 사상자수']] += 1
+    pd.concat([df, appended]).to_csv(path, index=False, encoding='utf-8-sig')
+    return str(path)
+
+
+def run_loader(db_path, source: str, *extra: str):
+    """
+    csv_to_db.main()으로 내장 SQLite DB에 적재하고 엔진을 반환합니다.
+    main()은 오류를 출력만 하므로 적재 결과는 호출한 쪽에서 확인합니다.
+    """
+    logging.disable(logging.INFO)
+    try:
+        csv_to_db.main(['--db-url', f'sqlite:///{db_path}', '--source', source, '--metrics-json', '',
+                        '--reject-file', os.path.join(os.path.dirname(str(db_path)), 'rejected.csv'), *extra])
+    finally:
+        logging.disable(logging.NOTSET)
+    return create_db_engine(f'sqlite:///{db_path}')
+
+
+@pytest.fixture
+def load_db(tmp_path, sample_csv):
+    """
+    load_db(이름, *csv_to_db 인자) -> 적재된 DB 엔진
+    """
+    engines = []
+
+    def load(name: str, *extra: str):
+        engine = run_loader(tmp_path / f'{name}.db', sample_csv, *extra)
+        engines.append(engine)
+        return engine
+
+    yield load
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture(scope='session')
+def plain_db(tmp_path_factory, sample_csv):
+    """
+    기본 옵션(batch)으로 적재한 DB 엔진 (시각화 테스트 공용, 읽기 전용으로 사용)
+    """
+    engine = run_loader(tmp_path_factory.mktemp('plain') / 'plain.db', sample_csv)
+    yield engine
+    engine.dispose()
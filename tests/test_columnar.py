@@ -0,0 +1,46 @@
+"""
+인메모리 집계 엔진(web_design/columnar.py) 재적재 테스트
+"""
+from sqlalchemy import text
+
+from web_design.columnar import ColumnarStore
+from web_design.query_cache import GENERATION_TABLE, bump_data_generation
+
+COUNT = 'ACCIDENT.(사고건수)'
+
+
+def _total(store: ColumnarStore) -> int:
+    return int(store.fetch(['ACCIDENT.DayNight'], COUNT)['Value'].sum())
+
+
+def _delete_first_month(engine) -> int:
+    with engine.begin() as conn:
+        ym = conn.execute(text("SELECT MIN(OccurYearMonth) FROM ACCIDENT")).scalar()
+        conn.execute(text("DELETE FROM DRIVER WHERE AccidentID IN "
+                          "(SELECT AccidentID FROM ACCIDENT WHERE OccurYearMonth = :ym)"), {"ym": ym})
+        return conn.execute(text("DELETE FROM ACCIDENT WHERE OccurYearMonth = :ym"), {"ym": ym}).rowcount
+
+
+def test_reloads_when_generation_changes(load_db):
+    engine = load_db('plain')
+    store = ColumnarStore(engine, generation_check_seconds=0)
+    total = _total(store)
+
+    deleted = _delete_first_month(engine)
+    assert _total(store) == total  # 세대 번호가 그대로면 메모리의 배열을 계속 사용
+    with engine.begin() as conn:
+        bump_data_generation(conn)
+    assert _total(store) == total - deleted
+
+
+def test_reloads_after_ttl_without_generation_table(load_db):
+    engine = load_db('plain')
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {GENERATION_TABLE}"))
+    store = ColumnarStore(engine, ttl_seconds=3600)
+    total = _total(store)
+
+    deleted = _delete_first_month(engine)
+    assert _total(store) == total
+    store.ttl_seconds = 0
+    assert _total(store) == total - deleted
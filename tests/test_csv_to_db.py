@@ -0,0 +1,180 @@
+"""
+csv_to_db.py 적재 테스트
+
+적재 결과는 batch 모드로 적재한 DB와 비교합니다.
+ID(AUTOINCREMENT)는 모드마다 달라질 수 있으므로 ID를 뺀 내용을 정렬하여 비교하고,
+DRIVER는 ACCIDENT와 JOIN하여 운전자가 올바른 사고에 연결되었는지도 함께 비교합니다.
+"""
+import pandas as pd
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.types import Integer
+
+import csv_to_db
+from conftest import SAMPLE_ROWS, run_loader, write_edited_csv
+from web_design.visualizer import AccidentVisualizer
+
+# 적재 모드 이름 -> csv_to_db.py 추가 인자 (sql/benchmark.py의 SCENARIOS와 같은 조합)
+LOAD_MODES = {
+    'row': ['--mode', 'row'],
+    # SQLite에는 LOAD DATA가 없으므로 배치 INSERT 대체 경로를 확인
+    'infile': ['--mode', 'infile'],
+    'chunked': ['--chunksize', '700'],
+    'incremental': ['--incremental'],
+    'parallel': ['--workers', '3'],
+    'parallel_hash': ['--workers', '3', '--partition-by', 'hash'],
+    'resume': ['--resume', '--batch-size', '500'],
+    'bulk': ['--bulk'],
+    'bulk_chunked': ['--bulk', '--chunksize', '700'],
+}
+
+# 모드에 따라 채워지거나 비는 적재 관리용 컬럼
+BOOKKEEPING_COLUMNS = ['AccidentID', 'DriverID', 'SourceHash']
+
+
+def _decode(engine, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    정규화(--normalized) 적재의 룩업 코드를 한글 레이블로 되돌립니다.
+    """
+    with engine.connect() as conn:
+        for col, table in AccidentVisualizer.LOOKUP_TABLES.items():
+            if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+                labels = dict(conn.execute(text(f"SELECT Code, Label FROM {table}")).all())
+                df[col] = df[col].map(labels)
+    return df
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.drop(columns=[c for c in BOOKKEEPING_COLUMNS if c in df.columns])
+    df = df.astype(object).where(df.notna(), None)
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def table_contents(engine) -> dict:
+    with engine.connect() as conn:
+        accident = pd.read_sql(text("SELECT * FROM ACCIDENT"), conn)
+        driver = pd.read_sql(text(
+            "SELECT d.*, a.OccurYearMonth, a.RegionCode, a.AccidentType, a.DayNight, a.DeathCount, a.Description "
+            "FROM DRIVER d JOIN ACCIDENT a ON a.AccidentID = d.AccidentID"
+        ), conn)
+    return {'ACCIDENT': _normalize(_decode(engine, accident)), 'DRIVER': _normalize(_decode(engine, driver))}
+
+
+def assert_same_contents(engine, expected: dict, name: str):
+    contents = table_contents(engine)
+    for table, frame in expected.items():
+        pd.testing.assert_frame_equal(contents[table], frame, obj=f"{name} {table}")
+
+
+@pytest.fixture(scope='module')
+def expected(tmp_path_factory, sample_csv):
+    engine = run_loader(tmp_path_factory.mktemp('expected') / 'batch.db', sample_csv, '--mode', 'batch')
+    contents = table_contents(engine)
+    engine.dispose()
+    assert len(contents['ACCIDENT']) == SAMPLE_ROWS
+    assert len(contents['DRIVER']) > 0
+    return contents
+
+
+@pytest.mark.parametrize('mode', list(LOAD_MODES))
+def test_load_modes_produce_identical_content(load_db, expected, mode):
+    assert_same_contents(load_db(mode, *LOAD_MODES[mode]), expected, mode)
+
+
+def test_incremental_reload_applies_only_changes(tmp_path, load_db, sample_csv, expected, capsys):
+    engine = load_db('incremental', '--incremental')
+    load_db('incremental', '--incremental')
+    assert '처리한 월 0개' in capsys.readouterr().out
+    assert_same_contents(engine, expected, 'incremental x2')
+
+    # 한 월은 행 추가, 다른 한 월은 기존 행 내용 변경 -> 두 월만 처리하고 나머지는 그대로
+    edited = write_edited_csv(sample_csv, tmp_path / 'edited.csv')
+    run_loader(tmp_path / 'incremental.db', edited, '--incremental')
+    assert '처리한 월 2개' in capsys.readouterr().out
+    assert_same_contents(engine, table_contents(run_loader(tmp_path / 'fresh.db', edited)), 'incremental edit')
+
+
+def wide_contents(engine) -> pd.DataFrame:
+    with engine.connect() as conn:
+        wide = pd.read_sql(text(f"SELECT * FROM {csv_to_db.WIDE_TABLE}"), conn)
+    return _normalize(_decode(engine, wide))
+
+
+def test_wide_table_follows_incremental_changes(tmp_path, load_db, sample_csv, capsys):
+    engine = load_db('incremental', '--incremental')
+    assert len(wide_contents(engine)) == SAMPLE_ROWS
+    assert wide_contents(engine)['DriverCount'].sum() > SAMPLE_ROWS
+    capsys.readouterr()
+
+    # 바뀐 월이 없으면 와이드 테이블을 다시 만들지 않음
+    load_db('incremental', '--incremental')
+    assert '와이드 팩트 테이블(' not in capsys.readouterr().out
+
+    edited = write_edited_csv(sample_csv, tmp_path / 'edited.csv')
+    run_loader(tmp_path / 'incremental.db', edited, '--incremental')
+    assert '(변경된 월 2개)' in capsys.readouterr().out
+    pd.testing.assert_frame_equal(wide_contents(engine), wide_contents(run_loader(tmp_path / 'fresh.db', edited)))
+
+
+def test_resume_continues_after_interrupted_batch(load_db, expected, monkeypatch, capsys):
+    prepare_frame = csv_to_db.prepare_frame
+    calls = []
+
+    def interrupt_third_batch(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError('중단 시뮬레이션')
+        return prepare_frame(*args, **kwargs)
+
+    monkeypatch.setattr(csv_to_db, 'prepare_frame', interrupt_third_batch)
+    engine = load_db('resume', *LOAD_MODES['resume'])
+    assert '배치 2에서 중단' in capsys.readouterr().out
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM ACCIDENT")).scalar() == 1000
+
+    monkeypatch.setattr(csv_to_db, 'prepare_frame', prepare_frame)
+    load_db('resume', *LOAD_MODES['resume'])
+    assert '배치 1까지 커밋됨' in capsys.readouterr().out
+    assert_same_contents(engine, expected, 'resume after interrupt')
+
+
+def _index_definitions(engine) -> dict:
+    insp = inspect(engine)
+    return {table: sorted((i['name'], tuple(i['column_names']), bool(i.get('unique'))) for i in insp.get_indexes(table))
+            for table in csv_to_db.BULK_INDEX_TABLES}
+
+
+def test_bulk_load_restores_secondary_indexes(load_db):
+    baseline = _index_definitions(load_db('plain'))
+    assert any(baseline.values())
+    assert _index_definitions(load_db('bulk', '--bulk')) == baseline
+
+
+def test_staging_tsv_escapes_load_data_specials(tmp_path):
+    frame = pd.DataFrame({'AccidentID': [1, 2], 'Description': ['탭\t줄\n바꿈\r', None],
+                          'RegionCode': ['a\\b', 'c']})
+    path = tmp_path / 'ACCIDENT.tsv'
+    csv_to_db.write_staging_tsv(frame, str(path))
+    # LOAD DATA 기본 규칙: 필드 구분 탭, 행 구분 \n, 이스케이프 \, NULL = \N
+    assert path.read_text(encoding='utf-8') == '1\t탭\\t줄\\n바꿈\\r\ta\\\\b\n2\t\\N\tc\n'
+
+
+def test_normalized_load_refuses_string_schema(load_db, capsys):
+    engine = load_db('plain')
+    with pytest.raises(ValueError):
+        csv_to_db.check_coded_schema(engine)
+
+    # 문자열 스키마에 --normalized로 다시 적재하면 기존 데이터를 지우기 전에 중단
+    load_db('plain', '--normalized')
+    assert '심각한 오류' in capsys.readouterr().out
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM ACCIDENT")).scalar() == SAMPLE_ROWS
+        assert conn.execute(text("SELECT COUNT(*) FROM ACCIDENT WHERE typeof(DayNight) <> 'text'")).scalar() == 0
+
+
+def test_normalized_load_creates_coded_sqlite_schema(load_db, expected):
+    # 새 내장 DB에 --normalized로 적재하면 코드 스키마 변형이 적용되고, 레이블로 되돌린 내용은 같아야 함
+    engine = load_db('normalized', '--normalized')
+    columns = {c['name']: c['type'] for c in inspect(engine).get_columns('ACCIDENT')}
+    assert all(isinstance(columns[col], Integer) for col in csv_to_db.CODED_COLUMNS['ACCIDENT'])
+    assert_same_contents(engine, expected, 'normalized')
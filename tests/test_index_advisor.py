@@ -0,0 +1,91 @@
+"""
+web_design/index_advisor.py 실행 계획 분석 / 인덱스 추천 테스트
+"""
+import itertools
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+import web_design.index_advisor as advisor
+from web_design.visualizer import AccidentVisualizer
+
+ADVISOR_OPTIONS = dict(use_summary=False, use_cache=False, use_columnar=False)
+FILTERS = {'주야': '야간'}
+# 차트 유형(막대/라인/그룹 막대/버블/다중 라인)과 ACCIDENT/DRIVER/REGION 컬럼이 모두 나오는 레이블
+# (전체 레이블 쌍은 plotly 차트 생성에 시간이 오래 걸림)
+LABELS = ['사고유형', '주야', '지역명 (시군구)', '운전자 성별', '발생년월', '사고건수', '사망자수', '중상자수']
+
+
+@pytest.fixture(scope='module')
+def entries(plain_db):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(AccidentVisualizer, 'get_available_columns', lambda self: list(LABELS))
+        return advisor.collect_queries(AccidentVisualizer(plain_db, **ADVISOR_OPTIONS), FILTERS)
+
+
+@pytest.mark.parametrize('query, table, access', [
+    ("SELECT Description, COUNT(*) FROM ACCIDENT GROUP BY Description", 'ACCIDENT', 'full_scan'),
+    ("SELECT COUNT(*) FROM ACCIDENT WHERE OccurYearMonth = '202201'", 'ACCIDENT', 'lookup'),
+])
+def test_explain_sqlite_summarizes_plan(plain_db, query, table, access):
+    with plain_db.connect() as conn:
+        plan = advisor.explain(conn, query, {})
+    assert plan['tables'][table]['access'] == access
+    if access == 'full_scan':
+        assert plan['temporary'] and plan['tables'][table]['key'] is None
+    else:
+        assert plan['tables'][table]['key']
+
+
+def test_collect_queries_covers_every_pair(plain_db, entries):
+    viz = AccidentVisualizer(plain_db, **ADVISOR_OPTIONS)
+    numerical = {label for label in LABELS if viz._get_column_type(viz._get_internal_name(label)) == '수치형'}
+    pairs = {pair for entry in entries for pair in entry['pairs']}
+    # 차트를 만들 수 있는 쌍은 모두 SQL을 실행 (버블 차트는 사고건수 미지원), 같은 SQL은 한 번만 기록
+    assert pairs == {pair for pair in itertools.permutations(LABELS, 2)
+                     if not (set(pair) <= numerical and '사고건수' in pair)}
+    assert len({(entry['sql'], tuple(sorted(entry['params'].items()))) for entry in entries}) == len(entries)
+    assert all(entry['request'] for entry in entries)
+    assert all(entry['params'] == {'f0': '야간'} for entry in entries)
+
+
+def test_analyze_proposes_and_verifies_indexes(load_db, entries, monkeypatch, capsys):
+    engine = load_db('advisor')
+    before = advisor.existing_indexes(engine)
+    # 작은 테스트 DB에서도 추천이 나오도록 행 수 하한을 없앰, 같은 스키마에서 모은 쿼리를 재사용
+    monkeypatch.setattr(advisor, 'MIN_TABLE_ROWS', 0)
+    monkeypatch.setattr(advisor, 'collect_queries', lambda viz, filters: entries)
+    viz = AccidentVisualizer(engine, **ADVISOR_OPTIONS)
+    results, proposals = advisor.analyze(engine, viz, FILTERS, repeat=1)
+
+    assert results and any(row['full_scan'] or row['temporary'] for row in results)
+    assert proposals
+    assert [p['total_ms'] for p in proposals] == sorted((p['total_ms'] for p in proposals), reverse=True)
+    for proposal in proposals:
+        assert proposal['table'] in ('ACCIDENT', 'DRIVER', viz.WIDE_TABLE)
+        assert not advisor._already_indexed(proposal['columns'], before.get(proposal['table'], []))
+        assert proposal['ddl'].startswith(f"CREATE INDEX idx_adv_{proposal['table'].lower()}_")
+    # 동등 조건 컬럼이 인덱스 선두
+    assert any(p['columns'][0] == 'DayNight' for p in proposals)
+
+    advisor.verify(engine, proposals, 2, repeat=1, keep=False)
+    assert capsys.readouterr().out.count('CREATE INDEX') == min(2, len(proposals))
+    assert advisor.existing_indexes(engine) == before
+
+
+def test_main_writes_plan_csv(load_db, tmp_path, monkeypatch, capsys):
+    engine = load_db('advisor')
+    # 레이블 몇 개의 쌍만 분석
+    available = AccidentVisualizer.get_available_columns
+    monkeypatch.setattr(AccidentVisualizer, 'get_available_columns', lambda self: available(self)[:4])
+    url = engine.url.render_as_string(hide_password=False)
+    engine.dispose()
+    output = tmp_path / 'plans.csv'
+    advisor.main(['--db-url', url, '--no-wide', '--output', str(output)])
+    assert '분석한 쿼리' in capsys.readouterr().out
+    plans = pd.read_csv(output, encoding='utf-8-sig')
+    assert {'pair', 'ms', 'full_scan', 'plan', 'sql'} <= set(plans.columns)
+    assert not plans['sql'].str.contains('ACCIDENT_WIDE').any()
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM ACCIDENT")).scalar() > 0
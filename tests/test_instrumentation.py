@@ -0,0 +1,101 @@
+"""
+web_design/instrumentation.py 차트 시간 계측 / 느린 쿼리 로그 테스트
+"""
+import json
+
+import web_design.instrumentation as instrumentation
+from web_design.instrumentation import PerformanceMonitor
+from web_design.visualizer import AccidentVisualizer
+
+PAIRS = [('사고유형', '사고건수'), ('발생년월', '주야'), ('사망자수', '중상자수')]
+
+
+def _viz(engine, monitor: PerformanceMonitor, **kwargs) -> AccidentVisualizer:
+    return AccidentVisualizer(engine, use_summary=False, monitor=monitor, **kwargs)
+
+
+def _log_entries(path) -> list:
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()] if path.exists() else []
+
+
+def test_chart_timing_breakdown(plain_db, tmp_path):
+    monitor = PerformanceMonitor(slow_ms=0, log_path=str(tmp_path / 'slow.log'))
+    viz = _viz(plain_db, monitor, use_cache=False)
+    hooked = []
+    monitor.add_hook(hooked.append)
+    monitor.add_hook(lambda record: 1 / 0)  # 훅 오류는 차트 생성에 영향 없음
+
+    for pair in PAIRS + PAIRS[:1]:
+        fig, title = viz.generate_visualization(*pair)
+        assert fig is not None, title
+        timing = viz.last_timing()
+        assert (timing['label1'], timing['label2']) == pair
+        assert timing['queries'] and all(q['rows'] > 0 for q in timing['queries'])
+        assert timing['total_ms'] >= timing['data_ms'] >= timing['query_ms'] > 0
+        assert timing['figure_ms'] > 0 and timing['payload_ms'] == 0
+
+    assert [(r.label1, r.label2) for r in hooked] == PAIRS + PAIRS[:1]
+    assert len(monitor.recent(*PAIRS[0])) == 2
+    summary = viz.timing_summary()
+    assert len(summary) == len(PAIRS)
+    assert summary.set_index(['label1', 'label2']).loc[PAIRS[0], 'samples'] == 2
+    assert list(summary['p95_ms']) == sorted(summary['p95_ms'], reverse=True)
+    assert (summary['p95_ms'] >= summary['p50_ms']).all()
+    # slow_ms=0이면 느린 쿼리 로그를 남기지 않음
+    assert not (tmp_path / 'slow.log').exists()
+
+
+def test_payload_timing_is_one_record(plain_db, tmp_path):
+    monitor = PerformanceMonitor(slow_ms=0, log_path=str(tmp_path / 'slow.log'))
+    viz = _viz(plain_db, monitor)
+    payload, _ = viz.generate_visualization_payload(*PAIRS[0])
+    first = viz.last_timing()
+    assert first['payload_ms'] > 0 and not first['cached'] and first['queries']
+
+    # 만들어 둔 payload를 다시 쓰면 쿼리 없이 cached로 기록
+    assert viz.generate_visualization_payload(*PAIRS[0])[0] == payload
+    second = viz.last_timing()
+    assert second['cached'] and not second['queries']
+    assert len(monitor.recent(*PAIRS[0])) == 2
+
+
+def test_slow_charts_go_to_rotating_log(plain_db, tmp_path, monkeypatch):
+    path = tmp_path / 'logs' / 'slow.log'
+    monkeypatch.setattr(instrumentation, 'SLOW_LOG_MAX_BYTES', 2000)
+    monitor = PerformanceMonitor(slow_ms=1, log_path=str(path))
+    viz = _viz(plain_db, monitor, use_cache=False)
+    fig, _ = viz.generate_visualization(*PAIRS[0], filters={'주야': '야간'})
+    assert fig is not None
+
+    entry = _log_entries(path)[-1]
+    assert entry['kind'] == 'chart' and (entry['label1'], entry['label2']) == PAIRS[0]
+    assert entry['conditions'] == [['ACCIDENT.DayNight', '=', '야간']]
+    assert entry['queries'][0]['params'] == {'f0': '야간'}
+    assert entry['total_ms'] >= 1
+
+    # 차트 밖에서 실행된 쿼리는 쿼리 하나의 시간으로 판단
+    monitor.add_query("SELECT  1", None, 0.0001, 1)
+    monitor.add_query("SELECT  2", {'a': 1}, 0.5, 1)
+    entry = _log_entries(path)[-1]
+    assert (entry['kind'], entry['sql'], entry['ms']) == ('query', 'SELECT 2', 500.0)
+
+    for _ in range(10):
+        viz.generate_visualization(*PAIRS[0])
+    assert (tmp_path / 'logs' / 'slow.log.1').exists()
+    assert path.stat().st_size <= 2000
+
+
+def test_concurrent_charts_keep_separate_records(plain_db, tmp_path):
+    monitor = PerformanceMonitor(slow_ms=0, log_path=str(tmp_path / 'slow.log'))
+    viz = _viz(plain_db, monitor, use_cache=False)
+    records = []
+    monitor.add_hook(records.append)
+    results = list(viz.generate_visualizations(PAIRS, max_workers=3, batch=False))
+    assert all(fig is not None for _, _, fig, _ in results)
+
+    # 스레드마다 자기 차트 기록을 사용하므로 다른 차트의 쿼리가 섞이지 않음 (차트마다 집계 쿼리 1개)
+    assert sorted((r.label1, r.label2) for r in records) == sorted(PAIRS)
+    for record in records:
+        assert record.total >= record.stages['data']
+        assert len(record.queries) == 1, (record.label1, record.label2)
+    assert len({record.queries[0]['sql'] for record in records}) == len(PAIRS)
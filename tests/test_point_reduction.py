@@ -0,0 +1,64 @@
+"""
+web_design/point_reduction.py 점 예산 테스트
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from web_design.point_reduction import MIN_SERIES_POINTS, bin_points, reduce_lines
+from web_design.visualizer import AccidentVisualizer
+
+
+def _lines(series: int, points: int) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        'Month': np.tile(np.arange(points), series),
+        'Value': rng.integers(1, 100, series * points) + np.repeat(np.arange(series), points),
+        'Series': np.repeat([f"s{i:03d}" for i in range(series)], points),
+    })
+
+
+@pytest.mark.parametrize('series, points, budget', [
+    (1, 1000, 50),
+    (10, 100, 200),
+    # 계열마다 최소 점 수를 남기면 예산을 넘는 경우 (300 x 3 > 100)
+    (300, 20, 100),
+    (5, 20, 2),
+])
+def test_reduce_lines_stays_within_budget(series, points, budget):
+    df = _lines(series, points)
+    result, original = reduce_lines(df, 'Month', 'Value', budget, series=None if series == 1 else 'Series')
+    assert original == len(df)
+    assert 0 < len(result) <= budget
+    # 남은 점은 원래 행 그대로
+    pd.testing.assert_frame_equal(result, df.loc[result.index])
+
+
+def test_reduce_lines_drops_smallest_series_first():
+    df = _lines(300, 20)
+    result, _ = reduce_lines(df, 'Month', 'Value', 100, series='Series')
+    kept = result['Series'].unique()
+    assert len(kept) == 100 // MIN_SERIES_POINTS
+    assert (result.groupby('Series').size() >= MIN_SERIES_POINTS).all()
+    sums = df.groupby('Series')['Value'].sum()
+    assert sums[kept].min() >= sums.drop(kept).max()
+
+
+@pytest.mark.parametrize('budget', [1, 10, 500])
+def test_bin_points_stays_within_budget(budget):
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({'X': rng.normal(size=2000), 'Y': rng.normal(size=2000), 'Size': rng.integers(1, 5, 2000)})
+    result, original = bin_points(df, 'X', 'Y', 'Size', budget)
+    assert original == len(df)
+    assert len(result) <= budget
+    assert result['Size'].sum() == df['Size'].sum()
+
+
+def test_multi_line_chart_marks_hidden_series(plain_db):
+    viz = AccidentVisualizer(plain_db, use_summary=False, use_cache=False, point_budget=30)
+    fig, title = viz.generate_visualization('발생년월', '지역명 (시군구)')
+    assert fig is not None, title
+    meta = fig.layout.meta
+    assert meta['reduced'] and meta['points'] <= 30
+    assert sum(len(trace.x) for trace in fig.data) == meta['points']
+    assert meta['hidden_series'] > 0
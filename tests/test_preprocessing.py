@@ -0,0 +1,21 @@
+"""
+data/preprocessing.py 타입 지정 테스트
+"""
+import pandas as pd
+
+from preprocessing import CATEGORY_MAX_UNIQUE_RATIO, to_typed_frame
+
+
+def test_typed_frame_keeps_free_text_as_strings(sample_csv):
+    df = pd.read_csv(sample_csv, encoding='utf-8-sig')
+    # 값이 대부분 고유한 코드 컬럼 (category로 바꿔도 메모리가 줄지 않음)
+    df['관리번호'] = [f"A{i:06d}" for i in range(len(df))]
+    assert df['관리번호'].nunique() > CATEGORY_MAX_UNIQUE_RATIO * len(df)
+
+    typed = to_typed_frame(df)
+    assert isinstance(typed['사고유형'].dtype, pd.CategoricalDtype)
+    assert isinstance(typed['시군구'].dtype, pd.CategoricalDtype)
+    for col in ('사고내용', '관리번호'):
+        assert not isinstance(typed[col].dtype, pd.CategoricalDtype), col
+        assert pd.api.types.is_string_dtype(typed[col]), col
+    assert typed['사망자수'].dtype == 'int32'
@@ -0,0 +1,67 @@
+"""
+조회 결과 캐시(web_design/query_cache.py)와 데이터 세대 테스트
+"""
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+import web_design.query_cache as query_cache
+from conftest import run_loader, write_edited_csv
+from web_design.query_cache import QueryResultCache, bump_data_generation, read_data_generation
+
+QUERY = "SELECT COUNT(*) AS Value FROM ACCIDENT"
+
+
+def _generation(engine):
+    with engine.connect() as conn:
+        return read_data_generation(conn)
+
+
+def test_generation_bump_invalidates_cache(load_db):
+    engine = load_db('plain')
+    cache = QueryResultCache(engine, generation_check_seconds=0)
+    key = cache.make_key(QUERY)
+    cache.put(key, pd.DataFrame({'Value': [1]}))
+    assert cache.get(key) is not None
+
+    with engine.begin() as conn:
+        bump_data_generation(conn)
+    assert cache.get(key) is None
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_generation_changes_only_when_data_changes(tmp_path, load_db, sample_csv):
+    engine = load_db('incremental', '--incremental')
+    loaded = _generation(engine)
+    assert loaded > 0
+
+    load_db('incremental', '--incremental')
+    assert _generation(engine) == loaded
+
+    run_loader(tmp_path / 'incremental.db', write_edited_csv(sample_csv, tmp_path / 'edited.csv'), '--incremental')
+    assert _generation(engine) == loaded + 1
+
+
+def test_generation_check_retries_after_transient_error(load_db, monkeypatch):
+    engine = load_db('plain')
+    cache = QueryResultCache(engine, generation_check_seconds=0)
+    assert cache.generation() == _generation(engine)
+
+    def unavailable(conn):
+        raise OperationalError(QUERY, {}, Exception('연결 끊김'))
+
+    monkeypatch.setattr(query_cache, 'read_data_generation', unavailable)
+    cache.generation()
+    monkeypatch.undo()
+
+    with engine.begin() as conn:
+        generation = bump_data_generation(conn)
+    assert cache.generation() == generation
+
+
+def test_missing_generation_table_falls_back_to_ttl(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    cache = QueryResultCache(engine, generation_check_seconds=0)
+    assert cache.generation() is None
+    assert not cache._generation_available
+    engine.dispose()
@@ -0,0 +1,69 @@
+"""
+사전 집계(web_design/summary.py) 갱신 테스트
+
+적재 후 사전 집계는 변경이 없으면 그대로 두고, 증분 적재로 일부 월만 바뀌면
+해당 월만 다시 집계한 결과가 전체 재계산과 같아야 합니다.
+"""
+import pandas as pd
+from sqlalchemy import text
+
+from conftest import run_loader, write_edited_csv
+from web_design.summary import SummaryCube
+
+
+def summary_contents(engine) -> pd.DataFrame:
+    with engine.connect() as conn:
+        df = pd.read_sql(text(f"SELECT * FROM {SummaryCube.SUMMARY_TABLE}"), conn)
+    df = df.astype(object).where(df.notna(), None)
+    return df.sort_values(SummaryCube.KEY_COLUMNS, key=lambda s: s.astype(str)).reset_index(drop=True)
+
+
+def _count_calls(monkeypatch, name: str) -> list:
+    calls = []
+    original = getattr(SummaryCube, name)
+
+    def counted(self, *args, **kwargs):
+        calls.append(args)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(SummaryCube, name, counted)
+    return calls
+
+
+def test_unchanged_incremental_load_keeps_summary(load_db, monkeypatch):
+    engine = load_db('incremental', '--incremental')
+    before = summary_contents(engine)
+    assert SummaryCube(engine).is_ready() and len(before)
+
+    refreshed = _count_calls(monkeypatch, 'refresh')
+    applied = _count_calls(monkeypatch, 'apply_months')
+    load_db('incremental', '--incremental')
+    assert not refreshed and not applied
+    assert SummaryCube(engine).is_ready()
+    pd.testing.assert_frame_equal(summary_contents(engine), before)
+
+
+def test_incremental_summary_matches_full_refresh(tmp_path, load_db, sample_csv, monkeypatch):
+    engine = load_db('incremental', '--incremental')
+    edited = write_edited_csv(sample_csv, tmp_path / 'edited.csv')
+
+    refreshed = _count_calls(monkeypatch, 'refresh')
+    applied = _count_calls(monkeypatch, 'apply_months')
+    run_loader(tmp_path / 'incremental.db', edited, '--incremental')
+    assert not refreshed and len(applied) == 1
+    assert len(applied[0][0]) == 2  # 바뀐 월 2개만 다시 집계
+    assert SummaryCube(engine).is_ready()
+
+    got = summary_contents(engine)
+    SummaryCube(engine).refresh()
+    pd.testing.assert_frame_equal(got, summary_contents(engine), check_dtype=False)
+
+
+def test_incremental_load_without_ready_summary_refreshes_all(tmp_path, load_db, sample_csv, monkeypatch):
+    engine = load_db('incremental', '--incremental', '--no-summary')
+    assert not SummaryCube(engine).is_ready()
+
+    refreshed = _count_calls(monkeypatch, 'refresh')
+    run_loader(tmp_path / 'incremental.db', write_edited_csv(sample_csv, tmp_path / 'edited.csv'), '--incremental')
+    assert len(refreshed) == 1
+    assert SummaryCube(engine).is_ready()
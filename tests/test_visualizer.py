@@ -0,0 +1,332 @@
+"""
+AccidentVisualizer 테스트
+
+- 사전 집계, 인메모리 집계, 결과 캐시, 일괄 집계(prefetch), 정규화 스키마 등 다른 경로로 만든 차트 데이터가 기본 테이블 SQL 집계와 같은지 확인합니다.
+  (plotly에 전달되는 DataFrame을 비교)
+- 조회 조건(_compile_filters)의 값 변환, 바인드 파라미터, LIKE 이스케이프를 확인합니다.
+- 차트 payload(압축 JSON) 직렬화가 원래 차트를 그대로 복원하는지 확인합니다.
+"""
+import functools
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+import web_design.visualizer as visualizer_module
+from web_design.db_backend import read_sql_chunks
+from web_design.visualizer import AccidentVisualizer, figure_from_payload, figure_to_payload
+
+# 막대 차트는 상위 BAR_LIMIT개 범주만 표시 (ORDER BY Value DESC LIMIT 20)
+BAR_LIMIT = 20
+
+# 사전 집계/캐시 없이 기본 테이블 SQL만 사용 (비교 기준)
+SQL_ONLY = dict(use_summary=False, use_cache=False)
+# 집계 경로 이름 -> AccidentVisualizer 옵션
+AGGREGATION_PATHS = {
+    'summary': dict(use_cache=False),
+    'columnar': dict(use_summary=False, use_cache=False, use_columnar=True),
+    'cache': dict(use_summary=False),
+    'prefetch': dict(use_summary=False),
+}
+
+
+@pytest.fixture(scope='module')
+def captured_frames():
+    """
+    px.bar/line/scatter에 전달되는 DataFrame을 차례로 기록합니다.
+    """
+    frames = []
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for name in ('bar', 'line', 'scatter'):
+            original = getattr(visualizer_module.px, name)
+
+            def capture(df, *args, _original=original, **kwargs):
+                frames.append(df.copy())
+                return _original(df, *args, **kwargs)
+
+            monkeypatch.setattr(visualizer_module.px, name, capture)
+        yield frames
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.astype(object).where(df.notna(), None)
+    return df.sort_values(list(df.columns), key=lambda s: s.astype(str)).reset_index(drop=True)
+
+
+def assert_same_chart(got: pd.DataFrame, expected: pd.DataFrame, obj: str):
+    """
+    두 차트 데이터가 같은지 확인합니다. 상위 N개로 잘린 막대 차트는 경계 값이 같은 범주 중
+    어느 것이 포함될지 정해져 있지 않으므로, 경계보다 큰 범주와 값 분포만 비교합니다.
+    """
+    if len(expected) == BAR_LIMIT and list(expected.columns)[-1] == 'Value' and len(expected.columns) == 2:
+        cutoff = expected['Value'].min()
+        assert sorted(got['Value']) == sorted(expected['Value']), obj
+        got, expected = (_normalize(df[df['Value'] > cutoff]) for df in (got, expected))
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False, obj=obj)
+
+
+def chart_frames(viz: AccidentVisualizer, frames: list, pairs: list) -> dict:
+    result = {}
+    for label1, label2 in pairs:
+        frames.clear()
+        fig, _ = viz.generate_visualization(label1, label2)
+        if fig is not None:
+            result[(label1, label2)] = _normalize(frames[0])
+    return result
+
+
+@pytest.fixture(scope='module')
+def chart_pairs(plain_db):
+    """
+    모든 레이블이 각 차트 유형(막대/라인/그룹 막대/버블/다중 라인)에 한 번 이상 쓰이는 조합
+    """
+    viz = AccidentVisualizer(plain_db, **SQL_ONLY)
+    labels = viz.get_available_columns()
+    categorical = [label for label in labels if viz._get_column_type(viz._get_internal_name(label)) == '범주형']
+    numerical = [label for label in labels if viz._get_column_type(viz._get_internal_name(label)) == '수치형']
+    pairs = [(label, '사고건수') for label in labels if label != '사고건수']
+    pairs += [(label, '사망자수') for label in categorical + ['발생년월']]
+    pairs += [('주야', label) for label in categorical if label != '주야']
+    pairs += [('발생년월', label) for label in categorical]
+    pairs += list(itertools.combinations([label for label in numerical if label != '사고건수'], 2))
+    return pairs
+
+
+@pytest.fixture(scope='module')
+def expected_charts(plain_db, captured_frames, chart_pairs):
+    expected = chart_frames(AccidentVisualizer(plain_db, **SQL_ONLY), captured_frames, chart_pairs)
+    assert expected
+    return expected
+
+
+@pytest.mark.parametrize('path', list(AGGREGATION_PATHS))
+def test_aggregation_paths_match_sql(plain_db, captured_frames, chart_pairs, expected_charts, path):
+    viz = AccidentVisualizer(plain_db, **AGGREGATION_PATHS[path])
+    if path == 'summary':
+        assert viz.summary.is_ready()
+    elif path == 'cache':
+        chart_frames(viz, captured_frames, chart_pairs)  # 첫 실행으로 캐시를 채우고 두 번째 결과를 비교
+    elif path == 'prefetch':
+        assert viz.prefetch(chart_pairs) > 0
+    got = chart_frames(viz, captured_frames, chart_pairs)
+    if path in ('cache', 'prefetch'):
+        assert viz.cache_stats()['hits'] > 0
+
+    assert got.keys() == expected_charts.keys()
+    for pair, frame in expected_charts.items():
+        assert_same_chart(got[pair], frame, f"{path} {pair}")
+
+
+def test_pack_batches_limits_estimated_rows(viz):
+    cardinality = {'ACCIDENT.DayNight': 2, 'DRIVER.Role': 2, 'DRIVER.Gender': 3, 'REGION.RegionName': 200}
+    requests = [
+        (('ACCIDENT.DayNight', 'DRIVER.Role'), viz.COUNT_VAR),
+        (('DRIVER.Role',), viz.COUNT_VAR),
+        (('DRIVER.Gender', 'DRIVER.Role'), viz.COUNT_VAR),
+        (('REGION.RegionName', 'DRIVER.Role'), viz.COUNT_VAR),
+    ]
+    batches = viz._pack_batches(requests, cardinality)
+    # 2x2x3 = 12행 <= 2 x (4 + 2 + 6): 함께 묶고, 지역명까지 묶으면 2400행 > 2 x 412
+    assert batches == [requests[:3], requests[3:]]
+
+
+def test_prefetch_batches_do_not_outgrow_separate_queries(plain_db, chart_pairs, monkeypatch):
+    viz = AccidentVisualizer(plain_db, use_summary=False)
+    query_chunks, run_batch = viz._query_chunks, viz._run_batch
+    raw_rows, batches = [], []
+
+    def count_rows(query, params=None, decode=True):
+        raw_rows.append(0)
+        for chunk in query_chunks(query, params, decode):
+            raw_rows[-1] += len(chunk)
+            yield chunk
+
+    def record(requests):
+        frames = run_batch(requests)
+        batches.append((raw_rows[-1], sum(len(frame) for frame in frames.values())))
+        return frames
+
+    monkeypatch.setattr(viz, '_query_chunks', count_rows)
+    monkeypatch.setattr(viz, '_run_batch', record)
+    assert viz.prefetch(chart_pairs) > 0
+    for raw, separate in batches:
+        assert raw <= min(viz.MAX_BATCH_ROWS, viz.MAX_BATCH_ROW_RATIO * separate)
+
+
+@pytest.mark.parametrize('path', ['sql', 'prefetch'])
+def test_chunked_reads_match_single_read(plain_db, captured_frames, chart_pairs, expected_charts, monkeypatch, path):
+    # 결과를 작은 청크로 나눠 읽어도 (배치 집계는 청크별 부분합을 다시 합산) 차트 데이터는 같아야 함
+    monkeypatch.setattr(visualizer_module, 'read_sql_chunks', functools.partial(read_sql_chunks, chunksize=7))
+    viz = AccidentVisualizer(plain_db, **(SQL_ONLY if path == 'sql' else dict(use_summary=False)))
+    if path == 'prefetch':
+        assert viz.prefetch(chart_pairs) > 0
+    got = chart_frames(viz, captured_frames, chart_pairs)
+    assert got.keys() == expected_charts.keys()
+    for pair, frame in expected_charts.items():
+        assert_same_chart(got[pair], frame, f"chunked {path} {pair}")
+
+
+def test_normalized_schema_matches_plain(load_db, captured_frames, chart_pairs, expected_charts):
+    viz = AccidentVisualizer(load_db('normalized', '--normalized'), **SQL_ONLY)
+    assert viz.use_lookups
+    got = chart_frames(viz, captured_frames, chart_pairs)
+    assert got.keys() == expected_charts.keys()
+    for pair, frame in expected_charts.items():
+        assert_same_chart(got[pair], frame, f"normalized {pair}")
+
+
+# --- 조회 조건 ---
+@pytest.fixture(scope='module')
+def viz(plain_db):
+    return AccidentVisualizer(plain_db, **SQL_ONLY)
+
+
+def _where(viz: AccidentVisualizer, filters: dict, fact: str = 'ACCIDENT'):
+    conditions = viz._compile_filters(filters)
+    _, _, column = viz._source_tables(*viz._condition_vars(conditions))
+    return viz._where_clause(conditions, column, fact)
+
+
+def test_compile_filters_normalizes_values_and_order(viz):
+    conditions = viz._compile_filters({
+        '사고내용': '중앙선',
+        '발생년월': ('2022-01', None),
+        '기상상태': ['비', '맑음', '비'],
+        '주야': '주간',
+        '사망자수': (1, 3),
+        '도로형태': None,
+    })
+    assert conditions == (
+        ('ACCIDENT.DayNight', '=', '주간'),
+        ('ACCIDENT.WeatherState', 'IN', ('맑음', '비')),
+        ('ACCIDENT.DeathCount', 'RANGE', (1, 3)),
+        ('ACCIDENT.OccurYearMonth', 'RANGE', ('202201', None)),
+        ('ACCIDENT.Description', 'LIKE', '중앙선'),
+    )
+
+
+@pytest.mark.parametrize('filters', [
+    {'기상상태': []},
+    {'발생년월': '2022'},
+    {'운전자 성별': '남'},
+    {'없는 컬럼': 1},
+])
+def test_compile_filters_rejects_invalid(viz, filters):
+    with pytest.raises(ValueError):
+        viz._compile_filters(filters)
+
+
+def test_where_clause_uses_bind_parameters(viz):
+    injection = "주간' OR '1'='1"
+    where, params = _where(viz, {'주야': injection, '기상상태': ['비', '눈'], '발생년월': (None, '202306')})
+    assert injection not in where
+    assert where == ("WHERE ACCIDENT.DayNight = :f0 AND ACCIDENT.WeatherState IN (:f1_0, :f1_1) "
+                     "AND ACCIDENT.OccurYearMonth <= :f2_hi")
+    assert params == {'f0': injection, 'f1_0': '눈', 'f1_1': '비', 'f2_hi': '202306'}
+
+    fig, _ = viz.generate_visualization('사고유형', '사고건수', filters={'주야': injection})
+    assert fig is not None and sum(len(trace.x) for trace in fig.data) == 0
+
+
+def test_like_filter_escapes_wildcards(viz, plain_db):
+    where, params = _where(viz, {'사고내용': '10%_!'})
+    assert where.endswith("LIKE :f0 ESCAPE '!'")
+    assert params == {'f0': '%10!%!_!!%'}
+
+    # 와일드카드가 문자 그대로 검색되어야 함 ('%'만 검색하면 모든 행이 일치하면 안 됨)
+    with plain_db.connect() as conn:
+        descriptions = pd.read_sql(text("SELECT Description FROM ACCIDENT"), conn)['Description']
+    for keyword in ('%', '_', '사고'):
+        where, params = _where(viz, {'사고내용': keyword})
+        count = viz._fetch_data(f"SELECT COUNT(*) FROM ACCIDENT {where}", params).iloc[0, 0]
+        assert count == descriptions.str.contains(keyword, regex=False).sum()
+
+
+def test_region_and_driver_fact_filters(viz, plain_db):
+    region = viz.get_filter_options('지역명 (시군구)')[0]
+    where, params = _where(viz, {'지역명 (시군구)': region})
+    assert where == "WHERE ACCIDENT.RegionCode IN (SELECT RegionCode FROM REGION WHERE REGION.RegionName = :f0)"
+
+    # 운전자 차트: 사고 단위 조건을 DRIVER에 적용 (운전자 행 수 = 해당 사고들의 운전자 수)
+    fig, _ = viz.generate_visualization('운전자 성별', '사고건수', filters={'주야': '야간'})
+    with plain_db.connect() as conn:
+        expected = conn.execute(text(
+            "SELECT COUNT(*) FROM DRIVER d JOIN ACCIDENT a ON a.AccidentID = d.AccidentID WHERE a.DayNight = '야간'"
+        )).scalar()
+    assert sum(trace.y.sum() for trace in fig.data) == expected
+
+
+# --- 사고내용 저장 위치 ---
+def _description_count(viz: AccidentVisualizer, keyword: str, label: str = '사고유형') -> int:
+    fig, title = viz.generate_visualization(label, '사고건수', filters={'사고내용': keyword})
+    assert fig is not None, title
+    return int(sum(trace.y.sum() for trace in fig.data))
+
+
+@pytest.mark.parametrize('extra', [
+    ['--description-table'],
+    ['--description-table', '--description-dedup'],
+])
+def test_description_filter_reads_side_tables(viz, load_db, extra):
+    side = AccidentVisualizer(load_db('side', *extra), **SQL_ONLY)
+    for keyword in ('경상', '사고'):
+        assert _description_count(side, keyword) == _description_count(viz, keyword)
+        assert _description_count(side, keyword, '운전자 성별') == _description_count(viz, keyword, '운전자 성별')
+
+    # ACCIDENT.Description 컬럼을 없앤 변형 스키마도 사이드 테이블만으로 검색
+    with side.engine.begin() as conn:
+        conn.execute(text("ALTER TABLE ACCIDENT DROP COLUMN Description"))
+    dropped = AccidentVisualizer(side.engine, **SQL_ONLY)
+    assert _description_count(dropped, '경상') == _description_count(viz, '경상')
+
+
+def test_compressed_descriptions_are_not_searchable(load_db):
+    viz = AccidentVisualizer(load_db('compressed', '--description-table', '--description-codec', 'mysql_compress'),
+                             **SQL_ONLY)
+    assert '사고내용' not in viz.get_filter_columns()
+    with pytest.raises(ValueError):
+        viz.get_filter_options('사고내용')
+    fig, message = viz.generate_visualization('사고유형', '사고건수', filters={'사고내용': '경상'})
+    assert fig is None and message.startswith('조회 조건 오류')
+
+
+# --- payload ---
+def test_figure_payload_round_trip(viz):
+    for label1, label2 in [('사고유형', '사고건수'), ('발생년월', '주야'), ('사망자수', '중상자수')]:
+        fig, _ = viz.generate_visualization(label1, label2)
+        payload = figure_to_payload(fig)
+        assert '"bdata"' in payload  # 수치 배열은 typed array로 저장
+        restored = figure_from_payload(payload)
+        assert restored.layout.title.text == fig.layout.title.text
+        assert len(restored.data) == len(fig.data)
+        for original, trace in zip(fig.data, restored.data):
+            for axis in ('x', 'y'):
+                expected, got = getattr(original, axis), getattr(trace, axis)
+                if expected is None:
+                    assert got is None
+                elif np.asarray(expected).dtype.kind in 'iuf':
+                    np.testing.assert_array_equal(np.asarray(got, dtype=float), np.asarray(expected, dtype=float))
+                elif np.asarray(expected).dtype.kind == 'M':  # 날짜 축은 ISO 문자열로 저장됨
+                    assert list(pd.to_datetime(list(got))) == list(pd.to_datetime(expected))
+                else:
+                    assert list(got) == list(expected)
+
+
+def test_payload_keeps_large_integers():
+    fig = visualizer_module.go.Figure(visualizer_module.go.Bar(x=['a', 'b'], y=np.array([3, 2 ** 40], dtype=np.int64)))
+    restored = figure_from_payload(figure_to_payload(fig))
+    np.testing.assert_array_equal(restored.data[0].y, [3, 2 ** 40])
+
+
+def test_large_charts_render_with_webgl(plain_db):
+    viz = AccidentVisualizer(plain_db, **SQL_ONLY)
+    pairs = [('발생년월', '사고건수'), ('사망자수', '중상자수'), ('발생년월', '주야')]
+    for threshold, trace_type in ((10 ** 9, 'scatter'), (0, 'scattergl')):
+        viz.WEBGL_POINT_THRESHOLD = threshold
+        for pair in pairs:
+            fig, title = viz.generate_visualization(*pair)
+            assert fig is not None, title
+            assert {trace.type for trace in fig.data} == {trace_type}, pair
+            assert f'"type":"{trace_type}"' in figure_to_payload(fig)
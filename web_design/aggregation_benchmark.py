@@ -0,0 +1,169 @@
+"""
+AccidentVisualizer 집계 백엔드 벤치마크 (SQL vs 인메모리 집계 엔진)
+
+generate_visualization이 지원하는 모든 레이블 쌍에 대해 차트를 만들면서
+데이터 조회(집계) 시간과 차트 생성까지의 전체 시간을 백엔드별로 측정합니다.
+- sql: 매번 DB에 GROUP BY 쿼리 (사전 집계/결과 캐시 사용 안 함)
+- columnar: 기본 테이블을 한 번 메모리에 올린 뒤 NumPy로 집계 (web_design/columnar.py)
+두 백엔드가 plotly에 넘기는 DataFrame이 같은지도 함께 확인합니다.
+
+사용 예 (프로젝트 루트에서):
+  python -m web_design.aggregation_benchmark
+  python -m web_design.aggregation_benchmark --db-url "sqlite:///data/traffic_accident.db" --repeat 3
+"""
+import argparse
+import csv
+import itertools
+import logging
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pandas as pd
+import web_design.visualizer as visualizer_module
+from web_design.visualizer import AccidentVisualizer
+from web_design.db_backend import create_db_engine, database_url
+
+
+class _Timed:
+    """
+    Visualizer의 데이터 조회 메서드를 감싸 소요 시간을 누적합니다.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.seconds = 0.0
+
+    def __call__(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+def _capture_plot_frames(captured: list):
+    """
+    px.bar/line/scatter에 넘어가는 DataFrame을 기록하도록 감쌉니다. (백엔드 간 결과 비교용)
+    """
+    for name in ('bar', 'line', 'scatter'):
+        original = getattr(visualizer_module.px, name)
+
+        def wrapper(df, *args, _original=original, **kwargs):
+            captured.append(df.copy())
+            return _original(df, *args, **kwargs)
+        setattr(visualizer_module.px, name, wrapper)
+
+
+def _same_frame(left: pd.DataFrame, right: pd.DataFrame) -> bool:
+    # GROUP BY만 있고 ORDER BY가 없거나 값이 같은(동률) 행의 순서는 SQL에서도 정해지지 않으므로 정렬 후 비교
+    left = left.sort_values(list(left.columns)).reset_index(drop=True)
+    right = right.sort_values(list(right.columns)).reset_index(drop=True)
+    try:
+        pd.testing.assert_frame_equal(left, right)
+    except AssertionError:
+        return False
+    return True
+
+
+def make_visualizer(engine, backend: str) -> AccidentVisualizer:
+    viz = AccidentVisualizer(engine, use_summary=False, use_cache=False, use_columnar=(backend == 'columnar'))
+    viz._fetch_data = _Timed(viz._fetch_data)
+    viz._fetch_aggregate = _Timed(viz._fetch_aggregate)
+    return viz
+
+
+def run(engine, repeat: int):
+    """
+    레이블 쌍별 (백엔드, 차트 종류, 데이터 조회 시간, 전체 시간) 결과와 불일치 목록을 반환합니다.
+    """
+    captured = []
+    _capture_plot_frames(captured)
+    backends = {name: make_visualizer(engine, name) for name in ('sql', 'columnar')}
+
+    started = time.perf_counter()
+    backends['columnar'].columnar.load()
+    load_seconds = time.perf_counter() - started
+    load_mb = backends['columnar'].columnar.nbytes() / 1024 / 1024
+
+    labels = backends['sql'].get_available_columns()
+    results, mismatches = [], []
+    for label1, label2 in itertools.permutations(labels, 2):
+        frames = {}
+        for name, viz in backends.items():
+            data_times, total_times = [], []
+            for _ in range(repeat):
+                captured.clear()
+                before = viz._fetch_data.seconds + viz._fetch_aggregate.seconds
+                t0 = time.perf_counter()
+                fig, title = viz.generate_visualization(label1, label2)
+                total_times.append(time.perf_counter() - t0)
+                data_times.append(viz._fetch_data.seconds + viz._fetch_aggregate.seconds - before)
+            if fig is None:
+                break
+            frames[name] = captured[0]
+            results.append({
+                'backend': name, 'label1': label1, 'label2': label2, 'chart': title,
+                'data_ms': statistics.median(data_times) * 1000,
+                'total_ms': statistics.median(total_times) * 1000,
+            })
+        if len(frames) == 2 and not _same_frame(frames['sql'], frames['columnar']):
+            mismatches.append((label1, label2))
+    return results, mismatches, load_seconds, load_mb
+
+
+def print_report(results: list, mismatches: list, load_seconds: float, load_mb: float):
+    df = pd.DataFrame(results)
+    print(f"\n인메모리 적재: {load_seconds:.2f}초, 배열 {load_mb:.1f} MB")
+    summary = df.groupby('backend').agg(
+        charts=('chart', 'count'),
+        data_p50_ms=('data_ms', 'median'),
+        data_p95_ms=('data_ms', lambda s: s.quantile(0.95)),
+        data_sum_s=('data_ms', lambda s: s.sum() / 1000),
+        total_sum_s=('total_ms', lambda s: s.sum() / 1000),
+    ).round(2)
+    print(summary.to_string())
+    pivot = df.pivot_table(index=['label1', 'label2'], columns='backend', values='data_ms')
+    speedup = (pivot['sql'] / pivot['columnar']).median()
+    print(f"데이터 조회 시간 중앙값 기준 속도 향상: x{speedup:.1f}")
+    if mismatches:
+        print(f"결과 불일치 {len(mismatches)}건 (동률 값의 LIMIT 경계 차이일 수 있음):")
+        for label1, label2 in mismatches:
+            print(f"  - {label1} / {label2}")
+    else:
+        print("모든 차트에서 두 백엔드의 결과가 같습니다.")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AccidentVisualizer SQL vs 인메모리 집계 벤치마크")
+    parser.add_argument('--db-url', default=None,
+                        help="SQLAlchemy DB URL (csv_to_db.py로 적재된 DB, 기본: db_backend 설정)")
+    parser.add_argument('--repeat', type=int, default=1, help="레이블 쌍별 반복 횟수 (중앙값 사용)")
+    parser.add_argument('--output', default=None, help="레이블 쌍별 측정값을 저장할 CSV 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.disable(logging.INFO)
+    engine = create_db_engine(args.db_url or database_url())
+    try:
+        results, mismatches, load_seconds, load_mb = run(engine, args.repeat)
+    finally:
+        engine.dispose()
+    print_report(results, mismatches, load_seconds, load_mb)
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"측정값 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from sqlalchemy.engine import Engine
+from sqlalchemy import text
+from web_design.query_cache import read_data_generation
+from web_design.db_backend import read_sql_chunks
+import logging
+import threading
+import time
+
+
+class ColumnarStore:
+    """
+    ACCIDENT / DRIVER / REGION을 한 번 읽어 NumPy 배열로 메모리에 두고
+    AccidentVisualizer의 차트 집계를 SQL 없이 계산하는 인메모리 집계 엔진.
+
+    - 범주형/시간형 컬럼은 정렬된 범주 목록의 정수 코드(0은 NULL)로,
+      수치형 컬럼은 값 범위에 맞는 가장 작은 정수형으로 저장합니다.
+    - 집계는 np.ravel_multi_index로 그룹 번호를 만든 뒤 np.bincount로 계산합니다.
+    - 결과 DataFrame의 컬럼/행/정렬은 AccidentVisualizer의 SQL 쿼리 결과와 같습니다.
+      (SQL에서 순서가 정해지지 않는 부분은 그룹 키 오름차순)
+    - DATA_GENERATION 세대 번호가 바뀌면(ETL 적재 완료) 다음 조회 때 다시 읽습니다.
+      세대 테이블이 없는 스키마에서는 적재 후 ttl_seconds가 지나면 다시 읽습니다.
+    """
+
+    CATEGORY_COLUMNS = {
+        'ACCIDENT': ['DayNight', 'AccidentType', 'LawViolationYn', 'RoadSurfaceState',
+                     'WeatherState', 'RoadForm', 'OccurYearMonth'],
+        'DRIVER': ['Role', 'VehicleType', 'Gender', 'AgeGroup', 'InjuryLevel'],
+        'REGION': ['RegionName'],
+    }
+    MEASURES = ['DeathCount', 'SevereInjuryCount', 'MinorInjuryCount', 'ReportedInjuryCount']
+    COUNT_MEASURE = '(사고건수)'
+
+    READ_CHUNK_ROWS = 200_000
+
+    def __init__(self, engine: Engine, label_decoder=None, generation_check_seconds: float = 5,
+                 ttl_seconds: float = 600):
+        """
+        label_decoder: (컬럼명, 범주 값 배열) -> 레이블 배열. 정규화(룩업 코드) 스키마에서 코드를 레이블로 바꿀 때 사용
+        ttl_seconds: 데이터 세대 번호를 읽을 수 없을 때 다시 적재하는 간격 (QueryResultCache의 TTL과 같은 기본값)
+        """
+        self.engine = engine
+        self.label_decoder = label_decoder
+        self.generation_check_seconds = generation_check_seconds
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._generation = None
+        self._generation_checked_at = 0.0
+        self._loaded_at = 0.0
+        # 'TABLE.Column' -> 정수 코드 배열 / 범주 값 배열(코드 순서)
+        self.codes = {}
+        self.categories = {}
+        self.measures = {}
+        self.driver_accident = None   # DRIVER 행 -> ACCIDENT 행 위치 (-1: 대응 사고 없음)
+        self.accident_has_region = None
+        self.load_seconds = 0.0
+
+    # --- 적재 ---
+    @staticmethod
+    def _small_int(values: np.ndarray) -> np.ndarray:
+        if len(values) == 0:
+            return values.astype(np.uint8)
+        return values.astype(np.min_scalar_type(int(values.max())))
+
+    def _read_frame(self, conn, query: str, category_cols: list) -> pd.DataFrame:
+        """
+        쿼리 결과를 서버 측 커서로 청크씩 읽으며 범주형 컬럼을 category로 줄여 하나의 DataFrame으로 합칩니다.
+        """
+        chunks = []
+        for chunk in read_sql_chunks(conn, query, chunksize=self.READ_CHUNK_ROWS):
+            for col in category_cols:
+                chunk[col] = chunk[col].astype('category')
+            chunks.append(chunk)
+        if not chunks:
+            return pd.read_sql(text(query + " LIMIT 0"), conn)
+        return pd.DataFrame({
+            col: (union_categoricals([c[col] for c in chunks], ignore_order=True)
+                  if col in category_cols else pd.concat([c[col] for c in chunks], ignore_index=True))
+            for col in chunks[0].columns
+        })
+
+    def _encode(self, var: str, values) -> None:
+        """
+        값을 정렬된 범주 목록의 코드(+1, NULL=0)로 바꿔 저장합니다.
+        범주 순서는 DB 값 기준 ORDER BY와 같습니다. (NULL이 먼저)
+        """
+        categorical = pd.Categorical(values)
+        categorical = categorical.reorder_categories(sorted(categorical.categories))
+        codes = categorical.codes.astype(np.int32) + 1
+        categories = np.empty(len(categorical.categories) + 1, dtype=object)
+        categories[0] = None
+        categories[1:] = categorical.categories.to_numpy(dtype=object)
+        if self.label_decoder is not None:
+            categories[1:] = self.label_decoder(var.split('.')[1], categories[1:])
+        self.codes[var] = self._small_int(codes)
+        self.categories[var] = categories
+
+    def load(self):
+        """
+        기본 테이블을 읽어 배열을 (다시) 만듭니다.
+        """
+        started = time.perf_counter()
+        acc_cats = self.CATEGORY_COLUMNS['ACCIDENT']
+        drv_cats = self.CATEGORY_COLUMNS['DRIVER']
+        with self.engine.connect() as conn:
+            try:
+                generation = read_data_generation(conn)
+            except Exception:
+                conn.rollback()
+                generation = None
+            regions = pd.read_sql(text("SELECT RegionCode, RegionName FROM REGION"), conn)
+            accidents = self._read_frame(
+                conn,
+                f"SELECT AccidentID, RegionCode, {', '.join(acc_cats + self.MEASURES)} FROM ACCIDENT ORDER BY AccidentID",
+                acc_cats + ['RegionCode'],
+            )
+            drivers = self._read_frame(
+                conn, f"SELECT AccidentID, {', '.join(drv_cats)} FROM DRIVER", drv_cats,
+            )
+
+        codes, categories, measures = {}, {}, {}
+        self.codes, self.categories, self.measures = codes, categories, measures
+        for col in acc_cats:
+            self._encode(f"ACCIDENT.{col}", accidents[col])
+        for col in drv_cats:
+            self._encode(f"DRIVER.{col}", drivers[col])
+        for col in self.MEASURES:
+            measures[col] = self._small_int(accidents[col].to_numpy(dtype=np.int64))
+
+        # REGION은 ACCIDENT 행 기준으로 펼쳐 둠 (INNER JOIN: 지역이 없는 사고는 제외 표시)
+        region_pos = pd.Index(regions['RegionCode']).get_indexer(accidents['RegionCode'].astype(object))
+        self.accident_has_region = region_pos >= 0
+        region_names = regions['RegionName'].to_numpy(dtype=object)
+        self._encode('REGION.RegionName', np.where(region_pos >= 0, region_names[region_pos], None))
+
+        # DRIVER -> ACCIDENT 행 위치 (AccidentID 오름차순으로 읽었으므로 이진 탐색)
+        accident_ids = accidents['AccidentID'].to_numpy(dtype=np.int64)
+        driver_ids = drivers['AccidentID'].to_numpy(dtype=np.int64)
+        pos = np.searchsorted(accident_ids, driver_ids)
+        pos_clipped = np.minimum(pos, max(len(accident_ids) - 1, 0))
+        matched = (pos < len(accident_ids)) & (accident_ids[pos_clipped] == driver_ids) if len(accident_ids) else np.zeros(len(driver_ids), bool)
+        self.driver_accident = np.where(matched, pos_clipped, -1).astype(np.int32)
+
+        self._generation = generation
+        self._generation_checked_at = self._loaded_at = time.monotonic()
+        self._loaded = True
+        self.load_seconds = time.perf_counter() - started
+        logging.info(f"인메모리 집계 엔진 적재 완료: 사고 {len(accident_ids)}건, 운전자 {len(driver_ids)}건, "
+                     f"{self.nbytes() / 1024 / 1024:.1f} MB, {self.load_seconds:.2f}초")
+
+    def nbytes(self) -> int:
+        arrays = list(self.codes.values()) + list(self.measures.values())
+        arrays += [a for a in (self.driver_accident, self.accident_has_region) if a is not None]
+        return sum(a.nbytes for a in arrays)
+
+    def _ensure_current(self):
+        """
+        처음 조회할 때 적재하고, 이후에는 확인 간격마다 데이터 세대 번호를 비교해 바뀌었으면 다시 적재합니다.
+        세대 번호를 읽을 수 없었으면(세대 테이블이 없는 스키마) 적재 후 ttl_seconds가 지나면 다시 적재합니다.
+        """
+        with self._lock:
+            if not self._loaded:
+                self.load()
+                return
+            now = time.monotonic()
+            if self._generation is None:
+                if now - self._loaded_at >= self.ttl_seconds:
+                    logging.info(f"데이터 세대를 알 수 없어 {self.ttl_seconds}초마다 인메모리 집계 엔진을 다시 적재합니다.")
+                    self.load()
+                return
+            if now - self._generation_checked_at < self.generation_check_seconds:
+                return
+            self._generation_checked_at = now
+            try:
+                with self.engine.connect() as conn:
+                    generation = read_data_generation(conn)
+            except Exception as e:
+                logging.warning(f"데이터 세대 확인 실패, {self.generation_check_seconds}초 후 다시 확인합니다: {e}")
+                return
+            if generation != self._generation:
+                logging.info(f"데이터 세대 변경 ({self._generation} -> {generation}): 인메모리 집계 엔진을 다시 적재합니다.")
+                self.load()
+
+    # --- 집계 ---
+    def covers(self, dim_vars: list, num_var: str) -> bool:
+        if not 1 <= len(dim_vars) <= 2:
+            return False
+        for var in dim_vars:
+            table, col = var.split('.')
+            if col not in self.CATEGORY_COLUMNS.get(table, []) and not (table == 'ACCIDENT' and col in self.MEASURES):
+                return False
+        table, col = num_var.split('.')
+        return table == 'ACCIDENT' and (col == self.COUNT_MEASURE or col in self.MEASURES)
+
+    def _dimension(self, var: str):
+        """
+        (ACCIDENT 행 기준 코드 배열, 범주 값 배열). 수치형 컬럼은 값 자체를 코드로 사용합니다.
+        """
+        if var in self.codes:
+            return self.codes[var], self.categories[var]
+        values = self.measures[var.split('.')[1]]
+        return values, np.arange(int(values.max()) + 1 if len(values) else 1, dtype=np.int64)
+
+    def fetch(self, dim_vars: list, num_var: str, value_name: str = 'Value',
+              order_by: str = None, descending: bool = False, limit: int = None):
+        """
+        SummaryCube.fetch와 같은 인터페이스로 dim_vars별 num_var 집계(COUNT/SUM)를 계산합니다.
+        지원하지 않는 조합이면 None을 반환합니다.
+
+        order_by: 'value' 또는 정렬 기준 차원의 내부 컬럼명 (동률/미지정 시 그룹 키 오름차순)
+        """
+        if not self.covers(dim_vars, num_var):
+            return None
+        self._ensure_current()
+
+        measure = num_var.split('.')[1]
+        with_driver = any(var.startswith('DRIVER.') for var in dim_vars)
+        with_region = any(var.startswith('REGION.') for var in dim_vars)
+
+        # 집계 단위 행 선택: DRIVER 차원이 있으면 ACCIDENT ⋈ DRIVER 행, 아니면 ACCIDENT 행
+        if with_driver:
+            rows = self.driver_accident[self.driver_accident >= 0]
+            driver_rows = self.driver_accident >= 0
+            if with_region:
+                keep = self.accident_has_region[rows]
+                rows, driver_rows = rows[keep], np.flatnonzero(driver_rows)[keep]
+        else:
+            rows = np.flatnonzero(self.accident_has_region) if with_region else None
+            driver_rows = None
+
+        group_codes, group_categories = [], []
+        for var in dim_vars:
+            codes, categories = self._dimension(var)
+            if var.startswith('DRIVER.'):
+                codes = codes[driver_rows]
+            elif rows is not None:
+                codes = codes[rows]
+            group_codes.append(codes.astype(np.int64))
+            group_categories.append(categories)
+
+        shape = tuple(len(c) for c in group_categories)
+        group = np.ravel_multi_index(tuple(group_codes), shape)
+        size = int(np.prod(shape))
+        counts = np.bincount(group, minlength=size)
+        if measure == self.COUNT_MEASURE:
+            values = counts
+        else:
+            weights = self.measures[measure] if rows is None else self.measures[measure][rows]
+            values = np.bincount(group, weights=weights, minlength=size).round().astype(np.int64)
+
+        # SQL GROUP BY와 같이 행이 있는 그룹만 반환
+        present = np.flatnonzero(counts)
+        keys = np.unravel_index(present, shape)
+        values = values[present]
+
+        if order_by == 'value':
+            order = np.argsort(-values if descending else values, kind='stable')
+        elif order_by:
+            key = keys[dim_vars.index(order_by)]
+            order = np.argsort(-key if descending else key, kind='stable')
+        else:
+            order = np.arange(len(present))
+        if limit:
+            order = order[:int(limit)]
+
+        data = {}
+        for var, key, categories in zip(dim_vars, keys, group_categories):
+            data[var.split('.')[1]] = categories[key[order]]
+        data[value_name] = values[order].astype(np.int64)
+        df = pd.DataFrame(data)
+        logging.info(f"Data computed (columnar): {dim_vars} x {num_var} -> {len(df)} rows")
+        return df
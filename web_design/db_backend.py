@@ -0,0 +1,297 @@
+"""
+DB 백엔드 설정
+
+- mysql : 기존 MySQL 서버 (AtoZsql.sql 스키마를 미리 생성해야 함)
+- sqlite: 서버 없이 단일 파일로 동작하는 내장 백엔드 (스키마 sql/AtoZsql_sqlite.sql 자동 생성)
+
+csv_to_db.py(적재)와 pages/driver_input.py(시각화)가 같은 설정을 쓰도록 연결 URL과 엔진 생성을
+이 모듈에 모았습니다. 환경 변수로 바꿀 수 있습니다.
+  SAFECAR_DB_BACKEND = mysql | sqlite          (기본 mysql)
+  SAFECAR_DB_URL     = SQLAlchemy URL           (지정 시 백엔드 설정보다 우선)
+  SAFECAR_SQLITE_PATH = SQLite 파일 경로        (기본 data/traffic_accident.db)
+  SAFECAR_MYSQL_USER / _PASSWORD / _HOST / _PORT / _DB = MySQL 접속 정보 (기본 아래 MYSQL_* 값)
+
+연결 풀과 쿼리 실행 제한도 같은 환경 변수 방식으로 조정합니다.
+  SAFECAR_DB_POOL_SIZE / SAFECAR_DB_MAX_OVERFLOW / SAFECAR_DB_POOL_TIMEOUT (초)
+  SAFECAR_DB_STATEMENT_TIMEOUT_MS = 조회 쿼리 최대 실행 시간 (0이면 제한 없음)
+    - MySQL : 연결마다 SET SESSION MAX_EXECUTION_TIME
+    - SQLite: 실행 중 진행 핸들러로 시간 초과 시 중단
+  쿼리별로는 conn.execution_options(max_execution_ms=...)로 바꿀 수 있습니다.
+"""
+import bisect
+from collections import deque
+import os
+import re
+import threading
+import time
+import pandas as pd
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BACKENDS = ('mysql', 'sqlite')
+DEFAULT_BACKEND = 'mysql'
+
+MYSQL_USER = os.environ.get('SAFECAR_MYSQL_USER', 'skn22')
+MYSQL_PASSWORD = os.environ.get('SAFECAR_MYSQL_PASSWORD', 'skn22')
+MYSQL_HOST = os.environ.get('SAFECAR_MYSQL_HOST', 'localhost')
+MYSQL_PORT = os.environ.get('SAFECAR_MYSQL_PORT', '3306')
+MYSQL_DB_NAME = os.environ.get('SAFECAR_MYSQL_DB', 'project_1')
+MYSQL_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB_NAME}?charset=utf8mb4"
+
+DEFAULT_SQLITE_PATH = os.path.join(PROJECT_ROOT, 'data', 'traffic_accident.db')
+SQLITE_SCHEMA_FILE = os.path.join(PROJECT_ROOT, 'sql', 'AtoZsql_sqlite.sql')
+# 정규화(룩업 코드) 스키마 변형: 기본 스키마 직후 실행하여 코드 컬럼을 SMALLINT로 다시 만듦
+SQLITE_CODED_SCHEMA_FILE = os.path.join(PROJECT_ROOT, 'sql', 'AtoZsql_sqlite_coded.sql')
+
+# 내장 백엔드 연결마다 적용할 PRAGMA (읽기/쓰기 동시 접근과 적재 속도용)
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",       # 적재 중에도 시각화 조회 가능
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=30000",     # 병렬 적재 워커의 쓰기 잠금 대기 (ms)
+    "PRAGMA temp_store=MEMORY",      # GROUP BY/ORDER BY 임시 결과
+    "PRAGMA cache_size=-65536",      # 페이지 캐시 64 MB
+]
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+# 연결 풀 기본값 (Streamlit 세션 + 대시보드 병렬 차트 생성 기준)
+POOL_SIZE = _env_int('SAFECAR_DB_POOL_SIZE', 5)
+MAX_OVERFLOW = _env_int('SAFECAR_DB_MAX_OVERFLOW', 10)
+POOL_TIMEOUT = _env_int('SAFECAR_DB_POOL_TIMEOUT', 30)     # 풀 연결 대기 최대 시간 (초)
+POOL_RECYCLE = _env_int('SAFECAR_DB_POOL_RECYCLE', 3600)   # MySQL wait_timeout 전에 연결 교체 (초)
+# 조회 쿼리 최대 실행 시간 (ms, 0이면 제한 없음). 오래 걸리는 임의 집계가 앱 워커를 붙잡지 않도록 제한
+STATEMENT_TIMEOUT_MS = _env_int('SAFECAR_DB_STATEMENT_TIMEOUT_MS', 60000)
+# 서버 측 커서로 큰 결과를 나눠 읽을 때의 청크 행 수
+STREAM_CHUNK_ROWS = 50_000
+# 연결 대기 시간 분위수 계산에 보관할 최근 측정값 수
+POOL_WAIT_SAMPLES = 1000
+
+_SELECT_HEAD = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+
+
+def default_backend() -> str:
+    return os.environ.get('SAFECAR_DB_BACKEND', DEFAULT_BACKEND)
+
+
+def database_url(backend: str = None, sqlite_path: str = None) -> str:
+    """
+    백엔드 이름으로 SQLAlchemy 연결 URL을 만듭니다. (SAFECAR_DB_URL이 있으면 그 값을 사용)
+    """
+    if os.environ.get('SAFECAR_DB_URL'):
+        return os.environ['SAFECAR_DB_URL']
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 DB 백엔드: {backend} (가능: {', '.join(BACKENDS)})")
+    if backend == 'sqlite':
+        path = sqlite_path or os.environ.get('SAFECAR_SQLITE_PATH', DEFAULT_SQLITE_PATH)
+        return f"sqlite:///{os.path.abspath(path)}"
+    return MYSQL_URL
+
+
+def is_embedded(engine: Engine) -> bool:
+    """
+    서버 없는 내장 백엔드(SQLite)인지 여부
+    """
+    return engine.dialect.name == 'sqlite'
+
+
+class PoolMetrics:
+    """
+    연결 풀 체크아웃 대기 시간/사용량 계측값. 여러 스레드에서 동시에 기록해도 안전합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.peak_checked_out = 0
+        self._recent_waits = []   # 최근 POOL_WAIT_SAMPLES개 (정렬 상태 유지)
+        self._order = deque()
+
+    def observe(self, seconds: float, checked_out: int):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self._order.append(seconds)
+            bisect.insort(self._recent_waits, seconds)
+            if len(self._order) > POOL_WAIT_SAMPLES:
+                oldest = self._order.popleft()
+                del self._recent_waits[bisect.bisect_left(self._recent_waits, oldest)]
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def report(self) -> dict:
+        with self._lock:
+            waits = self._recent_waits
+            p95 = waits[min(len(waits) - 1, int(round(0.95 * (len(waits) - 1))))] if waits else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_ms_p95": round(p95 * 1000, 3),
+                "wait_ms_max": round(self.max_wait_seconds * 1000, 3),
+                "peak_checked_out": self.peak_checked_out,
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    체크아웃 대기 시간(새 연결 생성 포함)과 최대 동시 사용 연결 수를 기록하는 QueuePool
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        self.metrics.observe(time.perf_counter() - started, self.checkedout())
+        return record
+
+    def recreate(self):
+        # engine.dispose() 후에도 누적 계측값 유지
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def _uses_queue_pool(url) -> bool:
+    # SQLite 메모리 DB는 SQLAlchemy가 단일 연결 풀을 사용 (풀 크기 설정 불가)
+    return not (url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'))
+
+
+def create_db_engine(url: str = None, pool_size: int = None, max_overflow: int = None,
+                     pool_timeout: int = None, statement_timeout_ms: int = None, **engine_kwargs) -> Engine:
+    """
+    백엔드에 맞는 설정으로 엔진을 만듭니다. 페이지/ETL/Visualizer가 모두 이 함수로 엔진을 만듭니다.
+    - 연결 풀: pool_size / max_overflow / pool_timeout (None이면 SAFECAR_DB_* 환경 변수 또는 기본값),
+      pool_pre_ping으로 끊긴 연결을 체크아웃 시 교체, 대기 시간은 pool_stats()로 확인
+    - statement_timeout_ms: 조회 쿼리 최대 실행 시간 (None이면 STATEMENT_TIMEOUT_MS, 0이면 제한 없음)
+    SQLite는 연결마다 PRAGMA를 적용하고, 파일이 없으면 새로 만듭니다.
+    """
+    url = make_url(url or database_url())
+    if _uses_queue_pool(url):
+        engine_kwargs.setdefault('poolclass', MeteredQueuePool)
+        engine_kwargs.setdefault('pool_size', POOL_SIZE if pool_size is None else pool_size)
+        engine_kwargs.setdefault('max_overflow', MAX_OVERFLOW if max_overflow is None else max_overflow)
+        engine_kwargs.setdefault('pool_timeout', POOL_TIMEOUT if pool_timeout is None else pool_timeout)
+        engine_kwargs.setdefault('pool_recycle', POOL_RECYCLE)
+    engine_kwargs.setdefault('pool_pre_ping', True)
+    engine = create_engine(url, **engine_kwargs)
+    timeout_ms = STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+
+    if is_embedded(engine):
+        @event.listens_for(engine, 'connect')
+        def _apply_pragmas(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _start_deadline(conn, cursor, statement, parameters, context, executemany):
+            # SQLite에는 실행 시간 제한이 없으므로 진행 핸들러가 기한을 넘기면 쿼리를 중단 (OperationalError: interrupted)
+            # (중단된 쿼리의 핸들러가 남지 않도록 제한이 없는 문장에서는 항상 해제)
+            limit = conn.get_execution_options().get('max_execution_ms', timeout_ms)
+            driver_conn = conn.connection.driver_connection
+            if limit and _SELECT_HEAD.match(statement):
+                deadline = time.monotonic() + limit / 1000
+                driver_conn.set_progress_handler(lambda: 1 if time.monotonic() > deadline else 0, 10000)
+            else:
+                driver_conn.set_progress_handler(None, 0)
+
+    elif engine.dialect.name == 'mysql':
+        @event.listens_for(engine, 'connect')
+        def _apply_session_timeout(dbapi_conn, connection_record):
+            # MAX_EXECUTION_TIME은 읽기 전용 SELECT에만 적용 (적재 INSERT/UPDATE는 영향 없음)
+            cursor = dbapi_conn.cursor()
+            cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {int(timeout_ms)}")
+            cursor.close()
+
+        @event.listens_for(engine, 'before_cursor_execute', retval=True)
+        def _apply_query_timeout(conn, cursor, statement, parameters, context, executemany):
+            # 쿼리별 제한: 옵티마이저 힌트 /*+ MAX_EXECUTION_TIME(ms) */ 로 세션 값을 덮어씀
+            limit = conn.get_execution_options().get('max_execution_ms')
+            if limit is not None and _SELECT_HEAD.match(statement):
+                statement = _SELECT_HEAD.sub(f"SELECT /*+ MAX_EXECUTION_TIME({int(limit)}) */", statement, count=1)
+            return statement, parameters
+    return engine
+
+
+def pool_stats(engine: Engine) -> dict:
+    """
+    연결 풀 상태(크기/사용 중/오버플로)와 체크아웃 대기 시간 계측값을 반환합니다.
+    """
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow(),
+                     max_overflow=pool._max_overflow)
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        stats.update(metrics.report())
+    return stats
+
+
+def read_sql_chunks(conn, query: str, params: dict = None, chunksize: int = STREAM_CHUNK_ROWS,
+                    max_execution_ms: int = 0, yield_empty: bool = False):
+    """
+    큰 조회 결과를 서버 측 커서(stream_results)로 chunksize 행씩 읽어 DataFrame으로 내보냅니다.
+    pd.read_sql(chunksize=...)는 MySQL(PyMySQL)에서 결과 전체를 클라이언트 메모리에 받은 뒤 나누므로,
+    전체 테이블을 읽는 집계 엔진/사전 집계 재계산과 시각화 조회는 이 함수를 사용합니다.
+    (SQLite 커서는 원래 행 단위로 읽으므로 옵션이 무시됨)
+    max_execution_ms: 테이블 전체 읽기는 결과를 받는 동안 실행 중이므로 기본은 제한 없음(0),
+                      None이면 엔진/연결에 설정된 조회 시간 제한을 그대로 사용
+    yield_empty: 결과 행이 없으면 컬럼만 있는 빈 DataFrame 하나를 내보냄
+    """
+    options = dict(stream_results=True, yield_per=chunksize)
+    if max_execution_ms is not None:
+        options['max_execution_ms'] = max_execution_ms
+    result = conn.execution_options(**options).execute(text(query), params or {})
+    columns = list(result.keys())
+    empty = True
+    for rows in result.partitions(chunksize):
+        empty = False
+        yield pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+    if empty and yield_empty:
+        yield pd.DataFrame(columns=columns)
+
+
+def ensure_schema(engine: Engine, coded: bool = False) -> bool:
+    """
+    내장 백엔드에 테이블이 없으면 sql/AtoZsql_sqlite.sql로 스키마를 만듭니다.
+    coded=True면 이어서 sql/AtoZsql_sqlite_coded.sql로 정규화(룩업 코드) 스키마 변형을 적용합니다.
+    새로 만들었으면 True. (MySQL은 AtoZsql.sql / AtoZsql_coded.sql로 직접 생성하므로 아무것도 하지 않음)
+    """
+    if not is_embedded(engine) or inspect(engine).has_table('ACCIDENT'):
+        return False
+    script = ''
+    for path in [SQLITE_SCHEMA_FILE] + ([SQLITE_CODED_SCHEMA_FILE] if coded else []):
+        with open(path, encoding='utf-8') as f:
+            script += f.read() + '\n'
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.executescript(script)
+        raw.commit()
+    finally:
+        raw.close()
+    return True
@@ -0,0 +1,57 @@
+"""
+사고내용(Description) 저장 위치 / 저장 형식
+
+csv_to_db.py는 사고내용을 두 가지 방식으로 적재합니다.
+- 기본: ACCIDENT.Description (TEXT)
+- --description-table: DESCRIPTION_TEXT(본문) + ACCIDENT_DESCRIPTION(AccidentID -> DescriptionID)
+  이때 ACCIDENT.Description은 NULL이며, 'ALTER TABLE ACCIDENT DROP COLUMN Description'으로 컬럼을 없앨 수도 있습니다.
+적재(csv_to_db.py)와 읽는 쪽(AccidentVisualizer의 사고내용 검색 조건)이 같은 형식을 쓰도록 이 모듈에 모았습니다.
+"""
+import struct
+import zlib
+from sqlalchemy import inspect, text
+
+# 본문 저장 형식
+# 'mysql_compress'는 MySQL COMPRESS()와 같은 형식(4바이트 원본 길이 + zlib)이므로 UNCOMPRESS()로 읽을 수 있음
+DESCRIPTION_CODECS = ('none', 'mysql_compress')
+
+
+def encode_description(value: str, codec: str) -> bytes:
+    """
+    사고내용 문자열을 저장 형식(bytes)으로 변환합니다.
+    mysql_compress는 MySQL COMPRESS()와 같은 형식입니다. (빈 문자열은 빈 값)
+    """
+    data = str(value).encode('utf-8')
+    if codec == 'mysql_compress' and data:
+        return struct.pack('<I', len(data)) + zlib.compress(data)
+    return data
+
+
+def decode_description(body: bytes, codec: str) -> str:
+    if codec == 'mysql_compress' and body:
+        return zlib.decompress(bytes(body)[4:]).decode('utf-8')
+    return bytes(body).decode('utf-8')
+
+
+def description_tables_exist(conn) -> bool:
+    insp = inspect(conn)
+    return insp.has_table('ACCIDENT_DESCRIPTION') and insp.has_table('DESCRIPTION_TEXT')
+
+
+def description_storage(conn) -> dict:
+    """
+    현재 DB에서 사고내용을 읽을 수 있는 위치를 반환합니다.
+    - inline    : ACCIDENT.Description 컬럼이 있음
+    - side      : 사이드 테이블(ACCIDENT_DESCRIPTION/DESCRIPTION_TEXT)에 적재된 행이 있음
+    - compressed: 사이드 테이블 본문 중 압축(codec != 'none')된 것이 있음 (SQL LIKE로 검색 불가)
+    적재 방식을 바꿔 가며 증분 적재하면 inline/side가 함께 True일 수 있습니다.
+    """
+    inline = any(c['name'] == 'Description' for c in inspect(conn).get_columns('ACCIDENT'))
+    side = compressed = False
+    if description_tables_exist(conn):
+        side = conn.execute(text("SELECT 1 FROM ACCIDENT_DESCRIPTION LIMIT 1")).first() is not None
+        if side:
+            compressed = conn.execute(text(
+                "SELECT 1 FROM DESCRIPTION_TEXT WHERE Codec <> 'none' LIMIT 1"
+            )).first() is not None
+    return {'inline': inline, 'side': side, 'compressed': compressed}
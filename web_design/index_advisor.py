@@ -0,0 +1,369 @@
+"""
+AccidentVisualizer 쿼리 실행 계획 분석 / 인덱스 추천 도구
+
+generate_visualization이 지원하는 모든 레이블 쌍의 차트를 만들면서 실제로 실행되는 SQL을 모으고,
+쿼리마다 실행 계획과 실행 시간을 측정합니다.
+- MySQL : EXPLAIN FORMAT=JSON (access_type ALL/index, using_temporary_table, using_filesort)
+- SQLite: EXPLAIN QUERY PLAN (SCAN, USE TEMP B-TREE FOR GROUP BY/ORDER BY)
+전체 스캔/임시 테이블/정렬(filesort)이 있는 쿼리를 보고하고, 차트의 조건/그룹/집계 컬럼으로
+ACCIDENT / DRIVER / REGION (와이드 테이블 사용 시 ACCIDENT_WIDE)의 복합·커버링 인덱스를 추천합니다.
+사전 집계/결과 캐시/인메모리 집계는 끄고 기본 테이블 쿼리만 분석합니다.
+
+사용 예 (프로젝트 루트에서, synthetic_data.py로 만든 데이터를 csv_to_db.py로 적재한 DB):
+  python -m web_design.index_advisor
+  python -m web_design.index_advisor --db-url "sqlite:///data/traffic_accident.db" --repeat 3 --output plans.csv
+  python -m web_design.index_advisor --filters '{"발생년월": {"from": "202301", "to": "202306"}, "기상상태": ["비", "눈"]}'
+  python -m web_design.index_advisor --verify 3      (상위 추천 3개를 만들어 전후 시간 비교 후 삭제)
+"""
+import argparse
+import csv
+import itertools
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pandas as pd
+from sqlalchemy import inspect, text
+from web_design.visualizer import AccidentVisualizer
+from web_design.db_backend import create_db_engine, database_url
+
+# 이 행 수보다 작은 테이블(REGION 등)은 전체 스캔해도 비용이 작으므로 인덱스를 추천하지 않음
+MIN_TABLE_ROWS = 10_000
+
+
+# --- 쿼리 수집 ---
+def collect_queries(viz: AccidentVisualizer, filters: dict = None) -> list:
+    """
+    모든 레이블 쌍의 차트를 만들며 실행된 SQL을 모읍니다.
+    같은 SQL(+파라미터)은 한 번만: [{'sql', 'params', 'pairs', 'request'}] 순서대로 반환
+    """
+    queries = {}
+    current = {}
+    original = viz._query_data
+
+    def recording_query_data(query, params=None, decode=True):
+        key = (query, tuple(sorted((params or {}).items())))
+        entry = queries.setdefault(key, {'sql': query, 'params': dict(params or {}), 'pairs': [],
+                                         'request': current.get('request')})
+        entry['pairs'].append(current['pair'])
+        return original(query, params, decode)
+
+    viz._query_data = recording_query_data
+    try:
+        labels = viz.get_available_columns()
+        for label1, label2 in itertools.permutations(labels, 2):
+            current['pair'] = (label1, label2)
+            current['request'] = viz._aggregate_request(label1, label2)
+            viz.generate_visualization(label1, label2, filters)
+    finally:
+        viz._query_data = original
+    return list(queries.values())
+
+
+# --- 실행 계획 ---
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def explain_mysql(conn, query: str, params: dict) -> dict:
+    """
+    EXPLAIN FORMAT=JSON 결과를 {테이블: 접근 방식}, 임시 테이블/정렬 여부로 요약합니다.
+    접근 방식: full_scan(ALL) / index_scan(index: 인덱스 전체 읽기) / lookup(ref, range, eq_ref ...)
+    """
+    raw = conn.execute(text(f"EXPLAIN FORMAT=JSON {query}"), params).scalar()
+    plan = json.loads(raw)
+    tables, temporary, filesort = {}, False, False
+    for node in _walk(plan):
+        temporary = temporary or bool(node.get('using_temporary_table'))
+        filesort = filesort or bool(node.get('using_filesort'))
+        if 'table_name' in node and 'access_type' in node:
+            access = {'ALL': 'full_scan', 'index': 'index_scan'}.get(node['access_type'], 'lookup')
+            tables[node['table_name']] = {'access': access, 'key': node.get('key'),
+                                          'covering': bool(node.get('using_index'))}
+    return {'tables': tables, 'temporary': temporary, 'filesort': filesort, 'raw': raw}
+
+
+def explain_sqlite(conn, query: str, params: dict) -> dict:
+    """
+    EXPLAIN QUERY PLAN의 detail 문장을 explain_mysql과 같은 형태로 요약합니다.
+    - SCAN T                     -> full_scan
+    - SCAN T USING [COVERING] INDEX i -> index_scan (인덱스 전체 읽기)
+    - SEARCH T USING ...         -> lookup
+    - USE TEMP B-TREE FOR GROUP BY / DISTINCT -> 임시 테이블, FOR ORDER BY -> 정렬(filesort)
+    """
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {query}"), params).fetchall()
+    details = [row[-1] for row in rows]
+    tables, temporary, filesort = {}, False, False
+    for detail in details:
+        words = detail.split()
+        if detail.startswith('USE TEMP B-TREE'):
+            if 'ORDER BY' in detail:
+                filesort = True
+            else:
+                temporary = True
+        elif words and words[0] in ('SCAN', 'SEARCH') and len(words) > 1:
+            name = words[1]
+            key = words[words.index('INDEX') + 1] if 'INDEX' in words else None
+            if words[0] == 'SEARCH':
+                access = 'lookup'
+            else:
+                access = 'index_scan' if key else 'full_scan'
+            tables[name] = {'access': access, 'key': key, 'covering': 'COVERING' in words}
+    return {'tables': tables, 'temporary': temporary, 'filesort': filesort, 'raw': ' | '.join(details)}
+
+
+def explain(conn, query: str, params: dict) -> dict:
+    if conn.dialect.name == 'mysql':
+        return explain_mysql(conn, query, params)
+    if conn.dialect.name == 'sqlite':
+        return explain_sqlite(conn, query, params)
+    raise ValueError(f"실행 계획 분석을 지원하지 않는 DB입니다: {conn.dialect.name}")
+
+
+def time_query(conn, query: str, params: dict, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(text(query), params).fetchall()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+# --- 인덱스 추천 ---
+def _split(sql_column: str):
+    table, col = sql_column.split('.')
+    return table, col
+
+
+def propose_indexes(viz: AccidentVisualizer, entry: dict, plan: dict, conditions: tuple) -> list:
+    """
+    쿼리 하나에 대해 테이블별 인덱스 컬럼 목록을 추천합니다. [(테이블, (컬럼, ...))]
+    컬럼 순서: 동등/IN 조건 -> 범위 조건 -> GROUP BY 컬럼 -> (JOIN 키) -> 집계 컬럼 (마지막까지 포함하면 커버링)
+    전체 스캔/인덱스 전체 읽기이거나 임시 테이블/정렬이 필요한 테이블에만 추천합니다.
+    """
+    if entry['request'] is None:
+        return []
+    dims, num_var = entry['request']
+    condition_vars = [var for var, _, _ in conditions
+                      if var in viz.COLUMN_CONFIG and not var.startswith('REGION.')]
+    from_clause, join_clause, column = viz._source_tables(*dims, num_var, *condition_vars)
+    fact = from_clause.split()[1]
+
+    per_table = {}
+
+    def add(table, col):
+        cols = per_table.setdefault(table, [])
+        if col not in cols:
+            cols.append(col)
+
+    for var, op, _ in conditions:
+        if var in condition_vars and op in ('=', 'IN'):
+            add(*_split(column(var)))
+    for var, op, _ in conditions:
+        if var in condition_vars and op == 'RANGE':
+            add(*_split(column(var)))
+    for var in dims:
+        add(*_split(column(var)))
+    if 'JOIN DRIVER' in join_clause:
+        per_table.setdefault('DRIVER', []).insert(0, 'AccidentID')  # 조인 키를 선두로 (사고별 운전자 탐색 + 커버링)
+    if 'JOIN REGION' in join_clause:
+        add('ACCIDENT', 'RegionCode')
+    if not num_var.endswith('(사고건수)'):
+        add(*_split(column(num_var)))
+
+    needs_help = plan['temporary'] or plan['filesort']
+    proposals = []
+    for table, cols in per_table.items():
+        access = plan['tables'].get(table, {})
+        scanned = access.get('access') in ('full_scan', 'index_scan') and not access.get('covering')
+        if scanned or needs_help:
+            if table == fact or table == 'DRIVER':
+                proposals.append((table, tuple(cols)))
+    return proposals
+
+
+def existing_indexes(engine) -> dict:
+    """
+    {테이블: [(컬럼, ...), ...]} 기존 인덱스/기본 키 컬럼 목록
+    """
+    insp = inspect(engine)
+    result = {}
+    for table in insp.get_table_names():
+        indexes = [tuple(index['column_names']) for index in insp.get_indexes(table)]
+        pk = insp.get_pk_constraint(table).get('constrained_columns')
+        if pk:
+            indexes.append(tuple(pk))
+        result[table] = indexes
+    return result
+
+
+def _already_indexed(cols: tuple, indexes: list) -> bool:
+    # 기존 인덱스가 추천 컬럼으로 시작하면 (같은 순서의 접두어) 이미 충분
+    return any(index[:len(cols)] == cols for index in indexes)
+
+
+def index_ddl(table: str, cols: tuple) -> str:
+    name = "idx_adv_" + table.lower() + "_" + "_".join(c.lower()[:12] for c in cols)
+    return f"CREATE INDEX {name[:64]} ON {table} ({', '.join(cols)})"
+
+
+# --- 실행 ---
+def analyze(engine, viz: AccidentVisualizer, filters: dict, repeat: int):
+    """
+    (쿼리별 결과 목록, 추천 인덱스 목록)을 반환합니다.
+    추천 인덱스는 도움이 되는 쿼리들의 실행 시간 합이 큰 순서입니다.
+    """
+    conditions = viz._compile_filters(filters)
+    entries = collect_queries(viz, filters)
+    with engine.connect() as conn:
+        row_counts = {table: conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+                      for table in ('ACCIDENT', 'DRIVER', 'REGION', viz.WIDE_TABLE)
+                      if inspect(engine).has_table(table)}
+    indexes = existing_indexes(engine)
+
+    results, proposals = [], {}
+    with engine.connect() as conn:
+        for entry in entries:
+            plan = explain(conn, entry['sql'], entry['params'])
+            elapsed_ms = time_query(conn, entry['sql'], entry['params'], repeat)
+            full_scans = [t for t, a in plan['tables'].items() if a['access'] == 'full_scan']
+            index_scans = [t for t, a in plan['tables'].items() if a['access'] == 'index_scan']
+            suggested = []
+            for table, cols in propose_indexes(viz, entry, plan, conditions):
+                if row_counts.get(table, 0) < MIN_TABLE_ROWS or _already_indexed(cols, indexes.get(table, [])):
+                    continue
+                ddl = index_ddl(table, cols)
+                suggested.append(ddl)
+                proposal = proposals.setdefault(ddl, {'ddl': ddl, 'table': table, 'columns': cols,
+                                                      'queries': 0, 'total_ms': 0.0, 'sql': []})
+                proposal['queries'] += 1
+                proposal['total_ms'] += elapsed_ms
+                proposal['sql'].append((entry['sql'], entry['params']))
+            results.append({
+                'pair': f"{entry['pairs'][0][0]} / {entry['pairs'][0][1]}",
+                'pairs': len(entry['pairs']),
+                'ms': round(elapsed_ms, 2),
+                'full_scan': ",".join(full_scans),
+                'index_scan': ",".join(index_scans),
+                'temporary': plan['temporary'],
+                'filesort': plan['filesort'],
+                'keys': ",".join(f"{t}:{a['key']}" for t, a in plan['tables'].items() if a['key']),
+                'suggested': " ; ".join(suggested),
+                'plan': plan['raw'] if engine.dialect.name == 'sqlite' else json.dumps(json.loads(plan['raw'])),
+                'sql': " ".join(entry['sql'].split()),
+            })
+    ranked = sorted(proposals.values(), key=lambda p: p['total_ms'], reverse=True)
+    return results, ranked
+
+
+def verify(engine, proposals: list, top: int, repeat: int, keep: bool):
+    """
+    상위 추천 인덱스를 실제로 만들고, 해당 쿼리들의 실행 시간을 전후 비교합니다. (keep=False면 다시 삭제)
+    """
+    for proposal in proposals[:top]:
+        name = proposal['ddl'].split()[2]
+        with engine.connect() as conn:
+            before = sum(time_query(conn, sql, params, repeat) for sql, params in proposal['sql'])
+        with engine.begin() as conn:
+            started = time.perf_counter()
+            conn.execute(text(proposal['ddl']))
+            build_s = time.perf_counter() - started
+            if engine.dialect.name == 'sqlite':
+                conn.execute(text("ANALYZE"))
+        with engine.connect() as conn:
+            after = sum(time_query(conn, sql, params, repeat) for sql, params in proposal['sql'])
+        print(f"  {proposal['ddl']}\n    생성 {build_s:.1f}초, 쿼리 {proposal['queries']}개 합계 {before:.1f} ms -> {after:.1f} ms")
+        if not keep:
+            with engine.begin() as conn:
+                drop = f"DROP INDEX {name} ON {proposal['table']}" if engine.dialect.name == 'mysql' else f"DROP INDEX {name}"
+                conn.execute(text(drop))
+
+
+def print_report(results: list, proposals: list, dialect: str, top: int):
+    df = pd.DataFrame(results)
+    print(f"\n[{dialect}] 분석한 쿼리 {len(df)}개 (레이블 쌍 {int(df['pairs'].sum())}개)")
+    print(f"  전체 테이블 스캔: {(df['full_scan'] != '').sum()}개")
+    print(f"  인덱스 전체 읽기: {(df['index_scan'] != '').sum()}개")
+    print(f"  임시 테이블(GROUP BY): {df['temporary'].sum()}개, 정렬(filesort/ORDER BY): {df['filesort'].sum()}개")
+    print(f"  실행 시간 p50 {df['ms'].median():.1f} ms, p95 {df['ms'].quantile(0.95):.1f} ms, 합계 {df['ms'].sum() / 1000:.2f}초")
+
+    print("\n가장 느린 쿼리:")
+    slow = df.sort_values('ms', ascending=False).head(top)
+    for row in slow.itertuples():
+        flags = [f for f, on in (('full_scan:' + row.full_scan, row.full_scan), ('temporary', row.temporary),
+                                 ('filesort', row.filesort)) if on]
+        print(f"  {row.ms:9.1f} ms  {row.pair}  [{', '.join(flags) or '-'}]")
+
+    print("\n추천 인덱스 (도움이 되는 쿼리들의 실행 시간 합 기준):")
+    if not proposals:
+        print("  없음")
+    for proposal in proposals[:top]:
+        print(f"  {proposal['ddl']};")
+        print(f"    -- 쿼리 {proposal['queries']}개, 현재 합계 {proposal['total_ms']:.1f} ms")
+
+
+def _parse_filters(raw: str) -> dict:
+    """
+    JSON 조건을 generate_visualization의 filters로 바꿉니다. 범위는 {"from": ..., "to": ...}로 지정합니다.
+    """
+    if not raw:
+        return None
+    filters = {}
+    for label, spec in json.loads(raw).items():
+        filters[label] = (spec.get('from'), spec.get('to')) if isinstance(spec, dict) else spec
+    return filters
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AccidentVisualizer 쿼리 실행 계획 분석 / 인덱스 추천")
+    parser.add_argument('--db-url', default=None,
+                        help="SQLAlchemy DB URL (로컬 MySQL 또는 내장 SQLite, 기본: db_backend 설정)")
+    parser.add_argument('--filters', default=None, help="모든 차트에 적용할 조회 조건 (JSON)")
+    parser.add_argument('--no-wide', action='store_true', help="와이드 팩트 테이블 컬럼 제외")
+    parser.add_argument('--repeat', type=int, default=1, help="쿼리별 실행 시간 측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument('--top', type=int, default=15, help="느린 쿼리/추천 인덱스 표시 개수")
+    parser.add_argument('--verify', type=int, default=0, metavar='N',
+                        help="상위 추천 인덱스 N개를 만들어 전후 실행 시간 비교")
+    parser.add_argument('--keep', action='store_true', help="--verify로 만든 인덱스를 삭제하지 않음")
+    parser.add_argument('--output', default=None, help="쿼리별 실행 계획/시간을 저장할 CSV 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.disable(logging.INFO)
+    # 분석용 쿼리는 전체 스캔이 많으므로 실행 시간 제한 없음
+    engine = create_db_engine(args.db_url or database_url(), statement_timeout_ms=0)
+    try:
+        viz = AccidentVisualizer(engine, use_summary=False, use_cache=False, use_columnar=False,
+                                 use_wide=False if args.no_wide else None)
+        results, proposals = analyze(engine, viz, _parse_filters(args.filters), args.repeat)
+        print_report(results, proposals, engine.dialect.name, args.top)
+        if args.verify:
+            print(f"\n상위 추천 인덱스 {args.verify}개 검증:")
+            verify(engine, proposals, args.verify, args.repeat, args.keep)
+    finally:
+        engine.dispose()
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"실행 계획 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
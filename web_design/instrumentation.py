@@ -0,0 +1,245 @@
+"""
+차트 생성 시간 계측 / 느린 쿼리 로그
+
+AccidentVisualizer가 차트 하나를 만들 때 단계별 시간을 기록합니다.
+- query    : SQL 실행 + 결과 행 수신 (연결 풀 대기, 청크 단위 DataFrame 변환 포함)
+- dataframe: 룩업 코드 -> 한글 레이블
+- data     : 데이터 준비 전체 (query/dataframe + 결과 캐시/사전 집계/인메모리 집계 조회)
+- payload  : Figure -> JSON 직렬화 (generate_visualization_payload만)
+- figure   : plotly Figure 생성 (전체 - data - payload)
+
+완료된 기록은
+- 레이블 쌍별 최근 RECENT_SAMPLES개를 보관하여 p50/p95를 계산하고 (summary)
+- add_hook()으로 등록한 함수에 전달하며
+- 전체 시간이 임계값 이상이면 실행한 SQL과 함께 느린 쿼리 로그(회전 파일)에 JSON 한 줄로 남깁니다.
+  차트 밖에서 실행된 쿼리(대시보드 일괄 집계 등)는 쿼리 하나의 시간으로 같은 기준을 적용합니다.
+
+환경 변수
+  SAFECAR_SLOW_CHART_MS = 느린 차트/쿼리 기준 (밀리초, 기본 1000, 0이면 기록 안 함)
+  SAFECAR_SLOW_LOG_PATH = 로그 파일 경로 (기본 data/logs/slow_query.log, SLOW_LOG_MAX_BYTES x SLOW_LOG_BACKUPS 회전)
+"""
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SLOW_CHART_MS = int(os.environ.get('SAFECAR_SLOW_CHART_MS') or 1000)
+SLOW_LOG_PATH = os.environ.get('SAFECAR_SLOW_LOG_PATH') or os.path.join(PROJECT_ROOT, 'data', 'logs', 'slow_query.log')
+SLOW_LOG_MAX_BYTES = 5 * 1024 * 1024
+SLOW_LOG_BACKUPS = 3
+# 레이블 쌍별로 보관하는 최근 기록 수 (p50/p95 계산용)
+RECENT_SAMPLES = 100
+
+# 같은 파일에 핸들러가 중복으로 붙지 않도록 경로별 로거를 공유 (Streamlit 재실행 대비)
+_slow_loggers = {}
+_slow_loggers_lock = threading.Lock()
+
+
+def _slow_logger(path: str):
+    """
+    느린 쿼리 로그용 로거를 반환합니다. 파일을 만들 수 없으면 None.
+    """
+    with _slow_loggers_lock:
+        if path not in _slow_loggers:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                handler = RotatingFileHandler(path, maxBytes=SLOW_LOG_MAX_BYTES, backupCount=SLOW_LOG_BACKUPS,
+                                              encoding='utf-8')
+            except OSError as e:
+                logging.warning(f"느린 쿼리 로그 파일을 열 수 없어 기록하지 않습니다: {e}")
+                _slow_loggers[path] = None
+            else:
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                logger = logging.getLogger(f"safecar.slow_query.{len(_slow_loggers)}")
+                logger.setLevel(logging.WARNING)
+                logger.propagate = False  # 콘솔(INFO 로그)에는 중복 출력하지 않음
+                logger.addHandler(handler)
+                _slow_loggers[path] = logger
+        return _slow_loggers[path]
+
+
+class ChartTiming:
+    """
+    차트 하나의 단계별 소요 시간(초)과 실행한 쿼리 목록
+    """
+
+    def __init__(self, label1: str, label2: str, conditions: tuple = None):
+        self.label1 = label1
+        self.label2 = label2
+        self.conditions = conditions or ()
+        self.started_at = datetime.datetime.now()
+        self.stages = defaultdict(float)
+        self.queries = []  # {'sql', 'params', 'ms', 'rows'}
+        self.total = 0.0
+        self.ok = True
+        self.cached = False  # 만들어 둔 payload를 그대로 사용
+        self._open = set()
+
+    @property
+    def figure(self) -> float:
+        return max(0.0, self.total - self.stages['data'] - self.stages['payload'])
+
+    def as_dict(self) -> dict:
+        ms = lambda seconds: round(seconds * 1000, 2)
+        return {
+            'label1': self.label1, 'label2': self.label2,
+            'conditions': [list(c) for c in self.conditions],
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'ok': self.ok, 'cached': self.cached,
+            'total_ms': ms(self.total),
+            'data_ms': ms(self.stages['data']),
+            'query_ms': ms(self.stages['query']),
+            'dataframe_ms': ms(self.stages['dataframe']),
+            'figure_ms': ms(self.figure),
+            'payload_ms': ms(self.stages['payload']),
+            'queries': list(self.queries),
+        }
+
+
+class PerformanceMonitor:
+    """
+    AccidentVisualizer의 계측 훅. 현재 차트 기록은 스레드별로 유지하므로
+    대시보드(generate_visualizations)처럼 여러 스레드에서 동시에 차트를 만들어도 섞이지 않습니다.
+    """
+
+    def __init__(self, slow_ms: int = SLOW_CHART_MS, log_path: str = SLOW_LOG_PATH,
+                 recent_samples: int = RECENT_SAMPLES):
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.recent_samples = recent_samples
+        self._local = threading.local()
+        self._recent = {}  # (레이블1, 레이블2) -> deque[ChartTiming]
+        self._lock = threading.Lock()
+        self._hooks = []
+
+    # --- 훅 ---
+    def add_hook(self, hook):
+        """
+        차트가 완료될 때마다 hook(ChartTiming)을 호출합니다. (예외는 로그만 남기고 무시)
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+
+    # --- 계측 ---
+    def current(self):
+        return getattr(self._local, 'record', None)
+
+    @contextmanager
+    def track(self, label1: str, label2: str, conditions: tuple = None):
+        """
+        차트 하나의 계측 구간. 이미 계측 중이면(payload -> generate_visualization) 바깥 기록에 합칩니다.
+        """
+        record = self.current()
+        if record is not None:
+            yield record
+            return
+        record = ChartTiming(label1, label2, conditions)
+        self._local.record = record
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.total = time.perf_counter() - started
+            self._local.record = None
+            self._local.last = record
+            self._finish(record)
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        현재 차트의 단계 시간을 누적합니다. 계측 중인 차트가 없거나 같은 단계 안이면 아무것도 하지 않습니다.
+        """
+        record = self.current()
+        if record is None or name in record._open:
+            yield
+            return
+        record._open.add(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record.stages[name] += time.perf_counter() - started
+            record._open.discard(name)
+
+    def add_query(self, sql: str, params: dict, seconds: float, rows: int):
+        """
+        실행한 쿼리를 현재 차트 기록에 추가합니다. (query 단계 시간 포함)
+        차트 밖에서 실행된 쿼리는 기준 이상일 때만 느린 쿼리 로그에 남깁니다.
+        """
+        entry = {'sql': ' '.join(sql.split()), 'params': params or {}, 'ms': round(seconds * 1000, 2), 'rows': rows}
+        record = self.current()
+        if record is not None:
+            record.stages['query'] += seconds
+            record.queries.append(entry)
+        elif self._is_slow(seconds):
+            self._log_slow(dict(entry, kind='query', started_at=datetime.datetime.now().isoformat(timespec='seconds')))
+
+    def _is_slow(self, seconds: float) -> bool:
+        return bool(self.slow_ms) and seconds * 1000 >= self.slow_ms
+
+    def _finish(self, record: ChartTiming):
+        with self._lock:
+            key = (record.label1, record.label2)
+            if key not in self._recent:
+                self._recent[key] = deque(maxlen=self.recent_samples)
+            self._recent[key].append(record)
+        for hook in list(self._hooks):
+            try:
+                hook(record)
+            except Exception as e:
+                logging.warning(f"계측 훅 실패: {e}")
+        if self._is_slow(record.total):
+            self._log_slow(dict(record.as_dict(), kind='chart'))
+
+    def _log_slow(self, entry: dict):
+        logger = _slow_logger(self.log_path)
+        if logger is not None:
+            # WARNING 수준: 도구들이 logging.disable(logging.INFO)로 INFO 로그를 꺼도 기록되도록
+            logger.warning(json.dumps(entry, ensure_ascii=False, default=str))
+
+    # --- 조회 ---
+    def last(self):
+        """
+        이 스레드에서 마지막으로 완료된 차트 기록 (없으면 None)
+        """
+        return getattr(self._local, 'last', None)
+
+    def recent(self, label1: str, label2: str) -> list:
+        with self._lock:
+            return list(self._recent.get((label1, label2), ()))
+
+    def summary(self) -> pd.DataFrame:
+        """
+        레이블 쌍별 최근 기록의 전체/쿼리/Figure 시간 p50·p95 (밀리초, 전체 p95가 큰 순서)
+        """
+        with self._lock:
+            recent = {key: list(records) for key, records in self._recent.items()}
+        rows = []
+        for (label1, label2), records in recent.items():
+            total = np.array([r.total for r in records]) * 1000
+            query = np.array([r.stages['query'] for r in records]) * 1000
+            figure = np.array([r.figure for r in records]) * 1000
+            rows.append({
+                'label1': label1, 'label2': label2, 'samples': len(records),
+                'errors': sum(not r.ok for r in records), 'cached': sum(r.cached for r in records),
+                'p50_ms': np.percentile(total, 50), 'p95_ms': np.percentile(total, 95),
+                'query_p50_ms': np.percentile(query, 50), 'query_p95_ms': np.percentile(query, 95),
+                'figure_p50_ms': np.percentile(figure, 50),
+                'last_ms': total[-1],
+            })
+        columns = ['label1', 'label2', 'samples', 'errors', 'cached', 'p50_ms', 'p95_ms',
+                   'query_p50_ms', 'query_p95_ms', 'figure_p50_ms', 'last_ms']
+        if not rows:
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame(rows, columns=columns).sort_values('p95_ms', ascending=False).round(1).reset_index(drop=True)
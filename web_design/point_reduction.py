@@ -0,0 +1,129 @@
+"""
+차트 점 개수 축소 (plotly에 넘기기 전 단계)
+
+지역명 x 발생년월 다중 라인 차트나 수치형 x 수치형 버블 차트는 점이 수만 개가 될 수 있고,
+plotly는 모든 점을 브라우저로 직렬화하므로 탭이 멈춥니다. 차트별 점 예산(point budget)을 넘으면
+- 라인: 계열(series)별로 LTTB(Largest-Triangle-Three-Buckets) 다운샘플링 (모양을 유지하는 점만 남김, 계열이 너무 많으면 y 합계가 작은 계열은 제외)
+- 버블: x/y 좌표를 격자 구간으로 묶어 크기(건수)를 합산 (좌표는 크기 가중 평균)
+으로 줄이고, 차트에 축소 사실을 표시합니다.
+"""
+import numpy as np
+import pandas as pd
+
+# 차트 하나에 표시할 최대 점 수 (AccidentVisualizer(point_budget=...)로 변경, 0/None이면 축소 안 함)
+DEFAULT_POINT_BUDGET = 5000
+# LTTB가 남기는 계열별 최소 점 수 (처음/끝 점 + 가운데 1개)
+MIN_SERIES_POINTS = 3
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    LTTB로 남길 점의 위치(오름차순)를 반환합니다. x는 오름차순 수치 배열이어야 합니다.
+    처음/끝 점은 항상 남기고, 가운데는 threshold-2개 구간에서 각각
+    (이전에 고른 점, 다음 구간 평균점)과 만드는 삼각형 넓이가 가장 큰 점을 고릅니다.
+    """
+    n = len(x)
+    if threshold >= n or threshold < MIN_SERIES_POINTS:
+        return np.arange(n)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean() if next_end > end else x[n - 1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[n - 1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def _numeric_axis(values: pd.Series) -> np.ndarray:
+    # 날짜는 정수 시각으로, 변환할 수 없는 값(문자열 등)은 순서 위치로 x 좌표를 만듦
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.float64)
+    return np.arange(len(values), dtype=np.float64)
+
+
+def _even_indices(n: int, count: int) -> np.ndarray:
+    # LTTB 최소 점 수보다 적게 남겨야 할 때: 처음 점부터 고르게 count개
+    return np.unique(np.linspace(0, n - 1, count).round().astype(np.int64))
+
+
+def reduce_lines(df: pd.DataFrame, x: str, y: str, budget: int, series: str = None):
+    """
+    라인 차트 데이터를 점 예산 이하로 줄입니다. series가 있으면 계열별로 예산을 나눠 LTTB를 적용합니다.
+    계열마다 최소 점 수(MIN_SERIES_POINTS)를 남기면 예산을 넘는 경우에는 y 합계가 작은 계열부터 뺍니다.
+    (줄인 DataFrame, 원래 점 수)를 반환합니다. 예산 이내면 그대로 반환합니다.
+    """
+    total = len(df)
+    if not budget or total <= budget:
+        return df, total
+    groups = [df] if series is None else [g for _, g in df.groupby(series, sort=False, dropna=False)]
+    max_series = max(1, budget // MIN_SERIES_POINTS)
+    if len(groups) > max_series:
+        groups = sorted(groups, key=lambda g: g[y].abs().sum(), reverse=True)[:max_series]
+    per_series = budget // len(groups)
+    parts = []
+    for group in groups:
+        group = group.sort_values(x, kind='stable')
+        if per_series < MIN_SERIES_POINTS:
+            keep = _even_indices(len(group), per_series)
+        else:
+            keep = lttb_indices(_numeric_axis(group[x]), group[y].to_numpy(dtype=np.float64), per_series)
+        parts.append(group.iloc[keep])
+    return pd.concat(parts).sort_index(kind='stable'), total
+
+
+def bin_points(df: pd.DataFrame, x: str, y: str, size: str, budget: int):
+    """
+    버블 차트 데이터를 x/y 격자(최대 budget칸)로 묶어 size를 합산합니다.
+    각 칸의 좌표는 size 가중 평균입니다. (줄인 DataFrame, 원래 점 수)를 반환합니다.
+    """
+    total = len(df)
+    if not budget or total <= budget:
+        return df, total
+    side = max(1, int(np.sqrt(budget)))
+    weights = df[size].to_numpy(dtype=np.float64)
+    codes = []
+    for col in (x, y):
+        values = df[col].to_numpy(dtype=np.float64)
+        low, span = np.nanmin(values), np.nanmax(values) - np.nanmin(values)
+        scaled = (values - low) / span * side if span > 0 else np.zeros(len(values))
+        codes.append(np.minimum(scaled.astype(np.int64), side - 1))
+    cell = codes[0] * side + codes[1]
+    binned = pd.DataFrame({
+        'cell': cell,
+        size: weights,
+        'wx': df[x].to_numpy(dtype=np.float64) * weights,
+        'wy': df[y].to_numpy(dtype=np.float64) * weights,
+    }).groupby('cell', sort=True).sum()
+    result = pd.DataFrame({
+        x: (binned['wx'] / binned[size]).round(2).to_numpy(),
+        y: (binned['wy'] / binned[size]).round(2).to_numpy(),
+        size: binned[size].round().astype(np.int64).to_numpy(),
+    })
+    return result, total
+
+
+def mark_reduced(fig, original: int, shown: int, hidden_series: int = 0):
+    """
+    점을 줄였음을 차트에 표시합니다. (우측 상단 주석 + layout.meta에 원래/표시 점 수, 뺀 계열 수 기록)
+    """
+    fig.update_layout(meta={'reduced': True, 'original_points': int(original), 'points': int(shown),
+                            'hidden_series': int(hidden_series)})
+    note = f"점 {original:,}개 → {shown:,}개로 축소하여 표시"
+    if hidden_series:
+        note += f" (작은 계열 {hidden_series:,}개 제외)"
+    fig.add_annotation(text=note,
+                       xref='paper', yref='paper', x=1, y=1.08, xanchor='right',
+                       showarrow=False, font={'size': 11, 'color': 'gray'})
+    return fig
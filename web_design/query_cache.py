@@ -0,0 +1,182 @@
+import pandas as pd
+from sqlalchemy import inspect, text
+from collections import OrderedDict
+import logging
+import re
+import threading
+import time
+
+# 적재 세대(generation) 카운터 테이블: csv_to_db.py가 적재 성공 시마다 1 증가시킵니다.
+GENERATION_TABLE = 'DATA_GENERATION'
+
+
+def read_data_generation(conn):
+    """
+    현재 데이터 세대 번호를 반환합니다. (테이블이 비어 있으면 0)
+    """
+    value = conn.execute(text(f"SELECT Generation FROM {GENERATION_TABLE} WHERE GenerationID = 1")).scalar()
+    return value or 0
+
+
+def bump_data_generation(conn) -> int:
+    """
+    데이터 세대 번호를 1 증가시키고 새 번호를 반환합니다. (csv_to_db.py 적재 성공 후 호출)
+    """
+    updated = conn.execute(text(
+        f"UPDATE {GENERATION_TABLE} SET Generation = Generation + 1, UpdatedAt = CURRENT_TIMESTAMP "
+        "WHERE GenerationID = 1"
+    )).rowcount
+    if not updated:
+        conn.execute(text(
+            f"INSERT INTO {GENERATION_TABLE} (GenerationID, Generation, UpdatedAt) VALUES (1, 1, CURRENT_TIMESTAMP)"
+        ))
+    return read_data_generation(conn)
+
+
+class QueryResultCache:
+    """
+    AccidentVisualizer의 SQL 조회 결과(DataFrame) 캐시.
+
+    - 키: 공백을 정규화한 SQL 텍스트 + 바인드 파라미터
+    - 메모리 크기(DataFrame.memory_usage) 기준 LRU 제거, 항목별 TTL
+    - DATA_GENERATION의 세대 번호가 바뀌면(ETL 적재 완료) 전체 무효화.
+      세대 번호는 매 조회가 아니라 generation_check_seconds 간격으로만 확인합니다.
+    - 여러 Streamlit 세션이 같은 Visualizer를 공유하므로 스레드 안전합니다.
+    """
+
+    def __init__(self, engine, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 600,
+                 generation_check_seconds: float = 5):
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.generation_check_seconds = generation_check_seconds
+        self._entries = OrderedDict()  # key -> (df, bytes, 저장 시각)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._generation = None
+        self._generation_checked_at = 0.0
+        self._generation_available = True
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0,
+                       "invalidations": 0, "uncacheable": 0}
+
+    @staticmethod
+    def make_key(query: str, params: dict = None):
+        normalized = re.sub(r'\s+', ' ', query).strip()
+        return normalized, tuple(sorted((params or {}).items()))
+
+    # --- 세대 확인 ---
+    def _generation_table_missing(self) -> bool:
+        try:
+            return not inspect(self.engine).has_table(GENERATION_TABLE)
+        except Exception:
+            # 테이블 존재 여부도 확인할 수 없으면(연결 오류 등) 일시적인 오류로 취급
+            return False
+
+    def _check_generation(self):
+        """
+        확인 간격이 지났으면 DB의 세대 번호를 읽고, 바뀌었으면 캐시를 비웁니다.
+        세대 테이블이 없는 스키마면 이후 확인하지 않고, 그 외 오류는 다음 확인 간격에 다시 시도합니다.
+        """
+        now = time.monotonic()
+        if not self._generation_available or now - self._generation_checked_at < self.generation_check_seconds:
+            return
+        try:
+            with self.engine.connect() as conn:
+                generation = read_data_generation(conn)
+        except Exception as e:
+            if self._generation_table_missing():
+                # 세대 테이블이 없는 스키마: TTL로만 만료
+                logging.info(f"데이터 세대 테이블을 사용할 수 없어 TTL로만 캐시를 만료합니다: {e}")
+                self._generation_available = False
+            else:
+                logging.warning(f"데이터 세대 확인 실패, {self.generation_check_seconds}초 후 다시 확인합니다: {e}")
+                with self._lock:
+                    self._generation_checked_at = now
+            return
+        with self._lock:
+            self._generation_checked_at = now
+            if self._generation is not None and generation != self._generation:
+                logging.info(f"데이터 세대 변경 ({self._generation} -> {generation}): 조회 캐시를 비웁니다.")
+                self._clear_locked()
+                self._stats["invalidations"] += 1
+            self._generation = generation
+
+    def generation(self):
+        """
+        현재 데이터 세대 번호 (확인 간격마다 DB와 비교, 세대 테이블이 없으면 None)
+        """
+        self._check_generation()
+        return self._generation
+
+    # --- 조회/저장 ---
+    def get(self, key, count_miss: bool = True):
+        """
+        캐시된 DataFrame의 복사본을 반환합니다. 없거나 만료되었으면 None.
+        count_miss=False: 있을 때만 쓰는 선택적 조회 (미적중 통계에서 제외)
+        """
+        self._check_generation()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] > self.ttl_seconds:
+                self._remove_locked(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                if count_miss:
+                    self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            # 호출 측(차트 생성)이 결과를 수정해도 캐시 원본은 유지
+            return entry[0].copy()
+
+    def put(self, key, df: pd.DataFrame):
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            if size > self.max_bytes:
+                self._stats["uncacheable"] += 1
+                return
+            if key in self._entries:
+                self._remove_locked(key)
+            self._entries[key] = (df.copy(), size, time.monotonic())
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self._stats["evictions"] += 1
+
+    def get_or_load(self, query: str, params: dict, loader):
+        """
+        캐시에 있으면 반환하고, 없으면 loader()로 조회하여 저장한 뒤 반환합니다.
+        """
+        key = self.make_key(query, params)
+        df = self.get(key)
+        if df is None:
+            df = loader()
+            self.put(key, df)
+        return df
+
+    # --- 관리 ---
+    def _remove_locked(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _clear_locked(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def clear(self):
+        with self._lock:
+            self._clear_locked()
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        """
+        캐시 크기 조정을 위한 적중/미적중 통계를 반환합니다.
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(self._stats,
+                        hit_ratio=round(self._stats["hits"] / lookups, 4) if lookups else None,
+                        entries=len(self._entries), bytes=self._bytes, max_bytes=self.max_bytes,
+                        generation=self._generation)
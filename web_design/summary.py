@@ -0,0 +1,339 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+from sqlalchemy.engine import Engine
+from sqlalchemy import text, inspect
+from sqlalchemy.types import Integer
+from itertools import combinations
+from web_design.db_backend import read_sql_chunks
+import logging
+
+
+class SummaryCube:
+    """
+    AccidentVisualizer의 모든 범주형/시간형 차원 단일/쌍 조합에 대한
+    사전 집계(건수 + 수치형 컬럼 SUM) 테이블(AGG_PAIR_SUMMARY)을 관리하는 클래스.
+
+    - refresh(): ETL 적재 후 기본 테이블을 한 번 읽어 모든 조합을 집계하고 저장합니다.
+    - aggregate_months() / apply_months(): 증분 적재에서 바뀐 발생년월만 다시 읽어
+      (기존 집계 - 변경 전 월 집계 + 변경 후 월 집계)로 갱신합니다. (모든 측정값이 합계라 가능)
+    - fetch(): 차트 하나에 필요한 집계 결과를 사전 집계 테이블에서 조회합니다.
+      (준비되지 않았거나 지원하지 않는 조합이면 None -> 호출 측에서 기본 테이블로 대체)
+
+    집계 단위는 AccidentVisualizer의 쿼리와 같습니다.
+    DRIVER 차원이 포함된 조합은 ACCIDENT ⋈ DRIVER 행 기준, 그 외는 ACCIDENT 행 기준입니다.
+    """
+
+    SUMMARY_TABLE = 'AGG_PAIR_SUMMARY'
+    STATE_TABLE = 'AGG_SUMMARY_STATE'
+
+    # 사전 집계 대상 차원 (AccidentVisualizer.COLUMN_CONFIG의 범주형/시간형 컬럼)
+    ACCIDENT_DIMENSIONS = [
+        'ACCIDENT.DayNight', 'ACCIDENT.AccidentType', 'ACCIDENT.LawViolationYn',
+        'ACCIDENT.RoadSurfaceState', 'ACCIDENT.WeatherState', 'ACCIDENT.RoadForm',
+        'REGION.RegionName', 'ACCIDENT.OccurYearMonth',
+    ]
+    DRIVER_DIMENSIONS = [
+        'DRIVER.Role', 'DRIVER.VehicleType', 'DRIVER.Gender', 'DRIVER.AgeGroup', 'DRIVER.InjuryLevel',
+    ]
+    # 집계 값 컬럼: '(사고건수)'는 행 수, 나머지는 같은 이름의 ACCIDENT 컬럼 SUM
+    MEASURES = ['DeathCount', 'SevereInjuryCount', 'MinorInjuryCount', 'ReportedInjuryCount']
+    COUNT_MEASURE = '(사고건수)'
+
+    # 정규화 스키마에서 SMALLINT 코드로 저장되는 컬럼 -> 룩업 테이블 (사전 집계에는 레이블로 저장)
+    LOOKUP_TABLES = {
+        'DayNight': 'LK_DAY_NIGHT',
+        'AccidentType': 'LK_ACCIDENT_TYPE',
+        'WeatherState': 'LK_WEATHER_STATE',
+        'RoadSurfaceState': 'LK_ROAD_SURFACE_STATE',
+        'RoadForm': 'LK_ROAD_FORM',
+        'VehicleType': 'LK_VEHICLE_TYPE',
+        'AgeGroup': 'LK_AGE_GROUP',
+        'InjuryLevel': 'LK_INJURY_LEVEL',
+    }
+
+    # refresh 시 기본 테이블을 나눠 읽는 행 수 (최대 메모리 제한)
+    READ_CHUNK_ROWS = 200_000
+
+    KEY_COLUMNS = ['DimPair', 'Value1', 'Value2']
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._tables_missing = False
+
+    # --- 조회 ---
+    @staticmethod
+    def pair_key(dim_vars: list) -> str:
+        """
+        차원 조합의 저장 키 (순서와 무관하게 정렬된 내부 컬럼명을 '|'로 연결)
+        """
+        return '|'.join(sorted(dim_vars))
+
+    def covers(self, dim_vars: list, num_var: str) -> bool:
+        """
+        사전 집계 테이블이 해당 차원 조합/값 컬럼을 포함하는지 여부
+        """
+        dimensions = set(self.ACCIDENT_DIMENSIONS + self.DRIVER_DIMENSIONS)
+        if not 1 <= len(dim_vars) <= 2 or len(set(dim_vars)) != len(dim_vars):
+            return False
+        if not all(var in dimensions for var in dim_vars):
+            return False
+        table, col = num_var.split('.')
+        return table == 'ACCIDENT' and (col == self.COUNT_MEASURE or col in self.MEASURES)
+
+    def is_ready(self) -> bool:
+        """
+        사전 집계가 최신 상태로 채워져 있는지 확인합니다. (ETL 적재 중/실패 후에는 False)
+        """
+        if self._tables_missing:
+            return False
+        try:
+            with self.engine.connect() as conn:
+                state = conn.execute(text(f"SELECT COUNT(*) FROM {self.STATE_TABLE}")).scalar()
+        except Exception as e:
+            # 사전 집계 테이블이 없는 스키마: 이후 조회에서는 확인하지 않음
+            logging.info(f"사전 집계 테이블을 사용할 수 없습니다: {e}")
+            self._tables_missing = True
+            return False
+        return bool(state)
+
+    def fetch(self, dim_vars: list, num_var: str, value_name: str = 'Value',
+              order_by: str = None, descending: bool = False, limit: int = None):
+        """
+        사전 집계 테이블에서 dim_vars별 num_var 집계값을 조회합니다.
+        결과 컬럼명은 기본 테이블 쿼리와 같습니다. (차원 컬럼명 + value_name)
+        사용할 수 없으면 None을 반환합니다.
+
+        order_by: 'value' 또는 정렬 기준 차원의 내부 컬럼명
+        """
+        if not self.covers(dim_vars, num_var) or not self.is_ready():
+            return None
+
+        col = num_var.split('.')[1]
+        measure = 'RowCount' if col == self.COUNT_MEASURE else col
+        canonical = sorted(dim_vars)
+        # 요청 차원 -> 저장 위치(Value1/Value2)
+        slots = {var: f"Value{canonical.index(var) + 1}" for var in dim_vars}
+        select_cols = [f"{slots[var]} AS {var.split('.')[1]}" for var in dim_vars]
+
+        query = (f"SELECT {', '.join(select_cols)}, {measure} AS {value_name} "
+                 f"FROM {self.SUMMARY_TABLE} WHERE DimPair = :pair")
+        if order_by:
+            order_col = value_name if order_by == 'value' else slots[order_by]
+            query += f" ORDER BY {order_col}{' DESC' if descending else ''}"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        logging.info(f"Executing SQL (summary): {query}")
+        with self.engine.connect() as conn:
+            df = pd.read_sql(text(query), conn, params={"pair": self.pair_key(dim_vars)})
+        logging.info(f"Data fetched (summary): {len(df)} rows")
+        return df
+
+    # --- 갱신 (ETL 적재 후) ---
+    def invalidate(self, conn=None):
+        """
+        사전 집계를 사용 불가 상태로 표시합니다. (ETL 적재 시작 시 호출, 테이블이 없으면 무시)
+        """
+        try:
+            if conn is None:
+                with self.engine.begin() as own_conn:
+                    own_conn.execute(text(f"DELETE FROM {self.STATE_TABLE}"))
+            else:
+                conn.execute(text(f"DELETE FROM {self.STATE_TABLE}"))
+        except Exception as e:
+            logging.info(f"사전 집계 무효화 건너뜀: {e}")
+
+    def _detect_lookup_schema(self, conn) -> bool:
+        col_types = {c['name']: c['type'] for c in inspect(conn).get_columns('ACCIDENT')}
+        return isinstance(col_types.get('AccidentType'), Integer)
+
+    def _dimension_sets(self):
+        """
+        (ACCIDENT 행 기준 조합 목록, ACCIDENT ⋈ DRIVER 행 기준 조합 목록)
+        """
+        accident_sets = [(d,) for d in self.ACCIDENT_DIMENSIONS] + list(combinations(self.ACCIDENT_DIMENSIONS, 2))
+        all_dims = self.ACCIDENT_DIMENSIONS + self.DRIVER_DIMENSIONS
+        driver_sets = [(d,) for d in self.DRIVER_DIMENSIONS] + [
+            pair for pair in combinations(all_dims, 2) if any(d in self.DRIVER_DIMENSIONS for d in pair)
+        ]
+        return accident_sets, driver_sets
+
+    def _read_categorical(self, conn, query: str, label_maps: dict, keep_cols: list, params: dict = None):
+        """
+        쿼리 결과를 서버 측 커서로 청크씩 읽으며 차원 컬럼을 category로 줄여 하나의 DF로 합칩니다.
+        """
+        chunks = []
+        for chunk in read_sql_chunks(conn, query, params=params, chunksize=self.READ_CHUNK_ROWS):
+            for col in chunk.columns:
+                if col in keep_cols:
+                    continue
+                name = col.split('__')[1]
+                if name in label_maps:
+                    chunk[col] = chunk[col].map(label_maps[name])
+                chunk[col] = chunk[col].astype('category')
+            chunks.append(chunk)
+        if not chunks:
+            return None
+        frame = pd.DataFrame({
+            col: (union_categoricals([c[col] for c in chunks], ignore_order=True)
+                  if col not in keep_cols else pd.concat([c[col] for c in chunks], ignore_index=True))
+            for col in chunks[0].columns
+        })
+        return frame
+
+    def _group_sums(self, frame: pd.DataFrame, dim_set: tuple) -> pd.DataFrame:
+        keys = [self._alias(var) for var in dim_set]
+        return frame.groupby(keys, dropna=False, observed=True)[['RowCount'] + self.MEASURES].sum()
+
+    @staticmethod
+    def _alias(var: str) -> str:
+        return var.replace('.', '__')
+
+    def _to_records(self, dim_set: tuple, total: pd.DataFrame) -> pd.DataFrame:
+        total = total.reset_index()
+        ordered = sorted(dim_set)
+        out = pd.DataFrame({
+            'DimPair': self.pair_key(list(dim_set)),
+            # pair_key와 같은 정렬 순서로 Value1/Value2에 저장
+            'Value1': total[self._alias(ordered[0])].astype(object),
+            'Value2': total[self._alias(ordered[1])].astype(object) if len(dim_set) == 2 else None,
+        })
+        for col in ['RowCount'] + self.MEASURES:
+            out[col] = total[col].astype('int64')
+        return out
+
+    def _aggregate(self, conn, label_maps: dict, months: list = None) -> list:
+        """
+        ACCIDENT(+REGION)는 한 번만 읽어 메모리에 category로 두고,
+        DRIVER는 필요한 컬럼만 청크로 읽어 AccidentID로 붙여가며 운전자 행 기준 조합을 누적합니다.
+        months가 주어지면 해당 발생년월의 사고(와 그 운전자)만 집계합니다.
+        """
+        accident_sets, driver_sets = self._dimension_sets()
+        measures = ['RowCount'] + self.MEASURES
+
+        where, params = '', {}
+        if months is not None:
+            params = {f"ym{i}": ym for i, ym in enumerate(months)}
+            where = f" WHERE ACCIDENT.OccurYearMonth IN ({', '.join(':' + key for key in params)})"
+
+        select_cols = ["ACCIDENT.AccidentID AS AccidentID"]
+        select_cols += [f"{var} AS {self._alias(var)}" for var in self.ACCIDENT_DIMENSIONS]
+        select_cols += [f"ACCIDENT.{m} AS {m}" for m in self.MEASURES]
+        accident_query = (f"SELECT {', '.join(select_cols)} FROM ACCIDENT "
+                          "JOIN REGION ON ACCIDENT.RegionCode = REGION.RegionCode" + where)
+        accidents = self._read_categorical(conn, accident_query, label_maps, ['AccidentID'] + self.MEASURES, params)
+        if accidents is None:
+            return []
+        accidents['RowCount'] = 1
+        for col in measures:
+            accidents[col] = accidents[col].astype('int64')
+
+        records = [self._to_records(dim_set, self._group_sums(accidents, dim_set)) for dim_set in accident_sets]
+
+        accidents = accidents.set_index('AccidentID')
+        driver_cols = ["DRIVER.AccidentID AS AccidentID"] + [f"{var} AS {self._alias(var)}" for var in self.DRIVER_DIMENSIONS]
+        driver_query = f"SELECT {', '.join(driver_cols)} FROM DRIVER"
+        if where:
+            driver_query += " JOIN ACCIDENT ON ACCIDENT.AccidentID = DRIVER.AccidentID" + where
+        partials = {dim_set: [] for dim_set in driver_sets}
+        for chunk in read_sql_chunks(conn, driver_query, params=params, chunksize=self.READ_CHUNK_ROWS):
+            for var in self.DRIVER_DIMENSIONS:
+                alias, name = self._alias(var), var.split('.')[1]
+                if name in label_maps:
+                    chunk[alias] = chunk[alias].map(label_maps[name])
+            # 운전자 행에 사고 차원/값을 붙임 (INNER JOIN과 같이 사고가 없는 운전자 행은 제외)
+            joined = accidents.reindex(chunk['AccidentID'].to_numpy())
+            present = joined['RowCount'].notna().to_numpy()
+            joined = joined[present].reset_index(drop=True)
+            for var in self.DRIVER_DIMENSIONS:
+                alias = self._alias(var)
+                joined[alias] = chunk[alias].to_numpy()[present]
+                joined[alias] = joined[alias].astype('category')
+            for dim_set in driver_sets:
+                partials[dim_set].append(self._group_sums(joined, dim_set))
+
+        for dim_set, parts in partials.items():
+            if not parts:
+                continue
+            keys = [self._alias(var) for var in dim_set]
+            total = pd.concat(parts).groupby(level=keys, dropna=False, observed=True).sum()
+            records.append(self._to_records(dim_set, total))
+        return records
+
+    def _label_maps(self, conn) -> dict:
+        """
+        정규화 스키마면 {컬럼: {코드: 레이블}}, 아니면 빈 dict
+        """
+        label_maps = {}
+        if self._detect_lookup_schema(conn):
+            for col, table in self.LOOKUP_TABLES.items():
+                lookup_df = pd.read_sql(text(f"SELECT Code, Label FROM {table}"), conn)
+                label_maps[col] = dict(zip(lookup_df['Code'], lookup_df['Label']))
+        return label_maps
+
+    def _summary_frame(self, frames: list) -> pd.DataFrame:
+        """
+        조합별 집계 목록을 저장 형태(값은 문자열 또는 None)의 DF 하나로 합칩니다.
+        """
+        columns = self.KEY_COLUMNS + ['RowCount'] + self.MEASURES
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        summary = pd.concat(frames, ignore_index=True)
+        for col in ('Value1', 'Value2'):
+            summary[col] = summary[col].map(lambda v: None if pd.isna(v) else str(v))
+        return summary[columns]
+
+    def _store(self, summary: pd.DataFrame) -> int:
+        """
+        사전 집계 테이블 전체를 summary로 바꾸고 준비 상태로 표시합니다. 저장한 행 수를 반환합니다.
+        """
+        params = summary.astype(object).where(summary.notna(), None).to_dict('records')
+        columns = self.KEY_COLUMNS + ['RowCount'] + self.MEASURES
+        insert_sql = text(f"INSERT INTO {self.SUMMARY_TABLE} ({', '.join(columns)}) "
+                          f"VALUES ({', '.join(':' + c for c in columns)})")
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM {self.STATE_TABLE}"))
+            conn.execute(text(f"DELETE FROM {self.SUMMARY_TABLE}"))
+            for start in range(0, len(params), 5000):
+                conn.execute(insert_sql, params[start:start + 5000])
+            conn.execute(text(f"INSERT INTO {self.STATE_TABLE} (StateID, RefreshedAt, SummaryRows) "
+                              f"VALUES (1, CURRENT_TIMESTAMP, :rows)"), {"rows": len(params)})
+        self._tables_missing = False
+        logging.info(f"사전 집계 갱신 완료: {summary['DimPair'].nunique()}개 조합, {len(params)}행")
+        return len(params)
+
+    def refresh(self) -> int:
+        """
+        기본 테이블(ACCIDENT/DRIVER/REGION)을 집계 단위별로 한 번씩 읽어
+        모든 단일/쌍 차원 조합의 사전 집계를 다시 만듭니다. 저장한 행 수를 반환합니다.
+        """
+        with self.engine.connect() as conn:
+            frames = self._aggregate(conn, self._label_maps(conn))
+        return self._store(self._summary_frame(frames))
+
+    def aggregate_months(self, months) -> pd.DataFrame:
+        """
+        지정한 발생년월의 사고만으로 모든 조합을 집계합니다. (저장 형태의 DF, 테이블은 바꾸지 않음)
+        증분 적재가 월을 바꾸기 전에 호출해 두었다가 apply_months()에 넘깁니다.
+        """
+        with self.engine.connect() as conn:
+            frames = self._aggregate(conn, self._label_maps(conn), sorted(months))
+        return self._summary_frame(frames)
+
+    def apply_months(self, months, before: pd.DataFrame) -> int:
+        """
+        바뀐 월만 다시 집계해 (현재 사전 집계 - before + 변경 후 월 집계)로 갱신합니다.
+        기본 테이블은 해당 월만 읽고, 사전 집계 테이블은 refresh()와 같이 한 트랜잭션으로 교체합니다.
+        저장한 행 수를 반환합니다.
+        """
+        after = self.aggregate_months(months)
+        measures = ['RowCount'] + self.MEASURES
+        with self.engine.connect() as conn:
+            current = pd.read_sql(text(f"SELECT {', '.join(self.KEY_COLUMNS + measures)} FROM {self.SUMMARY_TABLE}"),
+                                  conn)
+        removed = before.copy()
+        removed[measures] = -removed[measures].astype('int64')
+        combined = pd.concat([current, removed, after], ignore_index=True)
+        summary = (combined.groupby(self.KEY_COLUMNS, dropna=False, sort=False)[measures].sum()
+                   .reset_index())
+        return self._store(summary[summary['RowCount'] > 0])
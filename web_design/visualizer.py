@@ -1,12 +1,90 @@
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
 from sqlalchemy.engine import Engine
-from sqlalchemy import text
+from sqlalchemy import text, inspect
+from sqlalchemy.types import Integer
+from web_design.summary import SummaryCube
+from web_design.query_cache import QueryResultCache
+from web_design.columnar import ColumnarStore
+from web_design.db_backend import pool_stats, read_sql_chunks
+from web_design.point_reduction import DEFAULT_POINT_BUDGET, reduce_lines, bin_points, mark_reduced
+from web_design.instrumentation import PerformanceMonitor
+from web_design.descriptions import description_storage
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from functools import lru_cache
+import base64
 import logging
+import threading
+import time
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 
+# plotly.js typed array 형식이 지원하는 dtype (int64는 없으므로 값 범위에 맞춰 줄이거나 f8로 변환)
+_TYPED_ARRAY_DTYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4', 'f4', 'f8')
+
+
+def _typed_array(values: np.ndarray):
+    """
+    1차원 수치 배열을 plotly.js typed array 형식 {'dtype', 'bdata'(base64)}으로 바꿉니다. (그 외는 None)
+    """
+    if values.ndim != 1 or values.dtype.kind not in 'iuf':
+        return None
+    if values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        low, high = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+        small = np.result_type(np.min_scalar_type(low), np.min_scalar_type(high))
+        values = values.astype(small if small.itemsize <= 4 else np.float64)
+    code = values.dtype.str[1:]
+    if code not in _TYPED_ARRAY_DTYPES:
+        values, code = values.astype(np.float64), 'f8'
+    data = values.astype(np.dtype(code).newbyteorder('<')).tobytes()
+    return {'dtype': code, 'bdata': base64.b64encode(data).decode('ascii')}
+
+
+def _encode_arrays(obj):
+    if isinstance(obj, dict):
+        return {k: _encode_arrays(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_encode_arrays(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return _typed_array(obj) or obj
+    return obj
+
+
+def _decode_arrays(obj):
+    if isinstance(obj, dict):
+        if set(obj) == {'dtype', 'bdata'}:
+            return np.frombuffer(base64.b64decode(obj['bdata']), dtype=np.dtype(obj['dtype']).newbyteorder('<'))
+        return {k: _decode_arrays(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_decode_arrays(v) for v in obj]
+    return obj
+
+
+def figure_to_payload(fig) -> str:
+    """
+    Figure를 세션/캐시에 보관할 간결한 JSON 문자열로 바꿉니다.
+    - 수치 배열은 파이썬 리스트 대신 typed array(base64 바이너리)로 저장
+    - 기본 템플릿은 제외 (Streamlit이 자체 테마 템플릿을 적용)
+    """
+    data = fig.to_plotly_json()
+    data.get('layout', {}).pop('template', None)
+    return pio.to_json(_encode_arrays(data), validate=False)
+
+
+@lru_cache(maxsize=64)
+def figure_from_payload(payload: str) -> go.Figure:
+    """
+    figure_to_payload로 만든 JSON을 Figure로 되돌립니다. (수치 배열은 NumPy 배열로 복원)
+    같은 payload 문자열이면 이전에 만든 Figure를 그대로 반환하므로 Streamlit 재실행 때 다시 만들지 않습니다.
+    반환된 Figure는 공유되므로 수정하지 마세요.
+    """
+    return go.Figure(_decode_arrays(pio.json.from_json_plotly(payload)))
+
 class AccidentVisualizer:
     """
     사고 데이터베이스(traffic_safety 스키마)를 기반으로
@@ -30,6 +108,15 @@ class AccidentVisualizer:
         'DRIVER.Gender': {'type': '범주형', 'label': '운전자 성별'},
         'DRIVER.AgeGroup': {'type': '범주형', 'label': '운전자 연령대'},
         'DRIVER.InjuryLevel': {'type': '범주형', 'label': '운전자 상해정도'},
+        # 와이드 팩트 테이블(ACCIDENT_WIDE)의 가해/피해 운전자별 컬럼 (사고 1건 = 1행, 테이블이 있을 때만 제공)
+        'ACCIDENT_WIDE.OffenderVehicleType': {'type': '범주형', 'label': '가해운전자 차종'},
+        'ACCIDENT_WIDE.OffenderGender': {'type': '범주형', 'label': '가해운전자 성별'},
+        'ACCIDENT_WIDE.OffenderAgeGroup': {'type': '범주형', 'label': '가해운전자 연령대'},
+        'ACCIDENT_WIDE.OffenderInjuryLevel': {'type': '범주형', 'label': '가해운전자 상해정도'},
+        'ACCIDENT_WIDE.VictimVehicleType': {'type': '범주형', 'label': '피해운전자 차종'},
+        'ACCIDENT_WIDE.VictimGender': {'type': '범주형', 'label': '피해운전자 성별'},
+        'ACCIDENT_WIDE.VictimAgeGroup': {'type': '범주형', 'label': '피해운전자 연령대'},
+        'ACCIDENT_WIDE.VictimInjuryLevel': {'type': '범주형', 'label': '피해운전자 상해정도'},
         
         # --- 수치형 (Numerical) ---
         'ACCIDENT.DeathCount': {'type': '수치형', 'label': '사망자수'},
@@ -42,12 +129,97 @@ class AccidentVisualizer:
         'ACCIDENT.OccurYearMonth': {'type': '시간형', 'label': '발생년월'}
     }
 
-    def __init__(self, engine: Engine):
+    # (옵션) 정규화 스키마에서 SMALLINT 코드로 저장되는 컬럼 -> 룩업 테이블
+    LOOKUP_TABLES = {
+        'DayNight': 'LK_DAY_NIGHT',
+        'AccidentType': 'LK_ACCIDENT_TYPE',
+        'WeatherState': 'LK_WEATHER_STATE',
+        'RoadSurfaceState': 'LK_ROAD_SURFACE_STATE',
+        'RoadForm': 'LK_ROAD_FORM',
+        'VehicleType': 'LK_VEHICLE_TYPE',
+        'AgeGroup': 'LK_AGE_GROUP',
+        'InjuryLevel': 'LK_INJURY_LEVEL',
+    }
+
+    # ACCIDENT(+REGION 지역명)과 가해/피해 운전자 속성을 사고 1행에 펼친 와이드 팩트 테이블 (csv_to_db.py가 생성)
+    WIDE_TABLE = 'ACCIDENT_WIDE'
+    WIDE_ROLE_PREFIXES = ('Offender', 'Victim')
+
+    # 건수 집계에 사용하는 내부 컬럼명
+    COUNT_VAR = 'ACCIDENT.(사고건수)'
+    # 일괄 집계(prefetch): 묶은 차원 전체로 한 번 GROUP BY하므로 결과 행 수(차원별 고유 값 수의 곱으로 추정)가
+    # 차트별 쿼리 결과 행 수 합의 MAX_BATCH_ROW_RATIO배와 MAX_BATCH_ROWS를 넘지 않는 요청만 묶습니다.
+    MAX_BATCH_DIMENSIONS = 5
+    MAX_BATCH_ROW_RATIO = 2
+    MAX_BATCH_ROWS = 100_000
+
+    # 조회 조건(filters)으로만 쓰는 컬럼 (차트 축으로는 선택 불가)
+    FILTER_ONLY_CONFIG = {
+        'ACCIDENT.Description': {'type': '텍스트', 'label': '사고내용'},
+    }
+    # 조건 정렬 순서: 같음/IN 조건을 먼저, 범위 조건을 그 뒤에 (복합 인덱스의 선두 컬럼 = 동등 조건, 다음 컬럼 = 범위),
+    # 인덱스를 쓸 수 없는 LIKE 검색은 마지막
+    FILTER_OP_ORDER = {'=': 0, 'IN': 1, 'RANGE': 2, 'LIKE': 3}
+
+    # 렌더링: 점 수가 이 값을 넘는 라인/산점도는 SVG 대신 WebGL(scattergl) 트레이스로 그림
+    WEBGL_POINT_THRESHOLD = 1000
+    # 차트 payload(JSON) 캐시 항목 수
+    PAYLOAD_CACHE_SIZE = 128
+
+    def __init__(self, engine: Engine, use_lookups: bool = None, use_summary: bool = True,
+                 cache: QueryResultCache = None, use_cache: bool = True, use_columnar: bool = False,
+                 use_wide: bool = None, point_budget: int = DEFAULT_POINT_BUDGET, monitor: PerformanceMonitor = None):
+        """
+        use_lookups: 정규화(룩업 코드) 스키마 여부. None이면 ACCIDENT 컬럼 타입으로 자동 감지합니다.
+        use_summary: 사전 집계 테이블(AGG_PAIR_SUMMARY)이 준비되어 있으면 우선 사용할지 여부
+        cache: 조회 결과 캐시 (None이면 기본 설정으로 생성, use_cache=False면 사용 안 함)
+        use_columnar: 기본 테이블을 메모리(NumPy 배열)에 올려 SQL 없이 집계할지 여부 (web_design/columnar.py)
+        use_wide: 가해/피해 운전자 컬럼(ACCIDENT_WIDE) 제공 여부. None이면 테이블에 데이터가 있는지로 자동 감지합니다.
+        point_budget: 라인/버블 차트 하나에 표시할 최대 점 수. 넘으면 줄여서 표시합니다. (0/None이면 축소 안 함)
+        monitor: 차트별 단계 시간 계측/느린 쿼리 로그 (None이면 기본 설정으로 생성, web_design/instrumentation.py)
+        """
         self.engine = engine
+        self.use_wide = self._detect_wide_table() if use_wide is None else use_wide
         # 한글 레이블 -> DB 컬럼명으로 변환하기 위한 역방향 맵 생성
-        self.LABEL_TO_INTERNAL = {v['label']: k for k, v in self.COLUMN_CONFIG.items()}
+        self.LABEL_TO_INTERNAL = {
+            v['label']: k for k, v in self.COLUMN_CONFIG.items()
+            if self.use_wide or not k.startswith(f"{self.WIDE_TABLE}.")
+        }
+        self.use_lookups = self._detect_lookup_schema() if use_lookups is None else use_lookups
+        self._lookup_labels = {}
+        self.summary = SummaryCube(engine) if use_summary else None
+        self.cache = (cache or QueryResultCache(engine)) if use_cache else None
+        self.columnar = ColumnarStore(engine, label_decoder=self._decode_categories) if use_columnar else None
+        self.point_budget = point_budget
+        self.monitor = monitor or PerformanceMonitor()
+        self._payloads = OrderedDict()  # (레이블1, 레이블2, 조건, 데이터 세대) -> (payload, title)
+        self._payload_lock = threading.Lock()
+        self._description_storage = None  # (데이터 세대, description_storage 결과)
         logging.info("AccidentVisualizer가 DB 엔진 및 한글 레이블 맵으로 초기화되었습니다.")
 
+    def _detect_lookup_schema(self) -> bool:
+        """
+        ACCIDENT.AccidentType이 정수형이면 룩업 코드 스키마로 판단합니다.
+        """
+        try:
+            columns = inspect(self.engine).get_columns('ACCIDENT')
+        except Exception as e:
+            logging.warning(f"스키마 감지 실패: {e}. 문자열 컬럼 스키마로 가정합니다.")
+            return False
+        col_types = {c['name']: c['type'] for c in columns}
+        return isinstance(col_types.get('AccidentType'), Integer)
+
+    def _detect_wide_table(self) -> bool:
+        """
+        와이드 팩트 테이블이 있고 채워져 있는지 확인합니다. (적재 전이거나 없는 스키마면 False)
+        """
+        try:
+            with self.engine.connect() as conn:
+                return conn.execute(text(f"SELECT 1 FROM {self.WIDE_TABLE} LIMIT 1")).first() is not None
+        except Exception as e:
+            logging.info(f"와이드 팩트 테이블을 사용할 수 없습니다: {e}")
+            return False
+
     def get_available_columns(self) -> list:
         """
         Streamlit의 selectbox에 사용할 '한글 레이블' 목록을 반환합니다.
@@ -66,44 +238,266 @@ class AccidentVisualizer:
         """
         return self.COLUMN_CONFIG.get(internal_name, {}).get('type', '알 수 없음')
 
-    def _build_query_components(self, var1: str, var2: str, agg_func: str = None):
+    def _source_tables(self, *variables: str):
         """
-        [내부 함수] 두 '내부 컬럼명'을 기반으로 SQL 쿼리 구성요소를 생성합니다.
-        (복잡한 쿼리는 각 차트 함수에서 직접 빌드합니다)
+        [내부 함수] 컬럼들이 필요로 하는 FROM/JOIN 절과 '내부 컬럼명 -> SQL 컬럼' 변환 함수를 반환합니다.
+        와이드 팩트 테이블 컬럼이 포함되면 ACCIDENT/REGION 컬럼도 ACCIDENT_WIDE에서 읽어 JOIN을 없앱니다.
         """
-        table1, col1 = var1.split('.')
-        table2, col2 = var2.split('.')
-        
-        tables_needed = set(['ACCIDENT', table1, table2])
-        
-        from_clause = "FROM ACCIDENT"
+        tables_needed = set(['ACCIDENT'] + [var.split('.')[0] for var in variables])
+        fact = self.WIDE_TABLE if self.WIDE_TABLE in tables_needed else 'ACCIDENT'
+
+        from_clause = f"FROM {fact}"
         join_clause = ""
         if 'DRIVER' in tables_needed:
-            join_clause += " JOIN DRIVER ON ACCIDENT.AccidentID = DRIVER.AccidentID"
-        if 'REGION' in tables_needed:
+            join_clause += f" JOIN DRIVER ON {fact}.AccidentID = DRIVER.AccidentID"
+        if 'REGION' in tables_needed and fact == 'ACCIDENT':
             join_clause += " JOIN REGION ON ACCIDENT.RegionCode = REGION.RegionCode"
+
+        def column(var: str) -> str:
+            table, col = var.split('.')
+            if col == '(사고건수)':
+                return f"{fact}.AccidentID"
+            if table in ('ACCIDENT', 'REGION'):
+                table = fact if fact == self.WIDE_TABLE else table
+            return f"{table}.{col}"
+        return from_clause, join_clause, column
+
+    def _build_query_components(self, var1: str, var2: str, agg_func: str = None, conditions: tuple = None):
+        """
+        [내부 함수] 두 '내부 컬럼명'을 기반으로 SQL 쿼리 구성요소를 생성합니다.
+        (복잡한 쿼리는 각 차트 함수에서 직접 빌드합니다)
+        조회 조건은 WHERE 절과 바인드 파라미터로 함께 반환합니다.
+        """
+        col2 = var2.split('.')[1]
+        from_clause, join_clause, where_clause, params, column = self._query_parts([var1, var2], conditions)
             
         if agg_func:
             if col2 == '(사고건수)':
-                select_col2 = "COUNT(ACCIDENT.AccidentID)"
+                select_col2 = f"COUNT({column(var2)})"
             else:
-                # `col2`가 실제 컬럼명인지 확인 (예: 'DeathCount')
-                safe_col2 = col2.replace("(", "").replace(")", "") # (사고건수) 방지
-                select_col2 = f"{agg_func}({table2}.{safe_col2})"
+                select_col2 = f"{agg_func}({column(var2)})"
                 
-            select_clause = f"SELECT {table1}.{col1}, {select_col2} AS Value"
-            group_by_clause = f"GROUP BY {table1}.{col1}"
-            order_by_clause = f"ORDER BY {table1}.{col1}"
+            select_clause = f"SELECT {column(var1)}, {select_col2} AS Value"
+            group_by_clause = f"GROUP BY {column(var1)}"
+            order_by_clause = f"ORDER BY {column(var1)}"
         else:
-            select_clause = f"SELECT {table1}.{col1}, {table2}.{col2}"
+            select_clause = f"SELECT {column(var1)}, {column(var2)}"
             group_by_clause = ""
             order_by_clause = ""
             
-        return select_clause, from_clause, join_clause, group_by_clause, order_by_clause
+        return select_clause, from_clause, join_clause, where_clause, group_by_clause, order_by_clause, params
+
+    # --- 조회 조건 (WHERE) ---
+    def get_filter_columns(self) -> list:
+        """
+        조회 조건으로 사용할 수 있는 '한글 레이블' 목록 (사고 단위 컬럼 + 사고내용)
+        사고내용을 검색할 수 없는 DB(미적재, 압축 저장)면 사고내용은 빠집니다.
+        """
+        labels = [label for label, var in self.LABEL_TO_INTERNAL.items()
+                  if not var.startswith('DRIVER.') and var != self.COUNT_VAR]
+        return sorted(labels) + [v['label'] for var, v in self.FILTER_ONLY_CONFIG.items()
+                                 if self._filter_unavailable_reason(var) is None]
+
+    def get_filter_options(self, label: str) -> list:
+        """
+        조회 조건 선택 상자에 표시할 컬럼 값 목록 (오름차순, 룩업 코드 스키마면 한글 레이블)
+        """
+        var = self._filter_var(label)
+        if var in self.FILTER_ONLY_CONFIG:
+            reason = self._filter_unavailable_reason(var)
+            if reason:
+                raise ValueError(reason)
+            return []  # 자유 입력 (사고내용 검색어)
+        col = var.split('.')[1]
+        if var.startswith('REGION.'):
+            query = f"SELECT DISTINCT {col} FROM REGION ORDER BY {col}"
+        else:
+            from_clause, _, column = self._source_tables(var)
+            query = f"SELECT DISTINCT {column(var)} {from_clause} ORDER BY {column(var)}"
+        return [v for v in self._fetch_data(query).iloc[:, 0].tolist() if v is not None]
 
-    def generate_visualization(self, label1: str, label2: str):
+    def _filter_var(self, label: str) -> str:
+        var = self._get_internal_name(label) or next(
+            (k for k, v in self.FILTER_ONLY_CONFIG.items() if v['label'] == label), None)
+        if var is None:
+            raise ValueError(f"알 수 없는 조건 변수: {label}")
+        if var.startswith('DRIVER.') or var == self.COUNT_VAR:
+            # 운전자 행 조건은 사고 건수 기준 집계를 바꾸므로 지원하지 않음 (가해/피해 운전자 컬럼은 사용 가능)
+            raise ValueError(f"조건으로 사용할 수 없는 변수입니다: {label}")
+        return var
+
+    def _filter_value(self, var: str, value):
+        """
+        [내부 함수] 조건 값을 컬럼 타입에 맞춥니다. (문자열 컬럼에 숫자를 비교하면 MySQL이 인덱스를 쓰지 못함)
+        - 발생년월: 'YYYYMM' 문자열 ('2022-01', 202201, 날짜 모두 허용)
+        - 수치형: 정수
+        - 룩업 코드 스키마의 범주형: 한글 레이블 -> 코드
+        """
+        col = var.split('.')[1]
+        base_col = next((col[len(p):] for p in self.WIDE_ROLE_PREFIXES if col.startswith(p)), col)
+        var_type = self._get_column_type(var)
+        if var_type == '시간형':
+            if hasattr(value, 'strftime'):
+                return value.strftime('%Y%m')
+            digits = ''.join(ch for ch in str(value) if ch.isdigit())
+            if len(digits) != 6:
+                raise ValueError(f"발생년월 조건은 YYYYMM 형식이어야 합니다: {value}")
+            return digits
+        if var_type == '수치형':
+            return int(value)
+        if self.use_lookups and base_col in self.LOOKUP_TABLES:
+            codes = {label: code for code, label in self._get_lookup_labels(self.LOOKUP_TABLES[base_col]).items()}
+            if value not in codes:
+                raise ValueError(f"'{self.COLUMN_CONFIG[var]['label']}'에 없는 값입니다: {value}")
+            return codes[value]
+        return str(value)
+
+    def _compile_filters(self, filters: dict) -> tuple:
+        """
+        [내부 함수] {'한글 레이블': 조건} 을 정렬된 (내부 컬럼명, 연산, 값) 튜플로 바꿉니다. (캐시 키로도 사용)
+        """
+        conditions = []
+        for label, spec in (filters or {}).items():
+            if spec is None:
+                continue
+            var = self._filter_var(label)
+            if var in self.FILTER_ONLY_CONFIG:
+                reason = self._filter_unavailable_reason(var)
+                if reason:
+                    raise ValueError(reason)
+                conditions.append((var, 'LIKE', str(spec)))
+            elif isinstance(spec, tuple) and len(spec) == 2 and self._get_column_type(var) in ('시간형', '수치형'):
+                low, high = (None if v is None else self._filter_value(var, v) for v in spec)
+                if low is None and high is None:
+                    continue
+                conditions.append((var, 'RANGE', (low, high)))
+            elif isinstance(spec, (list, tuple, set, frozenset)):
+                values = tuple(sorted(set(self._filter_value(var, v) for v in spec)))
+                if not values:
+                    raise ValueError(f"'{label}' 조건의 값 목록이 비어 있습니다.")
+                conditions.append((var, '=', values[0]) if len(values) == 1 else (var, 'IN', values))
+            else:
+                conditions.append((var, '=', self._filter_value(var, spec)))
+        return tuple(sorted(conditions, key=lambda c: (self.FILTER_OP_ORDER[c[1]], c[0])))
+
+    @staticmethod
+    def _condition_vars(conditions: tuple) -> list:
+        """
+        [내부 함수] 조건 때문에 FROM/JOIN에 필요한 컬럼 (지역명/사고내용은 하위 쿼리로 걸러 JOIN 불필요)
+        """
+        return [var for var, _, _ in conditions or () if var.split('.')[0] in ('ACCIDENT', 'ACCIDENT_WIDE')
+                and var != 'ACCIDENT.Description']
+
+    def _where_clause(self, conditions: tuple, column, fact: str):
+        """
+        [내부 함수] 조건을 바인드 파라미터를 쓰는 WHERE 절과 파라미터 dict로 만듭니다.
+        - 컬럼에 함수를 씌우지 않는 형태(=, IN, BETWEEN, >=, <=)로만 비교하여 인덱스 범위 탐색이 가능하도록 합니다.
+        - 지역명은 ACCIDENT.RegionCode IN (SELECT ... FROM REGION ...)으로 바꿔 idx_accident_region을 사용합니다.
+        """
+        if not conditions:
+            return "", {}
+        predicates, params = [], {}
+        for i, (var, op, value) in enumerate(conditions):
+            name = f"f{i}"
+            if var == 'ACCIDENT.Description':
+                sql_col = None  # 저장 위치에 따라 _description_predicate가 정함
+            elif var == 'REGION.RegionName' and fact == 'ACCIDENT':
+                sql_col = 'REGION.RegionName'
+            else:
+                sql_col = column(var)
+            if op == '=':
+                predicate = f"{sql_col} = :{name}"
+                params[name] = value
+            elif op == 'IN':
+                names = [f"{name}_{j}" for j in range(len(value))]
+                predicate = f"{sql_col} IN ({', '.join(':' + n for n in names)})"
+                params.update(zip(names, value))
+            elif op == 'RANGE':
+                low, high = value
+                if low is not None and high is not None:
+                    predicate = f"{sql_col} BETWEEN :{name}_lo AND :{name}_hi"
+                    params.update({f"{name}_lo": low, f"{name}_hi": high})
+                elif low is not None:
+                    predicate = f"{sql_col} >= :{name}_lo"
+                    params[f"{name}_lo"] = low
+                else:
+                    predicate = f"{sql_col} <= :{name}_hi"
+                    params[f"{name}_hi"] = high
+            else:  # LIKE: 부분 문자열 검색 (와일드카드 문자는 이스케이프)
+                escaped = value.replace('!', '!!').replace('%', '!%').replace('_', '!_')
+                params[name] = f"%{escaped}%"
+                if var == 'ACCIDENT.Description':
+                    predicate = self._description_predicate(name, fact)
+                else:
+                    predicate = f"{sql_col} LIKE :{name} ESCAPE '!'"
+
+            if sql_col == 'REGION.RegionName':
+                predicate = f"ACCIDENT.RegionCode IN (SELECT RegionCode FROM REGION WHERE {predicate})"
+            predicates.append(predicate)
+        return "WHERE " + " AND ".join(predicates), params
+
+    def _get_description_storage(self) -> dict:
+        """
+        [내부 함수] 사고내용 저장 위치 (web_design/descriptions.py), 데이터 세대가 바뀔 때만 다시 확인합니다.
+        """
+        generation = self.cache.generation() if self.cache is not None else None
+        if self._description_storage is None or self._description_storage[0] != generation:
+            with self.engine.connect() as conn:
+                self._description_storage = (generation, description_storage(conn))
+        return self._description_storage[1]
+
+    def _filter_unavailable_reason(self, var: str):
+        """
+        [내부 함수] 자유 입력 조건(사고내용)을 쓸 수 없는 이유, 쓸 수 있으면 None
+        """
+        if var != 'ACCIDENT.Description':
+            return None
+        storage = self._get_description_storage()
+        if storage['compressed']:
+            # 압축 본문은 DB에서 LIKE로 비교할 수 없음 (일부만 검색되는 결과를 보여주지 않도록 전체 거부)
+            return "사고내용이 압축(--description-codec mysql_compress)되어 저장되어 있어 검색할 수 없습니다."
+        if not (storage['inline'] or storage['side']):
+            return "사고내용이 적재되어 있지 않아 검색할 수 없습니다."
+        return None
+
+    def _description_predicate(self, name: str, fact: str) -> str:
+        """
+        [내부 함수] 사고내용 검색 조건. --description-table로 적재했으면 사이드 테이블을 EXISTS로 검색하고,
+        ACCIDENT.Description 컬럼이 남아 있으면 함께 검색합니다. (적재 방식을 바꿔 가며 증분 적재한 경우)
+        """
+        storage = self._get_description_storage()
+        like = f"LIKE :{name} ESCAPE '!'"
+        parts = []
+        if storage['inline']:
+            parts.append(f"ACCIDENT.Description {like}" if fact == 'ACCIDENT' else
+                         f"{fact}.AccidentID IN (SELECT AccidentID FROM ACCIDENT WHERE Description {like})")
+        if storage['side']:
+            # 본문은 BLOB이므로 문자열로 바꿔 비교 (SQLite는 BLOB에 LIKE가 일치하지 않고, MySQL은 바이너리 비교가 됨)
+            body = "CAST(t.Body AS TEXT)" if self.engine.dialect.name == 'sqlite' else "CONVERT(t.Body USING utf8mb4)"
+            parts.append("EXISTS (SELECT 1 FROM ACCIDENT_DESCRIPTION d "
+                         "JOIN DESCRIPTION_TEXT t ON t.DescriptionID = d.DescriptionID "
+                         f"WHERE d.AccidentID = {fact}.AccidentID AND {body} {like})")
+        return parts[0] if len(parts) == 1 else f"({' OR '.join(parts)})"
+
+    def _query_parts(self, variables: list, conditions: tuple):
+        """
+        [내부 함수] _source_tables에 조건 컬럼까지 반영하여 (FROM, JOIN, WHERE, 파라미터, 컬럼 변환 함수)를 반환합니다.
+        """
+        from_clause, join_clause, column = self._source_tables(*variables, *self._condition_vars(conditions))
+        where_clause, params = self._where_clause(conditions, column, from_clause.split()[1])
+        return from_clause, join_clause, where_clause, params, column
+
+    def generate_visualization(self, label1: str, label2: str, filters: dict = None):
         """
         [메인 함수] 두 개의 '한글 레이블'을 입력받아 적절한 시각화 차트를 생성합니다.
+
+        filters: {'한글 레이블': 조건} 조회 조건 (모두 AND, 값은 바인드 파라미터로 전달)
+          - 값 1개: 같음                     예) {'주야': '주간'}
+          - list/set: IN 목록                예) {'기상상태': ['비', '눈']}
+          - (시작, 끝) 튜플: 시간형/수치형 범위 (양 끝 포함, None이면 열린 구간)
+                                             예) {'발생년월': ('202201', '202206'), '사망자수': (1, None)}
+          - '사고내용': 포함 문자열 검색      예) {'사고내용': '중앙선'}
+        조건이 있으면 사전 집계/인메모리 집계 대신 기본 테이블에 조건을 건 쿼리로 집계합니다.
         """
         # 1. 한글 레이블 -> 내부 DB 컬럼명으로 변환
         var1 = self._get_internal_name(label1)
@@ -118,40 +512,55 @@ class AccidentVisualizer:
         
         logging.info(f"시각화 생성 시작: {label1}({type1}) vs {label2}({type2})")
 
+        try:
+            conditions = self._compile_filters(filters)
+        except ValueError as e:
+            return None, f"조회 조건 오류: {e}"
+
+        with self.monitor.track(label1, label2, conditions) as timing:
+            fig, title = self._build_chart(var1, var2, type1, type2, label1, label2, conditions)
+            timing.ok = fig is not None
+        return fig, title
+
+    def _build_chart(self, var1: str, var2: str, type1: str, type2: str, label1: str, label2: str,
+                     conditions: tuple = None):
+        """
+        [내부 함수] 두 컬럼의 유형 조합에 맞는 차트를 만듭니다. 오류는 (None, 메시지)로 반환합니다.
+        """
         try:
             # Case 1: 범주형 vs 수치형 -> 수직 막대 차트
             if (type1 == '범주형' and type2 == '수치형'):
-                return self._create_bar_chart(var1, var2, label1, label2)
+                return self._create_bar_chart(var1, var2, label1, label2, conditions)
             if (type1 == '수치형' and type2 == '범주형'):
-                return self._create_bar_chart(var2, var1, label2, label1) # 순서 변경
+                return self._create_bar_chart(var2, var1, label2, label1, conditions) # 순서 변경
 
             # Case 2: 시간형 vs 수치형 -> 라인 차트
             if (type1 == '시간형' and type2 == '수치형'):
-                return self._create_line_chart(var1, var2, label1, label2)
+                return self._create_line_chart(var1, var2, label1, label2, conditions)
             if (type1 == '수치형' and type2 == '시간형'):
-                return self._create_line_chart(var2, var1, label2, label1) # 순서 변경
+                return self._create_line_chart(var2, var1, label2, label1, conditions) # 순서 변경
 
             # Case 3: 범주형 vs 범주형 -> 그룹형 막대 차트
             if (type1 == '범주형' and type2 == '범주형'):
                 num_label = '사고건수'
                 num_var = self._get_internal_name(num_label)
-                return self._create_grouped_bar_chart(var1, var2, num_var, label1, label2, num_label)
+                return self._create_grouped_bar_chart(var1, var2, num_var, label1, label2, num_label, conditions)
 
             # Case 4: 수치형 vs 수치형 -> 버블 차트 (수정됨)
             if (type1 == '수치형' and type2 == '수치형'):
                 if '사고건수' in [label1, label2]:
                     return None, "이 시각화는 '사고건수'를 지원하지 않습니다."
-                return self._create_bubble_chart(var1, var2, label1, label2)
+                return self._create_bubble_chart(var1, var2, label1, label2, conditions)
 
             # Case 5: 시간형 vs 범주형 -> 다중 라인 차트
             if (type1 == '시간형' and type2 == '범주형'):
                 num_label = '사고건수'
                 num_var = self._get_internal_name(num_label)
-                return self._create_multi_line_chart(var1, var2, num_var, label1, label2, num_label)
+                return self._create_multi_line_chart(var1, var2, num_var, label1, label2, num_label, conditions)
             if (type1 == '범주형' and type2 == '시간형'):
                 num_label = '사고건수'
                 num_var = self._get_internal_name(num_label)
-                return self._create_multi_line_chart(var2, var1, num_var, label2, label1, num_label) # 순서 변경
+                return self._create_multi_line_chart(var2, var1, num_var, label2, label1, num_label, conditions) # 순서 변경
 
             return None, "선택된 조합에 대한 시각화를 생성할 수 없습니다."
 
@@ -159,22 +568,370 @@ class AccidentVisualizer:
             logging.error(f"시각화 생성 중 오류: {e}")
             return None, f"차트 생성 중 오류가 발생했습니다: {e}"
 
-    def _fetch_data(self, query: str) -> pd.DataFrame:
+    def generate_visualizations(self, pairs: list, max_workers: int = 4, batch: bool = True, filters: dict = None):
+        """
+        [대시보드 함수] 여러 (레이블1, 레이블2) 쌍의 차트를 스레드 풀에서 동시에 생성합니다.
+        완료되는 순서대로 (레이블1, 레이블2, fig, title)을 yield 하므로 화면에 바로바로 표시할 수 있습니다.
+        전체 소요 시간은 각 쿼리 시간의 합이 아니라 가장 느린 쿼리에 가까워집니다.
+
+        동시 실행 수는 max_workers와 엔진 연결 풀 크기 중 작은 값으로 제한합니다. (풀 대기 방지)
+        batch=True면 같은 테이블을 읽는 차트들을 먼저 prefetch()로 묶어 한 번에 집계합니다. (조건이 없을 때만)
+        filters: 모든 차트에 적용할 조회 조건 (generate_visualization 참고)
+        """
+        pairs = list(dict.fromkeys(tuple(pair) for pair in pairs))  # 중복 제거 (순서 유지)
+        if not pairs:
+            return
+        if batch and not filters:
+            try:
+                self.prefetch(pairs)
+            except Exception as e:
+                logging.warning(f"일괄 집계 실패: {e}. 차트별로 조회합니다.")
+        pool_size = getattr(self.engine.pool, 'size', None)
+        workers = max(1, min(max_workers, len(pairs), pool_size() if callable(pool_size) else max_workers))
+        logging.info(f"대시보드 차트 {len(pairs)}개 동시 생성 (workers={workers})")
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='viz')
+        try:
+            futures = {executor.submit(self.generate_visualization, label1, label2, filters): (label1, label2)
+                       for label1, label2 in pairs}
+            for future in as_completed(futures):
+                label1, label2 = futures[future]
+                fig, title = future.result()  # generate_visualization은 오류를 (None, 메시지)로 반환
+                yield label1, label2, fig, title
+        finally:
+            # 호출 측이 중간에 중단하면 아직 시작하지 않은 차트는 취소
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # --- 일괄 집계 (여러 차트를 한 번의 스캔으로) ---
+    def _aggregate_request(self, label1: str, label2: str):
+        """
+        [내부 함수] generate_visualization이 그릴 차트의 집계 요청 (차원 컬럼 튜플, 값 컬럼)을 반환합니다.
+        집계 차트가 아니면 None. (차트 종류 판단은 generate_visualization과 같음)
+        """
+        var1, var2 = self._get_internal_name(label1), self._get_internal_name(label2)
+        if not var1 or not var2 or var1 == var2:
+            return None
+        types = (self._get_column_type(var1), self._get_column_type(var2))
+        if types == ('범주형', '수치형') or types == ('시간형', '수치형'):
+            return (var1,), var2
+        if types == ('수치형', '범주형') or types == ('수치형', '시간형'):
+            return (var2,), var1
+        if types == ('범주형', '범주형'):
+            return (var1, var2), self.COUNT_VAR
+        if types == ('수치형', '수치형') and '사고건수' not in (label1, label2):
+            return (var1, var2), self.COUNT_VAR
+        if types == ('시간형', '범주형'):
+            return (var1, var2), self.COUNT_VAR
+        if types == ('범주형', '시간형'):
+            return (var2, var1), self.COUNT_VAR
+        return None
+
+    @staticmethod
+    def _batch_key(dim_vars, num_var: str) -> tuple:
+        return ('batch', tuple(dim_vars), num_var)
+
+    def _dimension_cardinality(self, var: str) -> int:
+        """
+        [내부 함수] 차원 컬럼의 고유 값 수 (NULL 포함). 결과 캐시를 거치므로 데이터 세대마다 한 번만 셉니다.
+        """
+        table, col = var.split('.')
+        query = (f"SELECT COUNT(DISTINCT {col}) + MAX(CASE WHEN {col} IS NULL THEN 1 ELSE 0 END) AS Value "
+                 f"FROM {table}")
+        value = self._fetch_data(query).iloc[0, 0]
+        return 0 if pd.isna(value) else int(value)
+
+    def _pack_batches(self, requests: list, cardinality: dict) -> list:
+        """
+        [내부 함수] 모든 차원으로 한 번 GROUP BY한 결과가 차트별 쿼리 결과보다 크게 늘지 않도록 요청을 묶습니다.
+        cardinality: 차원 내부 컬럼명 -> 고유 값 수. 묶은 결과 행 수는 차원 합집합의 고유 값 수 곱으로 추정하며,
+        같은 차원(또는 그 부분집합)을 쓰는 요청끼리만 묶이는 것이 보통입니다.
+        """
+        def rows(dims) -> int:
+            return int(np.prod([max(cardinality[var], 1) for var in dims], dtype=np.float64))
+
+        batches = []
+        for request in requests:
+            for batch in batches:
+                dims = set(request[0]).union(*(set(d) for d, _ in batch))
+                separate = sum(rows(d) for d, _ in batch) + rows(request[0])
+                if (len(dims) <= self.MAX_BATCH_DIMENSIONS
+                        and rows(dims) <= min(self.MAX_BATCH_ROWS, self.MAX_BATCH_ROW_RATIO * separate)):
+                    batch.append(request)
+                    break
+            else:
+                batches.append([request])
+        return batches
+
+    def _run_batch(self, requests: list) -> dict:
+        """
+        [내부 함수] FROM/JOIN이 같은 집계 요청들을 쿼리 하나로 계산하고 {(차원, 값 컬럼): DataFrame}으로 나눕니다.
+        모든 차원으로 한 번 GROUP BY한 뒤 요청별 차원으로 다시 합산합니다. (COUNT/SUM은 재집계 가능)
+        GROUP BY 결과는 청크 단위로 읽어 청크마다 요청별 부분합을 구하므로 전체를 메모리에 두지 않습니다.
+        """
+        from_clause, join_clause, column = self._source_tables(*[v for dims, num in requests for v in dims + (num,)])
+        dims_all = list(dict.fromkeys(v for dims, _ in requests for v in dims))
+        dim_alias = {var: f"D{i}" for i, var in enumerate(dims_all)}
+        measure_alias = {}
+        select = []
+        for _, num in requests:
+            if num not in measure_alias:
+                col = num.split('.')[1]
+                measure_alias[num] = 'M_RowCount' if col == '(사고건수)' else f"M_{col}"
+                agg = 'COUNT' if col == '(사고건수)' else 'SUM'
+                select.append(f"{agg}({column(num)}) AS {measure_alias[num]}")
+        select = [f"{column(var)} AS {dim_alias[var]}" for var in dims_all] + select
+
+        group_by_clause = f"GROUP BY {', '.join(column(var) for var in dims_all)}"
+        query = f"SELECT {', '.join(select)} {from_clause} {join_clause} {group_by_clause}"
+
+        partials = {request: [] for request in requests}
+        for chunk in self._query_chunks(query, decode=False):
+            for dims, num_var in requests:
+                keys = [dim_alias[var] for var in dims]
+                partials[(dims, num_var)].append(
+                    chunk.groupby(keys, dropna=False, sort=False)[measure_alias[num_var]].sum())
+
+        frames = {}
+        for (dims, num_var), parts in partials.items():
+            keys = [dim_alias[var] for var in dims]
+            part = pd.concat(parts).groupby(level=keys, dropna=False, sort=False).sum().reset_index()
+            frame = part.rename(columns={dim_alias[var]: var.split('.')[1] for var in dims})
+            frame = frame.rename(columns={measure_alias[num_var]: 'Value'})
+            if self.use_lookups:
+                frame = self._decode_lookups(frame)
+            frame = frame.sort_values(list(frame.columns[:-1]), na_position='first', kind='stable')
+            frames[(dims, num_var)] = frame.reset_index(drop=True)
+        return frames
+
+    def _batch_covered(self, dim_vars, num_var: str) -> bool:
+        """
+        [내부 함수] 인메모리 집계/사전 집계/캐시로 이미 빠르게 구할 수 있는 요청인지 여부
+        """
+        if self.columnar is not None and self.columnar.covers(list(dim_vars), num_var):
+            return True
+        if self.summary is not None and self.summary.covers(list(dim_vars), num_var) and self.summary.is_ready():
+            return True
+        return self.cache.get(self._batch_key(dim_vars, num_var), count_miss=False) is not None
+
+    def prefetch(self, pairs: list) -> int:
+        """
+        여러 (레이블1, 레이블2) 쌍의 집계를 FROM/JOIN이 같은 것끼리 묶어 쿼리 하나(테이블 스캔 한 번)로 계산하고,
+        차트별 DataFrame으로 나눠 결과 캐시에 넣습니다. 이후 generate_visualization은 캐시된 결과를 사용합니다.
+        일괄 계산한 차트 수를 반환합니다. (결과 캐시를 사용하지 않으면 아무것도 하지 않음)
+
+        JOIN이 필요한 차트만 묶습니다. JOIN 없는 단일 컬럼 GROUP BY는 인덱스만 읽으므로 차트별 쿼리가 더 빠릅니다.
+        묶는 기준은 _pack_batches를 참고하세요.
+        """
+        if self.cache is None:
+            return 0
+        requests = []
+        for label1, label2 in pairs:
+            request = self._aggregate_request(label1, label2)
+            if request and request not in requests and not self._batch_covered(*request):
+                requests.append(request)
+
+        groups = {}
+        for dims, num_var in requests:
+            from_clause, join_clause, _ = self._source_tables(*dims, num_var)
+            groups.setdefault((from_clause, join_clause), []).append((dims, num_var))
+
+        prefetched = 0
+        for (_, join_clause), group in groups.items():
+            if not join_clause or len(group) < 2:
+                continue
+            cardinality = {var: self._dimension_cardinality(var) for dims, _ in group for var in dims}
+            for batch in self._pack_batches(group, cardinality):
+                if len(batch) < 2:
+                    continue  # 한 차트뿐이면 기존 쿼리가 더 단순
+                for (dims, num_var), frame in self._run_batch(batch).items():
+                    self.cache.put(self._batch_key(dims, num_var), frame)
+                prefetched += len(batch)
+                logging.info(f"일괄 집계: 차트 {len(batch)}개를 쿼리 1개로 계산")
+        return prefetched
+
+    def _fetch_batched(self, dim_vars: list, num_var: str, value_name: str = 'Value',
+                       order_by: str = None, descending: bool = False, limit: int = None):
+        """
+        [내부 함수] prefetch()로 계산해 둔 결과에 차트별 정렬/LIMIT을 적용합니다. 없으면 None.
+        """
+        if self.cache is None:
+            return None
+        df = self.cache.get(self._batch_key(dim_vars, num_var), count_miss=False)
+        if df is None:
+            return None
+        if order_by:
+            sort_col = 'Value' if order_by == 'value' else order_by.split('.')[1]
+            df = df.sort_values(sort_col, ascending=not descending, na_position='first', kind='stable')
+        if limit:
+            df = df.head(int(limit))
+        return df.rename(columns={'Value': value_name}).reset_index(drop=True)
+
+    def _fetch_data(self, query: str, params: dict = None) -> pd.DataFrame:
+        """
+        [내부 함수] SQL을 실행하여 DataFrame으로 반환합니다.
+        같은 SQL/파라미터는 데이터 세대가 바뀌기 전까지 캐시된 결과를 사용합니다.
+        """
+        with self.monitor.stage('data'):
+            if self.cache is None:
+                return self._query_data(query, params)
+            return self.cache.get_or_load(query, params, lambda: self._query_data(query, params))
+
+    def _query_chunks(self, query: str, params: dict = None, decode: bool = True):
+        """
+        [내부 함수] SQL 결과를 서버 측 커서(db_backend.read_sql_chunks)로 나눠 읽어 DataFrame 청크로 내보냅니다.
+        fetchall()과 달리 결과 전체를 행 객체로 받아 두지 않으므로 큰 결과도 청크 하나 분량의 행만 메모리에 둡니다.
+        청크 수신과 변환은 query 단계, 룩업 코드 -> 한글 레이블 변환은 dataframe 단계로 청크마다 나눠 계측합니다.
+        """
         logging.info(f"Executing SQL: {query}")
+        query_seconds, rows = 0.0, 0
         with self.engine.connect() as conn:
-            df = pd.read_sql(text(query), conn)
-        logging.info(f"Data fetched: {len(df)} rows")
+            # 엔진의 조회 시간 제한은 그대로 적용, 결과가 없어도 컬럼이 있는 빈 DataFrame 하나를 받음
+            chunks = read_sql_chunks(conn, query, params, max_execution_ms=None, yield_empty=True)
+            while True:
+                started = time.perf_counter()
+                chunk = next(chunks, None)
+                query_seconds += time.perf_counter() - started
+                if chunk is None:
+                    break
+                rows += len(chunk)
+                if decode and self.use_lookups:
+                    with self.monitor.stage('dataframe'):
+                        chunk = self._decode_lookups(chunk)
+                yield chunk
+        self.monitor.add_query(query, params, query_seconds, rows)
+        logging.info(f"Data fetched: {rows} rows")
+
+    def _query_data(self, query: str, params: dict = None, decode: bool = True) -> pd.DataFrame:
+        """
+        [내부 함수] _query_chunks로 읽은 청크를 DataFrame 하나로 합칩니다.
+        """
+        chunks = list(self._query_chunks(query, params, decode))
+        return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+    def generate_visualization_payload(self, label1: str, label2: str, filters: dict = None):
+        """
+        generate_visualization과 같지만 Figure 대신 figure_to_payload()의 JSON 문자열을 (payload, title)로 반환합니다.
+        같은 레이블 쌍은 데이터 세대가 바뀌기 전까지 만들어 둔 payload를 다시 사용합니다.
+        (화면 표시는 figure_from_payload(payload))
+        """
+        try:
+            conditions = self._compile_filters(filters)
+        except ValueError as e:
+            return None, f"조회 조건 오류: {e}"
+        with self.monitor.track(label1, label2, conditions) as timing:
+            key = (label1, label2, conditions, self.cache.generation() if self.cache is not None else None)
+            with self._payload_lock:
+                if key in self._payloads:
+                    self._payloads.move_to_end(key)
+                    timing.cached = True
+                    return self._payloads[key]
+            fig, title = self.generate_visualization(label1, label2, filters)
+            if fig is None:
+                return None, title  # 오류 메시지는 캐시하지 않음
+            with self.monitor.stage('payload'):
+                result = (figure_to_payload(fig), title)
+        if self.cache is not None:
+            with self._payload_lock:
+                self._payloads[key] = result
+                while len(self._payloads) > self.PAYLOAD_CACHE_SIZE:
+                    self._payloads.popitem(last=False)
+        return result
+
+    def _render_mode(self, points: int) -> str:
+        """
+        [내부 함수] px.line/px.scatter의 render_mode: 점이 많으면 WebGL, 적으면 SVG
+        """
+        return 'webgl' if points > self.WEBGL_POINT_THRESHOLD else 'svg'
+
+    def cache_stats(self) -> dict:
+        """
+        조회 결과 캐시의 적중/미적중 통계 (캐시를 사용하지 않으면 빈 dict)
+        """
+        return self.cache.stats() if self.cache is not None else {}
+
+    def pool_stats(self) -> dict:
+        """
+        DB 연결 풀 사용량과 체크아웃 대기 시간 (web_design/db_backend.py의 pool_stats)
+        """
+        return pool_stats(self.engine)
+
+    def timing_summary(self) -> pd.DataFrame:
+        """
+        레이블 쌍별 최근 차트 생성 시간 p50/p95 (web_design/instrumentation.py의 PerformanceMonitor.summary)
+        """
+        return self.monitor.summary()
+
+    def last_timing(self) -> dict:
+        """
+        현재 스레드에서 마지막으로 만든 차트의 단계별 시간과 실행한 쿼리 (없으면 None)
+        """
+        record = self.monitor.last()
+        return record.as_dict() if record is not None else None
+
+    def _fetch_aggregate(self, dim_vars: list, num_var: str, conditions: tuple = None, **kwargs):
+        """
+        [내부 함수] 인메모리 집계 엔진 -> 사전 집계 테이블 -> 일괄 집계(prefetch) 결과 순으로 차트 데이터를 구합니다.
+        모두 사용할 수 없거나 지원하지 않는 조합이면 None (기본 테이블 쿼리로 대체)
+        조회 조건이 있으면 세 방식 모두 전체 데이터 기준이므로 None
+        """
+        if conditions:
+            return None
+        sources = (('인메모리 집계', self.columnar and self.columnar.fetch),
+                   ('사전 집계 조회', self.summary and self.summary.fetch),
+                   ('일괄 집계 결과 조회', self._fetch_batched))
+        for name, fetch in sources:
+            if not fetch:
+                continue
+            try:
+                with self.monitor.stage('data'):
+                    df = fetch(dim_vars, num_var, **kwargs)
+            except Exception as e:
+                logging.warning(f"{name} 실패: {e}. 다음 방식으로 집계합니다.")
+                continue
+            if df is not None:
+                return df
+        return None
+
+    def _get_lookup_labels(self, table: str) -> dict:
+        """
+        룩업 테이블의 {코드: 레이블} 맵을 반환합니다. (테이블별로 한 번만 조회)
+        """
+        if table not in self._lookup_labels:
+            with self.engine.connect() as conn:
+                lookup_df = pd.read_sql(text(f"SELECT Code, Label FROM {table}"), conn)
+            self._lookup_labels[table] = dict(zip(lookup_df['Code'], lookup_df['Label']))
+        return self._lookup_labels[table]
+
+    def _decode_categories(self, col: str, values):
+        """
+        [내부 함수] 인메모리 집계 엔진의 범주 값(룩업 코드)을 한글 레이블로 바꿉니다.
+        """
+        if not self.use_lookups or col not in self.LOOKUP_TABLES:
+            return values
+        return pd.Series(values).map(self._get_lookup_labels(self.LOOKUP_TABLES[col])).to_numpy(dtype=object)
+
+    def _decode_lookups(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        [내부 함수] 코드로 집계된 결과의 룩업 컬럼에 한글 레이블을 붙입니다. (집계 이후 단계)
+        """
+        for col in df.columns:
+            # 와이드 팩트 테이블의 가해/피해 운전자 컬럼은 접두어를 뗀 원래 컬럼의 룩업을 사용
+            base_col = next((col[len(p):] for p in self.WIDE_ROLE_PREFIXES if col.startswith(p)), col)
+            if base_col in self.LOOKUP_TABLES:
+                df[col] = df[col].map(self._get_lookup_labels(self.LOOKUP_TABLES[base_col]))
         return df
 
     # --- Case 1: 수직 막대 차트 (범주형 vs 수치형) ---
-    def _create_bar_chart(self, cat_var: str, num_var: str, cat_label: str, num_label: str):
+    def _create_bar_chart(self, cat_var: str, num_var: str, cat_label: str, num_label: str,
+                          conditions: tuple = None):
         title = f"{cat_label} 별 {num_label}"
         agg_func = "COUNT" if '(사고건수)' in num_var else "SUM"
         
-        sel, frm, jn, grp, _ = self._build_query_components(cat_var, num_var, agg_func)
-        query = f"{sel} {frm} {jn} {grp} ORDER BY Value DESC LIMIT 20"
-        
-        df = self._fetch_data(query)
+        df = self._fetch_aggregate([cat_var], num_var, conditions, order_by='value', descending=True, limit=20)
+        if df is None:
+            sel, frm, jn, whr, grp, _, params = self._build_query_components(cat_var, num_var, agg_func, conditions)
+            query = f"{sel} {frm} {jn} {whr} {grp} ORDER BY Value DESC LIMIT 20"
+            df = self._fetch_data(query, params)
         col1_name = cat_var.split('.')[1]
         
         fig = px.bar(df, 
@@ -185,14 +942,16 @@ class AccidentVisualizer:
         return fig, title
 
     # --- Case 2: 라인 차트 (시간형 vs 수치형) ---
-    def _create_line_chart(self, time_var: str, num_var: str, time_label: str, num_label: str):
+    def _create_line_chart(self, time_var: str, num_var: str, time_label: str, num_label: str,
+                           conditions: tuple = None):
         title = f"{time_label} 별 '{num_label} 추이"
         agg_func = "COUNT" if '(사고건수)' in num_var else "SUM"
         
-        sel, frm, jn, grp, odr = self._build_query_components(time_var, num_var, agg_func)
-        query = f"{sel} {frm} {jn} {grp} {odr}"
-
-        df = self._fetch_data(query)
+        df = self._fetch_aggregate([time_var], num_var, conditions, order_by=time_var)
+        if df is None:
+            sel, frm, jn, whr, grp, odr, params = self._build_query_components(time_var, num_var, agg_func, conditions)
+            query = f"{sel} {frm} {jn} {whr} {grp} {odr}"
+            df = self._fetch_data(query, params)
         col1_name = time_var.split('.')[1] # 'OccurYearMonth'
         
         # [시간축 버그 수정] '202201' 문자열을 datetime 객체로 변환
@@ -202,37 +961,37 @@ class AccidentVisualizer:
             logging.warning(f"시간 변환 오류: {e}. 'OccurYearMonth' 형식이 'YYYYMM'이 아닐 수 있습니다.")
             pass # 변환 실패 시에도 일단 진행
 
+        df, original_points = reduce_lines(df, col1_name, 'Value', self.point_budget)
         fig = px.line(df, 
                       x=col1_name,
                       y='Value', 
                       labels={col1_name: time_label, 'Value': num_label}, # 한글 레이블 적용
-                      markers=True)
+                      markers=True,
+                      render_mode=self._render_mode(len(df)))
+        if len(df) < original_points:
+            mark_reduced(fig, original_points, len(df))
         return fig, title
 
     # --- Case 3: 그룹형 막대 차트 (범주형 vs 범주형) ---
     def _create_grouped_bar_chart(self, var1: str, var2: str, num_var: str, 
-                                  label1: str, label2: str, num_label: str):
+                                  label1: str, label2: str, num_label: str, conditions: tuple = None):
         title = f"{label1}와 {label2} 별 {num_label}"
         
         table1, col1 = var1.split('.') # X축
         table2, col2 = var2.split('.') # Color (범례)
         table3, col3 = num_var.split('.') # Y축
+        from_clause, join_clause, where_clause, params, column = self._query_parts([var1, var2, num_var], conditions)
         
-        agg_val = "COUNT(ACCIDENT.AccidentID)" if col3 == '(사고건수)' else f"SUM({table3}.{col3})"
+        agg_val = f"COUNT({column(num_var)})" if col3 == '(사고건수)' else f"SUM({column(num_var)})"
         
-        select_clause = f"SELECT {table1}.{col1}, {table2}.{col2}, {agg_val} AS Value"
-        tables_needed = set(['ACCIDENT', table1, table2, table3])
-        from_clause = "FROM ACCIDENT"
-        join_clause = ""
-        if 'DRIVER' in tables_needed:
-            join_clause += " JOIN DRIVER ON ACCIDENT.AccidentID = DRIVER.AccidentID"
-        if 'REGION' in tables_needed:
-            join_clause += " JOIN REGION ON ACCIDENT.RegionCode = REGION.RegionCode"
-        group_by_clause = f"GROUP BY {table1}.{col1}, {table2}.{col2}"
+        select_clause = f"SELECT {column(var1)}, {column(var2)}, {agg_val} AS Value"
+        group_by_clause = f"GROUP BY {column(var1)}, {column(var2)}"
         
-        query = f"{select_clause} {from_clause} {join_clause} {group_by_clause}"
+        query = f"{select_clause} {from_clause} {join_clause} {where_clause} {group_by_clause}"
         
-        df = self._fetch_data(query)
+        df = self._fetch_aggregate([var1, var2], num_var, conditions)
+        if df is None:
+            df = self._fetch_data(query, params)
         
         fig = px.bar(df, 
                      x=col1,
@@ -243,30 +1002,30 @@ class AccidentVisualizer:
         return fig, title
 
     # --- Case 4: 버블 차트 (수치형 vs 수치형) ---
-    def _create_bubble_chart(self, var1: str, var2: str, label1: str, label2: str):
+    def _create_bubble_chart(self, var1: str, var2: str, label1: str, label2: str, conditions: tuple = None):
         title = f"{label1}와 {label2} 조합별 사고건수"
         
         table1, col1 = var1.split('.') # X축
         table2, col2 = var2.split('.') # Y축
         
         # SQL 쿼리로 X, Y 조합별 건수(COUNT)를 미리 집계
-        select_clause = f"SELECT {table1}.{col1}, {table2}.{col2}, COUNT(ACCIDENT.AccidentID) AS BubbleSize"
-        tables_needed = set(['ACCIDENT', table1, table2])
-        from_clause = "FROM ACCIDENT"
-        join_clause = ""
-        if 'DRIVER' in tables_needed:
-            join_clause += " JOIN DRIVER ON ACCIDENT.AccidentID = DRIVER.AccidentID"
-        if 'REGION' in tables_needed:
-            join_clause += " JOIN REGION ON ACCIDENT.RegionCode = REGION.RegionCode"
+        from_clause, join_clause, where_clause, params, column = self._query_parts([var1, var2], conditions)
+        select_clause = f"SELECT {column(var1)}, {column(var2)}, COUNT({column('ACCIDENT.(사고건수)')}) AS BubbleSize"
         
-        group_by_clause = f"GROUP BY {table1}.{col1}, {table2}.{col2}"
-        query = f"{select_clause} {from_clause} {join_clause} {group_by_clause}"
+        group_by_clause = f"GROUP BY {column(var1)}, {column(var2)}"
+        query = f"{select_clause} {from_clause} {join_clause} {where_clause} {group_by_clause}"
 
-        df = self._fetch_data(query)
+        df = self._fetch_aggregate([var1, var2], 'ACCIDENT.(사고건수)', conditions, value_name='BubbleSize')
+        if df is None:
+            df = self._fetch_data(query, params)
 
         if df.empty:
             return None, "데이터가 없어 버블 차트를 생성할 수 없습니다."
-        
+
+        # (x, y) 조합이 점 예산을 넘으면 격자 구간으로 묶어 건수를 합산
+        df, original_points = bin_points(df, col1, col2, 'BubbleSize', self.point_budget)
+        reduced = len(df) < original_points
+
         fig = px.scatter(df,
                          x=col1,
                          y=col2,
@@ -279,41 +1038,41 @@ class AccidentVisualizer:
                              'BubbleSize': True
                          },
                          size_max=60,        # 최대 원 크기 (조정 가능)
+                         render_mode=self._render_mode(len(df)),
 
                          labels={col1: label1, col2: label2, 'BubbleSize': '사고건수'}) # 한글 레이블 적용
         
-        # X, Y축이 정수형이므로, 틱(tick) 간격을 1로 설정하여 깔끔하게 표시
-        fig.update_xaxes(dtick=1)
-        fig.update_yaxes(dtick=1)
+        if reduced:
+            mark_reduced(fig, original_points, len(df))
+        else:
+            # X, Y축이 정수형이므로, 틱(tick) 간격을 1로 설정하여 깔끔하게 표시 (구간으로 묶었으면 좌표가 실수)
+            fig.update_xaxes(dtick=1)
+            fig.update_yaxes(dtick=1)
         
         return fig, title
 
     # --- Case 5: 다중 라인 차트 (시간형 vs 범주형) ---
     def _create_multi_line_chart(self, time_var: str, cat_var: str, num_var: str, 
-                                 time_label: str, cat_label: str, num_label: str):
+                                 time_label: str, cat_label: str, num_label: str, conditions: tuple = None):
         title = f"{time_label}에 따른 {cat_label}별 {num_label} 추이"
         
         table1, col1 = time_var.split('.') # X축
         table2, col2 = cat_var.split('.') # Color
         table3, col3 = num_var.split('.') # Y축
+        from_clause, join_clause, where_clause, params, column = self._query_parts([time_var, cat_var, num_var], conditions)
         
-        agg_val = "COUNT(ACCIDENT.AccidentID)" if col3 == '(사고건수)' else f"SUM({table3}.{col3})"
+        agg_val = f"COUNT({column(num_var)})" if col3 == '(사고건수)' else f"SUM({column(num_var)})"
         
-        select_clause = f"SELECT {table1}.{col1}, {table2}.{col2}, {agg_val} AS Value"
-        tables_needed = set(['ACCIDENT', table1, table2, table3])
-        from_clause = "FROM ACCIDENT"
-        join_clause = ""
-        if 'DRIVER' in tables_needed:
-            join_clause += " JOIN DRIVER ON ACCIDENT.AccidentID = DRIVER.AccidentID"
-        if 'REGION' in tables_needed:
-            join_clause += " JOIN REGION ON ACCIDENT.RegionCode = REGION.RegionCode"
+        select_clause = f"SELECT {column(time_var)}, {column(cat_var)}, {agg_val} AS Value"
             
-        group_by_clause = f"GROUP BY {table1}.{col1}, {table2}.{col2}"
-        order_by_clause = f"ORDER BY {table1}.{col1}"
+        group_by_clause = f"GROUP BY {column(time_var)}, {column(cat_var)}"
+        order_by_clause = f"ORDER BY {column(time_var)}"
         
-        query = f"{select_clause} {from_clause} {join_clause} {group_by_clause} {order_by_clause}"
+        query = f"{select_clause} {from_clause} {join_clause} {where_clause} {group_by_clause} {order_by_clause}"
         
-        df = self._fetch_data(query)
+        df = self._fetch_aggregate([time_var, cat_var], num_var, conditions, order_by=time_var)
+        if df is None:
+            df = self._fetch_data(query, params)
         col1_name = time_var.split('.')[1] # 'OccurYearMonth'
 
         # [시간축 버그 수정] '202201' 문자열을 datetime 객체로 변환
@@ -323,11 +1082,17 @@ class AccidentVisualizer:
             logging.warning(f"시간 변환 오류: {e}. 'OccurYearMonth' 형식이 'YYYYMM'이 아닐 수 있습니다.")
             pass # 변환 실패 시에도 일단 진행
 
+        # 계열(범주)별로 점 예산을 나눠 LTTB로 축소
+        series_count = df[col2].nunique(dropna=False)
+        df, original_points = reduce_lines(df, col1_name, 'Value', self.point_budget, series=col2)
         fig = px.line(df, 
                       x=col1_name,
                       y='Value',
                       color=col2,
                       #title=title,
                       labels={col1: time_label, 'Value': num_label, col2: cat_label}, # 한글 레이블 적용
-                      markers=True)
+                      markers=True,
+                      render_mode=self._render_mode(len(df)))
+        if len(df) < original_points:
+            mark_reduced(fig, original_points, len(df), series_count - df[col2].nunique(dropna=False))
         return fig, title
\ No newline at end of file